@@ -0,0 +1,58 @@
+"""
+Throughput of the Ape-X style distributed trainer against actor count.
+
+Each configuration trains for a fixed wall-clock window (measured from the
+first transition the learner receives) and reports environment steps and
+learner updates per second.
+
+Usage:
+    uv run python benchmarks/apex_throughput.py --task cartpole --actors 1,2,4,8
+"""
+import tempfile
+import time
+
+import click
+
+from drl_lab.distributed import DistributedTrainer
+from drl_lab.utils import logger
+
+def _measure(
+    task: str, num_actors: int, duration: float, train_start: int
+) -> tuple[float, float]:
+    """Train for `duration` seconds; returns (env-steps/s, updates/s)."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        trainer: DistributedTrainer | None = None
+
+        def should_stop() -> bool:
+            started = trainer.started_at if trainer else None
+            return started is not None and time.perf_counter() - started > duration
+
+        trainer = DistributedTrainer(
+            task,
+            output_dir,
+            episodes=10**9,
+            should_stop=should_stop,
+            overrides={
+                "num_actors": num_actors,
+                "train_start_size": train_start,
+            },
+        )
+        trainer.run()
+        elapsed = max(trainer.elapsed, 1e-9)
+        return trainer.env_steps / elapsed, trainer.updates / elapsed
+
+@click.command()
+@click.option('--task', default="cartpole", help="Task to benchmark.")
+@click.option('--actors', default="1,2,4", help="Actor counts to sweep.")
+@click.option('--duration', default=10.0, help="Seconds per configuration.")
+@click.option('--train-start', default=500, help="Replay warm-up size.")
+def main(task, actors, duration, train_start):
+    logger.remove()
+
+    click.echo(f"{'actors':>6} | {'env-steps/s':>11} | {'updates/s':>9}")
+    for num_actors in (int(a) for a in actors.split(",")):
+        env_rate, update_rate = _measure(task, num_actors, duration, train_start)
+        click.echo(f"{num_actors:>6} | {env_rate:>11.0f} | {update_rate:>9.0f}")
+
+if __name__ == '__main__':
+    main()
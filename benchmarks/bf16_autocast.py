@@ -0,0 +1,99 @@
+"""
+bfloat16 autocast against float32 for the replay update.
+
+Part 1 measures `BaseDQNAgent.replay()` updates per second for the
+`cartpole` and `cliff_walking` state/action sizes at several `DuelingMLP`
+hidden sizes. Part 2 trains both tasks with and without
+`Config.bf16_autocast` and reports the final moving-average reward.
+bfloat16 pays off on CPUs with native bf16 support (AVX512-BF16 / AMX);
+elsewhere the casts can make it slower.
+
+Usage:
+    uv run python benchmarks/bf16_autocast.py --hidden-sizes 128,512,1024
+"""
+import tempfile
+import time
+
+import click
+import numpy as np
+import torch
+
+from drl_lab.agent import BaseDQNAgent
+from drl_lab.models import DuelingMLP
+from drl_lab.tasks import get_task
+from drl_lab.train import Trainer
+from drl_lab.utils import Config, logger, setup_logger
+
+TASKS = ("cartpole", "cliff_walking")
+
+def _update_rate(
+    state_size: int, action_size: int, hidden_size: int, bf16: bool, iters: int
+) -> float:
+    config = Config(
+        memory_size=10_000, batch_size=64, train_start_size=64, bf16_autocast=bf16
+    )
+    agent = BaseDQNAgent(
+        state_size, action_size, config,
+        model_factory=lambda: DuelingMLP(state_size, action_size, hidden_size)
+    )
+    rng = np.random.default_rng(0)
+    states = rng.standard_normal((config.memory_size + 1, state_size))
+    agent.memory.push_batch(
+        states[:-1].astype(np.float32),
+        rng.integers(0, action_size, config.memory_size),
+        rng.standard_normal(config.memory_size).astype(np.float32),
+        states[1:].astype(np.float32),
+        rng.random(config.memory_size) < 0.05,
+    )
+    for _ in range(10):
+        agent.replay()
+    start = time.perf_counter()
+    for _ in range(iters):
+        agent.replay()
+    return iters / (time.perf_counter() - start)
+
+def _final_reward(task: str, bf16: bool, episodes: int) -> float:
+    with tempfile.TemporaryDirectory() as output_dir:
+        trainer = Trainer(
+            task, output_dir, episodes,
+            overrides={"seed": 0, "bf16_autocast": bf16}
+        )
+        torch.manual_seed(0)
+        trainer.run()
+        return float(trainer.plotter.moving_avgs[-1])
+
+@click.command()
+@click.option('--hidden-sizes', default="128,512,1024", help="DuelingMLP widths.")
+@click.option('--iters', default=200, help="Updates per throughput measurement.")
+@click.option('--episodes', default=100, help="Training episodes per reward run.")
+@click.option('--skip-training', is_flag=True, help="Only measure throughput.")
+def main(hidden_sizes, iters, episodes, skip_training):
+    setup_logger()
+    click.echo(f"{'task':>14} | {'hidden':>6} | {'fp32 upd/s':>10} | "
+               f"{'bf16 upd/s':>10} | {'speedup':>7}")
+    for task_name in TASKS:
+        task = get_task(task_name)
+        for hidden in (int(h) for h in hidden_sizes.split(",")):
+            fp32 = _update_rate(
+                task.state_size, task.action_size, hidden, False, iters
+            )
+            bf16 = _update_rate(
+                task.state_size, task.action_size, hidden, True, iters
+            )
+            click.echo(
+                f"{task_name:>14} | {hidden:>6} | {fp32:>10.0f} | "
+                f"{bf16:>10.0f} | {bf16 / fp32:>6.2f}x"
+            )
+
+    if skip_training:
+        return
+    # Training logs would drown the tables
+    logger.remove()
+    click.echo(f"\n{'task':>14} | {'fp32 final avg':>14} | {'bf16 final avg':>14}")
+    for task_name in TASKS:
+        fp32 = _final_reward(task_name, False, episodes)
+        bf16 = _final_reward(task_name, True, episodes)
+        click.echo(f"{task_name:>14} | {fp32:>14.2f} | {bf16:>14.2f}")
+
+if __name__ == '__main__':
+    main()
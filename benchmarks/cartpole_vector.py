@@ -0,0 +1,91 @@
+"""
+Native `CartPoleVectorEnv` against gymnasium's CartPole.
+
+Part 1 checks dynamics parity: N gymnasium envs (`CartPoleTask.get_env`,
+which includes the reward shaping) and one native vector env are driven
+with the same random actions. Reset states are copied from the gymnasium
+envs into the native one, so every observation, reward, termination and
+truncation can be compared step by step. Part 2 measures environment steps
+per second of the `sync` backend against the `native` backend under
+random actions.
+
+Usage:
+    uv run python benchmarks/cartpole_vector.py --num-envs 1,16,256,4096
+"""
+import time
+
+import click
+import numpy as np
+from gymnasium.wrappers import TimeLimit
+
+from drl_lab.tasks import get_task
+from drl_lab.tasks.cartpole.vector import CartPoleVectorEnv
+
+def _parity(num_envs: int, steps: int, max_steps: int) -> tuple[float, float, int]:
+    task = get_task("cartpole")
+    envs = [
+        TimeLimit(task.get_env(), max_episode_steps=max_steps)
+        for _ in range(num_envs)
+    ]
+    native = CartPoleVectorEnv(num_envs, max_episode_steps=max_steps)
+    native.reset(seed=0)
+    for i, env in enumerate(envs):
+        env.reset(seed=i)
+        native.state[i] = env.unwrapped.state
+
+    rng = np.random.default_rng(0)
+    obs_diff = reward_diff = 0.0
+    flag_mismatches = 0
+    for _ in range(steps):
+        actions = rng.integers(0, 2, num_envs)
+        obs, rewards, terminated, truncated, infos = native.step(actions)
+        for i, env in enumerate(envs):
+            ref_obs, ref_reward, ref_term, ref_trunc, _ = env.step(int(actions[i]))
+            final = infos["final_obs"][i] if ref_term or ref_trunc else obs[i]
+            obs_diff = max(obs_diff, float(np.abs(final - ref_obs).max()))
+            reward_diff = max(reward_diff, abs(float(rewards[i]) - ref_reward))
+            flag_mismatches += (ref_term != terminated[i]) + (ref_trunc != truncated[i])
+            if ref_term or ref_trunc:
+                env.reset()
+                native.state[i] = env.unwrapped.state
+    for env in envs:
+        env.close()
+    return obs_diff, reward_diff, flag_mismatches
+
+def _steps_per_sec(task, num_envs: int, backend: str, steps: int) -> float:
+    envs = task.get_vector_env(num_envs, backend)
+    envs.reset(seed=0)
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, 2, (steps, num_envs))
+    start = time.perf_counter()
+    for t in range(steps):
+        envs.step(actions[t])
+    elapsed = time.perf_counter() - start
+    envs.close()
+    return steps * num_envs / elapsed
+
+@click.command()
+@click.option('--num-envs', default="1,16,256,4096", help="Vector env sizes.")
+@click.option('--parity-envs', default=32, help="Envs in the parity check.")
+@click.option('--parity-steps', default=2000, help="Steps in the parity check.")
+@click.option('--steps', default=200, help="Steps per throughput measurement.")
+def main(num_envs, parity_envs, parity_steps, steps):
+    task = get_task("cartpole")
+    obs_diff, reward_diff, mismatches = _parity(
+        parity_envs, parity_steps, task.config.max_steps
+    )
+    click.echo(
+        f"parity over {parity_envs} envs x {parity_steps} steps: "
+        f"max |dobs| {obs_diff:.2e}, max |dreward| {reward_diff:.2e}, "
+        f"done-flag mismatches {mismatches}"
+    )
+
+    click.echo(f"\n{'envs':>6} | {'sync steps/s':>12} | {'native steps/s':>14} | "
+               f"{'speedup':>8}")
+    for n in (int(n) for n in num_envs.split(",")):
+        sync = _steps_per_sec(task, n, "sync", steps)
+        native = _steps_per_sec(task, n, "native", steps)
+        click.echo(f"{n:>6} | {sync:>12.0f} | {native:>14.0f} | {native / sync:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
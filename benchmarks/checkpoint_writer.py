@@ -0,0 +1,54 @@
+"""
+Training-loop stall of synchronous saves against `CheckpointWriter`.
+
+For `DuelingMLP` models of increasing width, measures how long the caller
+is blocked per save: a synchronous `atomic_save` of the state dict, against
+`snapshot` plus a queued `CheckpointWriter.save_best`. Saves are issued in a
+burst, as during a run of new bests, and the writer's write and coalesced
+counts show how many of them reached the disk.
+
+Usage:
+    uv run python benchmarks/checkpoint_writer.py --hidden 128,1024,4096
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from drl_lab.checkpoint import CheckpointWriter, atomic_save, snapshot
+from drl_lab.models import DuelingMLP
+from drl_lab.utils import setup_logger
+
+def _stall_ms(hidden: int, saves: int, keep_best: int) -> tuple[float, float, int, int]:
+    model = DuelingMLP(64, 8, hidden_size=hidden)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "model.pth"
+        start = time.perf_counter()
+        for _ in range(saves):
+            atomic_save(model.state_dict(), path)
+        sync = (time.perf_counter() - start) / saves * 1e3
+
+        writer = CheckpointWriter(keep_best=keep_best)
+        start = time.perf_counter()
+        for i in range(saves):
+            writer.save_best(snapshot(model.state_dict()), path, float(i), i + 1)
+        queued = (time.perf_counter() - start) / saves * 1e3
+        writer.close()
+    return sync, queued, writer.writes, writer.coalesced
+
+@click.command()
+@click.option('--hidden', default="128,1024,4096", help="Hidden layer widths.")
+@click.option('--saves', default=20, help="Saves per burst.")
+@click.option('--keep-best', default=3, help="Best models kept in the archive.")
+def main(hidden, saves, keep_best):
+    setup_logger()
+    click.echo(f"{'hidden':>6} | {'sync ms/save':>12} | {'async ms/save':>13} | "
+               f"{'writes':>6} | {'coalesced':>9}")
+    for h in (int(h) for h in hidden.split(",")):
+        sync, queued, writes, coalesced = _stall_ms(h, saves, keep_best)
+        click.echo(f"{h:>6} | {sync:>12.2f} | {queued:>13.2f} | "
+                   f"{writes:>6} | {coalesced:>9}")
+
+if __name__ == '__main__':
+    main()
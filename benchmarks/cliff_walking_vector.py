@@ -0,0 +1,83 @@
+"""
+Table-driven `CliffWalkingVectorEnv` against gymnasium's CliffWalking-v1.
+
+Part 1 checks semantics: N `gym.make("CliffWalking-v1")` envs under the
+task's time limit and one native vector env are driven with the same
+random actions. States, rewards, terminations and truncations are compared
+step by step across cliff falls, goal arrivals and time-limit resets.
+Part 2 measures environment steps per second of the `sync` backend
+against the `native` backend under random actions.
+
+Usage:
+    uv run python benchmarks/cliff_walking_vector.py --num-envs 1,16,256,4096
+"""
+import time
+
+import click
+import numpy as np
+
+from drl_lab.tasks import get_task
+from drl_lab.tasks.cliff_walking.vector import CliffWalkingVectorEnv
+
+def _parity(task, num_envs: int, steps: int) -> tuple[int, int]:
+    envs = [task.make_limited_env() for _ in range(num_envs)]
+    for env in envs:
+        env.reset(seed=0)
+    native = CliffWalkingVectorEnv(num_envs, task.config.max_steps, seed=0)
+    native.reset()
+
+    rng = np.random.default_rng(0)
+    mismatches = cliff_falls = 0
+    for _ in range(steps):
+        actions = rng.integers(0, 4, num_envs)
+        obs, rewards, terminated, truncated, infos = native.step(actions)
+        for i, env in enumerate(envs):
+            ref_obs, ref_reward, ref_term, ref_trunc, _ = env.step(int(actions[i]))
+            done = ref_term or ref_trunc
+            final = infos["final_obs"][i] if done else obs[i]
+            mismatches += (
+                (final != ref_obs) + (rewards[i] != ref_reward)
+                + (terminated[i] != ref_term) + (truncated[i] != ref_trunc)
+            )
+            cliff_falls += ref_reward == -100
+            if done:
+                ref_obs, _ = env.reset()
+                mismatches += obs[i] != ref_obs
+    for env in envs:
+        env.close()
+    return int(mismatches), int(cliff_falls)
+
+def _steps_per_sec(task, num_envs: int, backend: str, steps: int) -> float:
+    envs = task.get_vector_env(num_envs, backend)
+    envs.reset(seed=0)
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, 4, (steps, num_envs))
+    start = time.perf_counter()
+    for t in range(steps):
+        envs.step(actions[t])
+    elapsed = time.perf_counter() - start
+    envs.close()
+    return steps * num_envs / elapsed
+
+@click.command()
+@click.option('--num-envs', default="1,16,256,4096", help="Vector env sizes.")
+@click.option('--parity-envs', default=32, help="Envs in the parity check.")
+@click.option('--parity-steps', default=2000, help="Steps in the parity check.")
+@click.option('--steps', default=200, help="Steps per throughput measurement.")
+def main(num_envs, parity_envs, parity_steps, steps):
+    task = get_task("cliff_walking")
+    mismatches, cliff_falls = _parity(task, parity_envs, parity_steps)
+    click.echo(
+        f"parity over {parity_envs} envs x {parity_steps} steps "
+        f"({cliff_falls} cliff falls): {mismatches} mismatches"
+    )
+
+    click.echo(f"\n{'envs':>6} | {'sync steps/s':>12} | {'native steps/s':>14} | "
+               f"{'speedup':>8}")
+    for n in (int(n) for n in num_envs.split(",")):
+        sync = _steps_per_sec(task, n, "sync", steps)
+        native = _steps_per_sec(task, n, "native", steps)
+        click.echo(f"{n:>6} | {sync:>12.0f} | {native:>14.0f} | {native / sync:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Equivalence check and micro-benchmark for the Double DQN update step.
+
+Runs `BaseDQNAgent.replay()` against the previous implementation (separate
+online forwards over states and next states, `torch.FloatTensor` copies and
+default Adam) on identical weights and identical sampled batches, and
+reports the largest loss difference over a sequence of updates together with
+updates per second for both paths. With prioritized replay the two runs agree
+until rounding-level TD error differences change a sampled index.
+
+Usage:
+    uv run python benchmarks/ddqn_update.py --updates 200 --prioritized
+"""
+import time
+
+import click
+import numpy as np
+import torch
+import torch.optim as optim
+
+from drl_lab.agent import BaseDQNAgent
+from drl_lab.models import DuelingMLP
+from drl_lab.utils import Config, setup_logger
+
+def _reference_replay(agent: BaseDQNAgent, optimizer: optim.Optimizer) -> float:
+    """The update step as it was before the fused path (kept for comparison)."""
+    device = agent.device
+    if agent.prioritized:
+        (
+            states, actions, rewards, next_states, dones, indices, weights
+        ) = agent.memory.sample(agent.config.batch_size, agent.beta)
+        agent._anneal_beta()
+    else:
+        states, actions, rewards, next_states, dones = agent.memory.sample(
+            agent.config.batch_size
+        )
+
+    states_t = torch.FloatTensor(states).to(device)
+    actions_t = torch.LongTensor(actions).unsqueeze(1).to(device)
+    rewards_t = torch.FloatTensor(rewards).unsqueeze(1).to(device)
+    next_states_t = torch.FloatTensor(next_states).to(device)
+    dones_t = torch.FloatTensor(dones).unsqueeze(1).to(device)
+
+    current_q_values = agent.model(states_t).gather(1, actions_t)
+    with torch.no_grad():
+        next_actions = agent.model(next_states_t).argmax(1, keepdim=True)
+        next_q_values = agent.target_model(next_states_t).gather(1, next_actions)
+        target_q_values = rewards_t + (
+            agent.config.gamma * next_q_values * (1.0 - dones_t)
+        )
+
+    elementwise_loss = agent.loss_fn(current_q_values, target_q_values)
+    if agent.prioritized:
+        weights_t = torch.FloatTensor(weights).unsqueeze(1).to(device)
+        loss = (weights_t * elementwise_loss).mean()
+        td_errors = (target_q_values - current_q_values).detach()
+        agent.memory.update_priorities(indices, td_errors.squeeze(1).cpu().numpy())
+    else:
+        loss = elementwise_loss.mean()
+
+    optimizer.zero_grad()
+    loss.backward()
+    torch.nn.utils.clip_grad_norm_(agent.model.parameters(), 1.0)
+    optimizer.step()
+    return loss.item()
+
+def _make_agents(
+    config: Config, state_size: int, action_size: int, size: int
+) -> tuple[BaseDQNAgent, BaseDQNAgent, optim.Optimizer]:
+    """Two agents with identical weights and identically seeded replay."""
+    def factory() -> DuelingMLP:
+        return DuelingMLP(state_size, action_size)
+
+    torch.manual_seed(0)
+    fused = BaseDQNAgent(state_size, action_size, config, factory)
+    reference = BaseDQNAgent(state_size, action_size, config, factory)
+    reference.model.load_state_dict(fused.model.state_dict())
+    reference.target_model.load_state_dict(fused.target_model.state_dict())
+    # The reference path uses the default (single-tensor) Adam
+    optimizer = optim.Adam(
+        reference.model.parameters(), lr=config.learning_rate, foreach=False
+    )
+
+    rng = np.random.default_rng(0)
+    states = rng.standard_normal((size + 1, state_size)).astype(np.float32)
+    actions = rng.integers(0, action_size, size=size)
+    rewards = rng.standard_normal(size).astype(np.float32)
+    dones = rng.random(size) < 0.05
+    for agent in (fused, reference):
+        agent.memory.rng = np.random.default_rng(0)
+        agent.memory.push_batch(
+            states[:-1], actions, rewards, states[1:], dones
+        )
+    return fused, reference, optimizer
+
+def _rate(fn, iters: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return iters / (time.perf_counter() - start)
+
+@click.command()
+@click.option('--updates', default=200, help="Updates compared for equivalence.")
+@click.option('--iters', default=1000, help="Updates per timing measurement.")
+@click.option('--state-size', default=4, help="State vector dimension.")
+@click.option('--batch-size', default=64, help="Minibatch size.")
+@click.option('--prioritized', is_flag=True, help="Use prioritized replay.")
+def main(updates, iters, state_size, batch_size, prioritized):
+    setup_logger()
+    action_size = 2
+    size = 10_000
+    config = Config(
+        memory_size=size, batch_size=batch_size, train_start_size=batch_size,
+        prioritized_replay=prioritized,
+    )
+
+    fused, reference, optimizer = _make_agents(
+        config, state_size, action_size, size
+    )
+    max_diff = 0.0
+    diverged = None
+    for i in range(updates):
+        loss = fused.replay()
+        ref_loss = _reference_replay(reference, optimizer)
+        max_diff = max(max_diff, abs(loss - ref_loss))
+        if diverged is None and abs(loss - ref_loss) > 1e-5:
+            diverged = i
+    weight_diff = max(
+        (a - b).abs().max().item()
+        for a, b in zip(
+            fused.model.parameters(), reference.model.parameters(), strict=True
+        )
+    )
+    click.echo(f"Max loss difference over {updates} updates: {max_diff:.3e}")
+    click.echo(f"Max weight difference after {updates} updates: {weight_diff:.3e}")
+    if diverged is not None:
+        # Expected with --prioritized: rounding-level TD error differences
+        # eventually move a stratified sample across a priority boundary
+        click.echo(f"Losses first differ by more than 1e-5 at update {diverged}")
+
+    fused, reference, optimizer = _make_agents(
+        config, state_size, action_size, size
+    )
+    fused_rate = _rate(fused.replay, iters)
+    reference_rate = _rate(lambda: _reference_replay(reference, optimizer), iters)
+    click.echo(f"{'path':>10} | {'updates/s':>10}")
+    click.echo(f"{'reference':>10} | {reference_rate:>10.0f}")
+    click.echo(f"{'fused':>10} | {fused_rate:>10.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+One-hot `DuelingMLP` against `EmbeddingDuelingMLP` for discrete states.
+
+Part 1 checks that an `EmbeddingDuelingMLP` given the weights of a one-hot
+`DuelingMLP` (table rows = weight columns + bias) computes the same
+Q-values, and that its NumPy export matches the torch forward. Part 2
+measures `BaseDQNAgent.replay()` updates per second and single-state `act`
+latency for both variants at several state counts: one-hot states go
+through `IndexCodec` (float32 one-hot batches), integer states through
+`DiscreteCodec` (int64 indices).
+
+Usage:
+    uv run python benchmarks/embedding_model.py --num-states 48,4096,100000
+"""
+import time
+
+import click
+import numpy as np
+import torch
+
+from drl_lab.agent import BaseDQNAgent
+from drl_lab.export import policy_from_model
+from drl_lab.models import DuelingMLP, EmbeddingDuelingMLP
+from drl_lab.replay import DiscreteCodec, IndexCodec
+from drl_lab.utils import Config, setup_logger
+
+ACTION_SIZE = 4
+# The one-hot path materializes an (n, n) identity matrix, so it is only
+# measured up to this many states
+ONE_HOT_LIMIT = 8192
+
+def _parity(num_states: int) -> tuple[float, float]:
+    torch.manual_seed(0)
+    one_hot_model = DuelingMLP(num_states, ACTION_SIZE)
+    embedding_model = EmbeddingDuelingMLP(num_states, ACTION_SIZE)
+    # Converted on load: table rows = weight columns + bias
+    embedding_model.load_state_dict(one_hot_model.state_dict())
+
+    indices = np.arange(num_states)
+    with torch.inference_mode():
+        expected = one_hot_model(torch.eye(num_states)).numpy()
+        q = embedding_model(torch.from_numpy(indices)).numpy()
+    exported = policy_from_model(embedding_model).q_values(indices)
+    return float(np.abs(q - expected).max()), float(np.abs(exported - q).max())
+
+def _agent(num_states: int, embedding: bool) -> BaseDQNAgent:
+    config = Config(memory_size=10_000, batch_size=64, train_start_size=64)
+    if embedding:
+        codec, model_cls = DiscreteCodec(num_states), EmbeddingDuelingMLP
+    else:
+        codec, model_cls = IndexCodec(num_states), DuelingMLP
+    agent = BaseDQNAgent(
+        num_states, ACTION_SIZE, config,
+        model_factory=lambda: model_cls(num_states, ACTION_SIZE),
+        state_codec=codec,
+    )
+    rng = np.random.default_rng(0)
+    states = rng.integers(0, num_states, config.memory_size + 1)
+    agent.memory.push_batch(
+        states[:-1],
+        rng.integers(0, ACTION_SIZE, config.memory_size),
+        rng.standard_normal(config.memory_size).astype(np.float32),
+        states[1:],
+        rng.random(config.memory_size) < 0.05,
+    )
+    return agent
+
+def _update_rate(agent: BaseDQNAgent, iters: int) -> float:
+    for _ in range(10):
+        agent.replay()
+    start = time.perf_counter()
+    for _ in range(iters):
+        agent.replay()
+    return iters / (time.perf_counter() - start)
+
+def _act_us(agent: BaseDQNAgent, state: np.ndarray | int, iters: int) -> float:
+    for _ in range(100):
+        agent.act(state, training=False)
+    start = time.perf_counter()
+    for _ in range(iters):
+        agent.act(state, training=False)
+    return (time.perf_counter() - start) / iters * 1e6
+
+@click.command()
+@click.option('--num-states', default="48,4096,100000", help="State counts.")
+@click.option('--iters', default=200, help="Updates per throughput measurement.")
+@click.option('--act-iters', default=2000, help="Actions per latency measurement.")
+def main(num_states, iters, act_iters):
+    setup_logger()
+    counts = [int(n) for n in num_states.split(",")]
+
+    click.echo(f"{'states':>7} | {'max |dQ| torch':>14} | {'max |dQ| numpy':>14}")
+    for n in sorted({min(n, ONE_HOT_LIMIT) for n in counts}):
+        torch_diff, numpy_diff = _parity(n)
+        click.echo(f"{n:>7} | {torch_diff:>14.2e} | {numpy_diff:>14.2e}")
+
+    click.echo(
+        f"\n{'states':>7} | {'one-hot upd/s':>13} | {'embed upd/s':>11} | "
+        f"{'one-hot us/act':>14} | {'embed us/act':>12}"
+    )
+    for n in counts:
+        embedding = _agent(n, embedding=True)
+        one_hot_upd, one_hot_act = "n/a", "n/a"
+        if n <= ONE_HOT_LIMIT:
+            one_hot = _agent(n, embedding=False)
+            state = np.zeros(n, dtype=np.float32)
+            state[n // 2] = 1.0
+            one_hot_upd = f"{_update_rate(one_hot, iters):.0f}"
+            one_hot_act = f"{_act_us(one_hot, state, act_iters):.1f}"
+        click.echo(
+            f"{n:>7} | {one_hot_upd:>13} | "
+            f"{_update_rate(embedding, iters):>11.0f} | "
+            f"{one_hot_act:>14} | "
+            f"{_act_us(embedding, n // 2, act_iters):>12.1f}"
+        )
+
+if __name__ == '__main__':
+    main()
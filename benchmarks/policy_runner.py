@@ -0,0 +1,71 @@
+"""
+Parity and latency of the NumPy `PolicyRunner` against the torch policy.
+
+Converts randomly initialized `SimpleMLP` and `DuelingMLP` networks, checks
+that Q-values and greedy actions match the torch forward on random states,
+and reports single-state action latency of `BaseDQNAgent.act` (the previous
+inference path) and `PolicyRunner.act`.
+
+Usage:
+    uv run python benchmarks/policy_runner.py --state-size 48 --action-size 4
+"""
+import time
+
+import click
+import numpy as np
+import torch
+
+from drl_lab.agent import BaseDQNAgent
+from drl_lab.export import policy_from_model
+from drl_lab.models import DuelingMLP, SimpleMLP
+from drl_lab.utils import Config, setup_logger
+
+def _latency_us(fn, state: np.ndarray, iters: int) -> float:
+    for _ in range(100):
+        fn(state)
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn(state)
+    return (time.perf_counter() - start) / iters * 1e6
+
+@click.command()
+@click.option('--state-size', default=4, help="State vector dimension.")
+@click.option('--action-size', default=2, help="Number of actions.")
+@click.option('--states', default=10_000, help="Random states for the parity check.")
+@click.option('--iters', default=5000, help="Actions per latency measurement.")
+def main(state_size, action_size, states, iters):
+    setup_logger()
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(0)
+    batch = rng.standard_normal((states, state_size)).astype(np.float32)
+
+    click.echo(
+        f"{'model':>11} | {'max |dQ|':>9} | {'agree':>7} | "
+        f"{'torch us/act':>12} | {'numpy us/act':>12}"
+    )
+    for model_cls in (SimpleMLP, DuelingMLP):
+        torch.manual_seed(0)
+        config = Config(memory_size=1)
+        agent = BaseDQNAgent(
+            state_size, action_size, config,
+            model_factory=lambda cls=model_cls: cls(state_size, action_size)
+        )
+        runner = policy_from_model(agent.model)
+
+        with torch.inference_mode():
+            expected = agent.model(torch.from_numpy(batch)).numpy()
+        q = runner.q_values(batch)
+        max_diff = float(np.abs(q - expected).max())
+        agree = float((q.argmax(1) == expected.argmax(1)).mean())
+
+        torch_us = _latency_us(
+            lambda s, a=agent: a.act(s, training=False), batch[0], iters
+        )
+        numpy_us = _latency_us(runner.act, batch[0], iters)
+        click.echo(
+            f"{model_cls.__name__:>11} | {max_diff:>9.2e} | {agree:>7.2%} | "
+            f"{torch_us:>12.1f} | {numpy_us:>12.1f}"
+        )
+
+if __name__ == '__main__':
+    main()
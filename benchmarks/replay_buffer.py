@@ -0,0 +1,94 @@
+"""
+Micro-benchmark for the replay memory.
+
+Compares the legacy deque-of-tuples sampling path against `ReplayBuffer`, and
+measures full sample+update throughput of `BaseDQNAgent.replay()` at several
+memory sizes.
+
+Usage:
+    uv run python benchmarks/replay_buffer.py --sizes 2000,100000,1000000
+"""
+import random
+import time
+from collections import deque
+
+import click
+import numpy as np
+
+from drl_lab.agent import BaseDQNAgent
+from drl_lab.models import DuelingMLP
+from drl_lab.replay import ReplayBuffer
+from drl_lab.utils import Config, setup_logger
+
+def _legacy_sample(memory: deque, batch_size: int) -> tuple[np.ndarray, ...]:
+    minibatch = random.sample(memory, batch_size)
+    return (
+        np.array([i[0] for i in minibatch], dtype=np.float32),
+        np.array([i[1] for i in minibatch], dtype=np.int64),
+        np.array([i[2] for i in minibatch], dtype=np.float32),
+        np.array([i[3] for i in minibatch], dtype=np.float32),
+        np.array([i[4] for i in minibatch], dtype=np.float32),
+    )
+
+def _rate(fn, iters: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return iters / (time.perf_counter() - start)
+
+@click.command()
+@click.option('--sizes', default="2000,100000,1000000", help="Memory sizes.")
+@click.option('--state-size', default=4, help="State vector dimension.")
+@click.option('--batch-size', default=64, help="Minibatch size.")
+@click.option('--iters', default=500, help="Iterations per measurement.")
+@click.option('--skip-legacy', is_flag=True, help="Skip the deque baseline.")
+def main(sizes, state_size, batch_size, iters, skip_legacy):
+    setup_logger()
+    rng = np.random.default_rng(0)
+    action_size = 2
+
+    click.echo(
+        f"{'memory':>10} | {'deque sample/s':>14} | "
+        f"{'buffer sample/s':>15} | {'replay() upd/s':>14}"
+    )
+    for size in (int(s) for s in sizes.split(",")):
+        states = rng.standard_normal((size, state_size)).astype(np.float32)
+        actions = rng.integers(0, action_size, size=size)
+        rewards = rng.standard_normal(size).astype(np.float32)
+        dones = rng.random(size) < 0.05
+
+        legacy_rate = float("nan")
+        if not skip_legacy:
+            memory = deque(maxlen=size)
+            for i in range(size):
+                memory.append(
+                    (states[i], int(actions[i]), float(rewards[i]),
+                     states[(i + 1) % size], bool(dones[i]))
+                )
+            legacy_rate = _rate(lambda m=memory: _legacy_sample(m, batch_size), iters)
+            del memory
+
+        buffer = ReplayBuffer(size, state_size, seed=0)
+        for i in range(size):
+            buffer.push(
+                states[i], actions[i], rewards[i], states[(i + 1) % size], dones[i]
+            )
+        buffer_rate = _rate(lambda b=buffer: b.sample(batch_size), iters)
+
+        config = Config(
+            memory_size=size, batch_size=batch_size, train_start_size=batch_size
+        )
+        agent = BaseDQNAgent(
+            state_size, action_size, config,
+            model_factory=lambda: DuelingMLP(state_size, action_size)
+        )
+        agent.memory = buffer
+        update_rate = _rate(agent.replay, iters)
+
+        click.echo(
+            f"{size:>10} | {legacy_rate:>14.0f} | "
+            f"{buffer_rate:>15.0f} | {update_rate:>14.0f}"
+        )
+
+if __name__ == '__main__':
+    main()
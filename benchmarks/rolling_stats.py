@@ -0,0 +1,112 @@
+"""
+`RollingWindow` and LTTB-downsampled plotting against the previous
+`PlotRenderer`.
+
+Part 1 checks the rolling statistics against NumPy over a random reward
+series (largest differences of mean, min, max and percentiles), and that a
+window rebuilt with `restore` matches one that saw every value. Part 2
+measures the cost of `PlotRenderer.update` per episode for the previous list
+slice plus `np.mean` and for the incremental window, and `render()` time
+with every point against the downsampled plot.
+
+Usage:
+    uv run python benchmarks/rolling_stats.py --episodes 10000,100000,1000000
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import numpy as np
+
+from drl_lab.utils import PlotRenderer, plot, setup_logger
+from drl_lab.utils.stats import RollingWindow
+
+WINDOW = 100
+
+def _parity(n: int) -> tuple[float, bool]:
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 100, n)
+    window = RollingWindow(WINDOW)
+    diff = 0.0
+    for i, v in enumerate(values):
+        window.push(v)
+        ref = values[max(0, i + 1 - WINDOW):i + 1]
+        diff = max(
+            diff,
+            abs(window.mean - ref.mean()),
+            abs(window.min - ref.min()),
+            abs(window.max - ref.max()),
+            *(abs(window.percentile(q) - np.percentile(ref, q)) for q in (10, 50, 90)),
+        )
+    restored = RollingWindow(WINDOW)
+    restored.restore(values[: n - 37])
+    for v in values[n - 37:]:
+        restored.push(v)
+    same = (
+        restored.mean == window.mean and restored.min == window.min
+        and restored.max == window.max
+        and restored.percentile(50) == window.percentile(50)
+    )
+    return diff, same
+
+def _list_update_us(rewards: list[float], iters: int) -> float:
+    """The previous update: append, then average a slice of the list."""
+    moving_avgs = []
+    start = time.perf_counter()
+    for i in range(iters):
+        rewards.append(float(i))
+        moving_avgs.append(np.mean(rewards[-WINDOW:]))
+    return (time.perf_counter() - start) / iters * 1e6
+
+def _window_update_us(plotter: PlotRenderer, iters: int) -> float:
+    start = time.perf_counter()
+    for i in range(iters):
+        plotter.update(float(i))
+    return (time.perf_counter() - start) / iters * 1e6
+
+def _render_s(plotter: PlotRenderer, max_points: int) -> float:
+    """Time of one `render()` with series capped at `max_points`."""
+    default, plot.MAX_PLOT_POINTS = plot.MAX_PLOT_POINTS, max_points
+    try:
+        start = time.perf_counter()
+        plotter._draw(*plotter._snapshot())
+        return time.perf_counter() - start
+    finally:
+        plot.MAX_PLOT_POINTS = default
+
+@click.command()
+@click.option('--episodes', default="10000,100000,1000000", help="Series lengths.")
+@click.option('--parity-values', default=20000, help="Values in the parity check.")
+@click.option('--iters', default=2000, help="Updates per timing.")
+def main(episodes, parity_values, iters):
+    setup_logger()
+    diff, same = _parity(parity_values)
+    click.echo(
+        f"parity over {parity_values} values: max |d| vs numpy {diff:.2e}, "
+        f"restore identical {same}"
+    )
+
+    click.echo(
+        f"\n{'episodes':>9} | {'list upd us':>11} | {'window upd us':>13} | "
+        f"{'full render s':>13} | {'lttb render s':>13}"
+    )
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (int(n) for n in episodes.split(",")):
+            rewards = rng.normal(0, 100, n).cumsum()
+            plotter = PlotRenderer("bench", Path(tmp, "lttb.png"))
+            for r in rewards:
+                plotter.update(r)
+            list_us = _list_update_us(rewards.tolist(), iters)
+            window_us = _window_update_us(plotter, iters)
+
+            full_s = _render_s(plotter, n)
+            lttb_s = _render_s(plotter, plot.MAX_PLOT_POINTS)
+            click.echo(
+                f"{n:>9} | {list_us:>11.2f} | {window_us:>13.2f} | "
+                f"{full_s:>13.2f} | {lttb_s:>13.2f}"
+            )
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,11 @@
-from . import agent as agent, tasks as tasks, utils as utils
+import importlib
+from typing import Any
 
 __all__ = ["agent", "tasks", "utils"]
+
+def __getattr__(name: str) -> Any:
+    # Submodules load on first access so torch-free entry points (e.g. NumPy
+    # inference) never import torch
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
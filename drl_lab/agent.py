@@ -1,13 +1,19 @@
-import random
-from collections import deque
+import contextlib
+import copy
+import os
+import threading
+import time
 from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
 
+from .profiler import PhaseProfiler
+from .replay import PrioritizedReplayBuffer, StateCodec, create_replay_buffer
 from .utils import Config, logger, paths
 
 class BaseDQNAgent:
@@ -16,12 +22,16 @@ class BaseDQNAgent:
     Implements Double DQN (DDQN) logic by default for better stability.
     """
 
+    # Number of exploration draws generated per refill of the random stream
+    RANDOM_BLOCK = 4096
+
     def __init__(
         self, 
         state_size: int, 
         action_size: int, 
         config: Config, 
-        model_factory: Callable[[], nn.Module]
+        model_factory: Callable[[], nn.Module],
+        state_codec: StateCodec | None = None
     ):
         self.state_size = state_size
         self.action_size = action_size
@@ -30,18 +40,134 @@ class BaseDQNAgent:
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         logger.debug(f"Agent initialized on device: {self.device}")
 
-        self.memory: deque = deque(maxlen=config.memory_size)
+        self.memory = create_replay_buffer(config, state_size, state_codec)
+        self.prioritized = isinstance(self.memory, PrioritizedReplayBuffer)
         self.epsilon: float = config.epsilon_start
+        self.beta: float = config.per_beta_start
+
+        # Pre-drawn exploration stream and reusable action-selection buffers
+        self.rng = np.random.default_rng(config.seed)
+        self._uniforms = np.empty(0)
+        self._random_actions = np.empty(0, dtype=np.int64)
+        self._draw_pos = 0
+        # Model input layout: float vectors, or int64 indices for discrete codecs
+        codec = self.memory.codec
+        self._input_shape = codec.input_shape
+        self._input_np_dtype = codec.input_dtype
+        self._input_dtype = torch.from_numpy(np.empty(0, codec.input_dtype)).dtype
+        self._act_input = torch.empty(
+            (1, *self._input_shape), dtype=self._input_dtype, device=self.device
+        )
+        self._act_output = np.empty(1, dtype=np.int64)
         
         # Initialize networks
         self.model = model_factory().to(self.device)
         self.target_model = model_factory().to(self.device)
         self.update_target_model()
+
+        # Network used for action selection. Same object as `model` unless a
+        # concurrent learner is attached (see `use_acting_copy`).
+        self.acting_model = self.model
+        self._acting_lock: contextlib.AbstractContextManager = contextlib.nullcontext()
         
-        self.optimizer = optim.Adam(self.model.parameters(), lr=config.learning_rate)
+        self.optimizer = self._make_optimizer()
+        # Tensor-only steps, replaced by compiled versions in `enable_compile`
+        self._act_step: Callable[[torch.Tensor], torch.Tensor] = self._act_values
+        self._loss_step = self._loss_terms
+        # Host staging (pinned on CUDA) and device tensors for replay batches
+        self._batch_host: tuple[torch.Tensor, ...] = ()
+        self._batch_device: tuple[torch.Tensor, ...] = ()
+        self._unit_weights = np.empty(0, dtype=np.float32)
         
-        # Use Huber Loss (SmoothL1Loss) for stability against outliers
-        self.loss_fn = nn.SmoothL1Loss()
+        # Use Huber Loss (SmoothL1Loss) for stability against outliers.
+        # Reduced manually so prioritized replay can apply per-sample weights.
+        self.loss_fn = nn.SmoothL1Loss(reduction="none")
+        # Times the phases of `replay`; disabled unless a trainer attaches one
+        self.profiler = PhaseProfiler()
+        # Update statistics accumulated for `pop_update_stats`
+        self._reset_update_stats()
+
+        if config.torch_compile:
+            self.enable_compile()
+
+    def _make_optimizer(self) -> optim.Optimizer:
+        """
+        Adam with the fused kernel where this torch build supports it for the
+        device, otherwise the multi-tensor (foreach) implementation.
+        """
+        params = list(self.model.parameters())
+        try:
+            return optim.Adam(params, lr=self.config.learning_rate, fused=True)
+        except RuntimeError:
+            return optim.Adam(params, lr=self.config.learning_rate, foreach=True)
+
+    def _act_values(self, states_t: torch.Tensor) -> torch.Tensor:
+        return self.acting_model(states_t)
+
+    def enable_compile(self, training: bool = True) -> bool:
+        """
+        Compile the action-selection forward and, if `training`, the replay
+        loss (forward and backward) with `torch.compile`, then warm them up
+        on dummy batches. Inductor caches artifacts in the directory of
+        `TORCHINDUCTOR_CACHE_DIR`, which the CLI points at `outputs/` once per
+        process. Falls back to eager execution if compilation fails; returns
+        whether the compiled steps are in use.
+        """
+        act_step = torch.compile(self._act_values)
+        loss_step = torch.compile(self._loss_terms) if training else self._loss_step
+        try:
+            start = time.perf_counter()
+            with torch.inference_mode():
+                act_step(self._zero_inputs(1))
+            if training:
+                self._warm_up_loss(loss_step)
+        except Exception as e:
+            self.optimizer.zero_grad(set_to_none=True)
+            logger.warning(f"torch.compile failed, using eager mode: {e}")
+            return False
+
+        self._act_step = act_step
+        self._loss_step = loss_step
+        logger.info(
+            f"Compiled model in {time.perf_counter() - start:.1f}s "
+            f"(cache: {os.environ.get('TORCHINDUCTOR_CACHE_DIR', 'torch default')})"
+        )
+        return True
+
+    def _zero_inputs(self, n: int) -> torch.Tensor:
+        """A batch of `n` all-zero model inputs."""
+        return torch.zeros(
+            (n, *self._input_shape), dtype=self._input_dtype, device=self.device
+        )
+
+    def _warm_up_loss(self, loss_step: Callable[..., tuple]) -> None:
+        """Run the loss forward and backward once on a zero batch."""
+        batch_size = self.config.batch_size
+        with self._autocast():
+            loss, *_ = loss_step(
+                self._zero_inputs(2 * batch_size),
+                torch.zeros((batch_size, 1), dtype=torch.int64, device=self.device),
+                torch.zeros((batch_size, 1), device=self.device),
+                torch.zeros((batch_size, 1), device=self.device),
+                torch.ones((batch_size, 1), device=self.device),
+            )
+        loss.backward()
+        self.optimizer.zero_grad(set_to_none=True)
+
+    def use_acting_copy(self) -> None:
+        """
+        Act with a separate copy of the policy, refreshed only through
+        `publish_acting_model`, so another thread can keep updating `model`.
+        """
+        self.acting_model = copy.deepcopy(self.model)
+        self._acting_lock = threading.Lock()
+
+    def publish_acting_model(self) -> None:
+        """Copy the current policy weights into the acting copy."""
+        if self.acting_model is self.model:
+            return
+        with self._acting_lock:
+            self.acting_model.load_state_dict(self.model.state_dict())
 
     def update_target_model(self) -> None:
         """Transfer weights from the policy model to the target model."""
@@ -55,29 +181,196 @@ class BaseDQNAgent:
         next_state: np.ndarray | list, 
         done: bool
     ) -> None:
-        """Store a transition tuple in the replay memory."""
-        self.memory.append((state, action, reward, next_state, done))
+        """Store a transition in the replay memory."""
+        self.memory.push(state, action, reward, next_state, done)
+
+    def remember_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray
+    ) -> None:
+        """Store one transition per row (e.g. from a vector env step)."""
+        self.memory.push_batch(states, actions, rewards, next_states, dones)
+
+    def _draw(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Take `n` (uniform, random action) pairs from the pre-drawn random
+        stream, refilling it in blocks so exploration never calls the
+        generator per step.
+        """
+        if self._draw_pos + n > len(self._uniforms):
+            size = max(self.RANDOM_BLOCK, n)
+            self._uniforms = self.rng.random(size)
+            self._random_actions = self.rng.integers(0, self.action_size, size)
+            self._draw_pos = 0
+        i = self._draw_pos
+        self._draw_pos = i + n
+        return self._uniforms[i:i + n], self._random_actions[i:i + n]
+
+    def _greedy(self, states: np.ndarray) -> np.ndarray:
+        """Greedy actions for a batch, reusing the input and output buffers."""
+        n = len(states)
+        if n > len(self._act_output):
+            self._act_input = torch.empty(
+                (n, *states.shape[1:]), dtype=self._act_input.dtype, device=self.device
+            )
+            self._act_output = np.empty(n, dtype=np.int64)
+
+        actions = self._act_output[:n]
+        actions_t = torch.from_numpy(actions)
+        with self._acting_lock, torch.inference_mode():
+            state_t = self._act_input[:n]
+            state_t.copy_(torch.from_numpy(states))
+            act_values = self._act_step(state_t)
+            if self.device.type == "cpu":
+                torch.argmax(act_values, dim=1, out=actions_t)
+            else:
+                actions_t.copy_(act_values.argmax(dim=1))
+        return actions
+
+    def act_batch(self, states: np.ndarray, training: bool = True) -> np.ndarray:
+        """
+        Select an action for every row of `states` (shape (N, state_size),
+        or (N,) indices for a discrete codec) with one forward pass.
+        Epsilon-greedy per row if training, otherwise greedy. The returned
+        array is reused by the next call.
+        """
+        states = np.asarray(states, dtype=self._input_np_dtype)
+        if states.ndim == len(self._input_shape):
+            states = states.reshape(1, *self._input_shape)
+
+        if not training:
+            return self._greedy(states)
+
+        uniforms, random_actions = self._draw(len(states))
+        explore = uniforms <= self.epsilon
+        if explore.all():
+            # Pure exploration needs no forward pass
+            return random_actions
+
+        actions = self._greedy(states)
+        np.copyto(actions, random_actions, where=explore)
+        return actions
 
     def act(self, state: np.ndarray | list, training: bool = True) -> int:
         """
         Select an action using an epsilon-greedy policy if training, otherwise greedy.
         """
-        if training and np.random.rand() <= self.epsilon:
-            return random.randrange(self.action_size)
-        
-        # Prepare state tensor
-        if isinstance(state, list):
-            state = np.array(state)
-        
-        if state.ndim == 1:
-            state = np.expand_dims(state, axis=0)  # Shape: (1, state_size)
-            
-        state_t = torch.FloatTensor(state).to(self.device)
-        
+        return int(self.act_batch(state, training)[0])
+
+    def _batch_tensors(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray,
+        weights: np.ndarray | None
+    ) -> tuple[torch.Tensor, ...]:
+        """
+        Wrap a sampled batch as tensors without per-call allocation.
+
+        Returns (state_pair, actions, rewards, dones, weights): `state_pair`
+        stacks states over next states so both go through the online network
+        in one forward pass; the rest are column vectors. On CPU the replay
+        buffer's arrays are shared via `torch.from_numpy`; on CUDA they are
+        copied into pinned staging tensors and uploaded asynchronously.
+        """
+        batch_size = len(actions)
+        pair = states.base
+        if not (
+            pair is not None
+            and pair is next_states.base
+            and pair.shape[0] == 2 * batch_size
+            and pair.flags.c_contiguous
+        ):
+            # Buffer did not hand out adjacent halves of one block
+            pair = np.concatenate((states, next_states))
+        if weights is None:
+            if len(self._unit_weights) != batch_size:
+                self._unit_weights = np.ones(batch_size, dtype=np.float32)
+            weights = self._unit_weights
+        arrays = (pair, actions, rewards, dones, weights)
+
+        if self.device.type == "cpu":
+            tensors = tuple(torch.from_numpy(a) for a in arrays)
+        else:
+            if not self._batch_host or len(self._batch_host[1]) != batch_size:
+                self._batch_host = tuple(
+                    torch.empty(a.shape, dtype=torch.from_numpy(a).dtype)
+                    .pin_memory()
+                    for a in arrays
+                )
+                self._batch_device = tuple(
+                    torch.empty_like(t, device=self.device)
+                    for t in self._batch_host
+                )
+            for host, device_t, array in zip(
+                self._batch_host, self._batch_device, arrays, strict=True
+            ):
+                host.copy_(torch.from_numpy(array))
+                device_t.copy_(host, non_blocking=True)
+            tensors = self._batch_device
+
+        pair_t, actions_t, rewards_t, dones_t, weights_t = tensors
+        return (
+            pair_t,
+            actions_t.unsqueeze(1),
+            rewards_t.unsqueeze(1),
+            dones_t.unsqueeze(1),
+            weights_t.unsqueeze(1),
+        )
+
+    def _loss_terms(
+        self,
+        pair_t: torch.Tensor,
+        actions_t: torch.Tensor,
+        rewards_t: torch.Tensor,
+        dones_t: torch.Tensor,
+        weights_t: torch.Tensor
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Double DQN loss over a batch from `_batch_tensors`, weighted per
+        sample (all ones without prioritized replay). Returns the loss, the
+        detached TD errors and the detached Q-values of the taken actions.
+        """
+        batch_size = actions_t.shape[0]
+
+        # 1. One online forward over states and next states
+        # Q-values are widened so the loss is reduced in float32 under autocast
+        q_values = self.model(pair_t).float()
+        current_q_values = q_values[:batch_size].gather(1, actions_t)
+
+        # 2. Target Q values (Next State)
         with torch.no_grad():
-            act_values = self.model(state_t)
+            # Double DQN: online network picks, target network evaluates
+            next_actions = q_values[batch_size:].argmax(1, keepdim=True)
+            next_q_values = self.target_model(pair_t[batch_size:]).float().gather(
+                1, next_actions
+            )
             
-        return int(np.argmax(act_values.cpu().data.numpy()))
+            # Compute Target
+            gamma = self.config.gamma
+            target_q_values = rewards_t + (gamma * next_q_values * (1.0 - dones_t))
+
+        # 3. Loss. Importance-sampling weights correct the non-uniform
+        # sampling bias of prioritized replay.
+        elementwise_loss = self.loss_fn(current_q_values, target_q_values)
+        loss = (weights_t * elementwise_loss).mean()
+        td_errors = (target_q_values - current_q_values).detach()
+        return loss, td_errors, current_q_values.detach()
+
+    def _autocast(self) -> contextlib.AbstractContextManager:
+        """
+        bfloat16 autocast for the replay forward pass if `Config.bf16_autocast`
+        is set. Master weights, optimizer state and the loss stay float32.
+        """
+        if not self.config.bf16_autocast:
+            return contextlib.nullcontext()
+        return torch.autocast(self.device.type, dtype=torch.bfloat16)
 
     def replay(self) -> float:
         """
@@ -87,47 +380,123 @@ class BaseDQNAgent:
         if len(self.memory) < self.config.train_start_size:
             return 0.0
 
-        minibatch = random.sample(self.memory, self.config.batch_size)
-        
-        # Vectorized batch processing
-        states = np.array([i[0] for i in minibatch], dtype=np.float32)
-        actions = np.array([i[1] for i in minibatch], dtype=np.int64) 
-        rewards = np.array([i[2] for i in minibatch], dtype=np.float32)
-        next_states = np.array([i[3] for i in minibatch], dtype=np.float32)
-        dones = np.array([i[4] for i in minibatch], dtype=np.float32)
-
-        # To device
-        states_t = torch.FloatTensor(states).to(self.device)
-        actions_t = torch.LongTensor(actions).unsqueeze(1).to(self.device) 
-        rewards_t = torch.FloatTensor(rewards).unsqueeze(1).to(self.device) 
-        next_states_t = torch.FloatTensor(next_states).to(self.device)
-        dones_t = torch.FloatTensor(dones).unsqueeze(1).to(self.device) 
-
-        # 1. Predicted Q values (Current State)
-        current_q_values = self.model(states_t).gather(1, actions_t)
+        with self.profiler.section("agent.replay"):
+            return self._update()
 
-        # 2. Target Q values (Next State)
-        with torch.no_grad():
-            # Double DQN Logic
-            next_actions = self.model(next_states_t).argmax(1, keepdim=True)
-            next_q_values = self.target_model(next_states_t).gather(1, next_actions)
-            
-            # Compute Target
-            gamma = self.config.gamma
-            target_q_values = rewards_t + (gamma * next_q_values * (1.0 - dones_t))
+    def _update(self) -> float:
+        """One Double DQN update on a sampled batch, timed phase by phase."""
+        section = self.profiler.section
 
-        # 3. Loss & Optimization
-        loss = self.loss_fn(current_q_values, target_q_values)
+        # Vectorized gather into the buffer's reusable batch arrays
+        batch_size = self.config.batch_size
+        weights = None
+        with section("agent.replay/sample"):
+            if self.prioritized:
+                (
+                    states, actions, rewards, next_states, dones, indices, weights
+                ) = self.memory.sample(batch_size, self.beta)
+                self._anneal_beta()
+            else:
+                states, actions, rewards, next_states, dones = self.memory.sample(
+                    batch_size
+                )
 
-        self.optimizer.zero_grad()
-        loss.backward()
-        
-        # Optional: Gradient Clipping to further stabilize training
-        torch.nn.utils.clip_grad_norm_(self.model.parameters(), 1.0)
+        with section("agent.replay/h2d"):
+            pair_t, actions_t, rewards_t, dones_t, weights_t = self._batch_tensors(
+                states, actions, rewards, next_states, dones, weights
+            )
+
+        with section("agent.replay/forward"), self._autocast():
+            loss, td_errors, q_taken = self._loss_step(
+                pair_t, actions_t, rewards_t, dones_t, weights_t
+            )
+        if self.prioritized:
+            with section("agent.replay/priorities"):
+                self.memory.update_priorities(
+                    indices, td_errors.squeeze(1).cpu().numpy()
+                )
+
+        with section("agent.replay/backward"):
+            self.optimizer.zero_grad(set_to_none=True)
+            loss.backward()
         
-        self.optimizer.step()
-            
-        return loss.item()
+        with section("agent.replay/optimizer"):
+            # Optional: Gradient Clipping to further stabilize training
+            torch.nn.utils.clip_grad_norm_(
+                self.model.parameters(), 1.0, foreach=True
+            )
+            self.optimizer.step()
+
+        # One device-to-host transfer for the loss and the Q statistics
+        loss_value, q_mean, q_max = torch.stack(
+            (loss.detach(), q_taken.mean(), q_taken.max())
+        ).tolist()
+        self._stats_updates += 1
+        self._stats_loss += loss_value
+        self._stats_q_mean += q_mean
+        self._stats_q_max = max(self._stats_q_max, q_max)
+        return loss_value
+
+    def pop_update_stats(self) -> dict[str, float] | None:
+        """
+        Mean loss, mean and max Q-value of the taken actions over the updates
+        since the last call (None if there were none), then reset the sums.
+        """
+        if not self._stats_updates:
+            return None
+        n = self._stats_updates
+        stats = {
+            "updates": n,
+            "loss": self._stats_loss / n,
+            "q_mean": self._stats_q_mean / n,
+            "q_max": self._stats_q_max,
+        }
+        self._reset_update_stats()
+        return stats
+
+    def _reset_update_stats(self) -> None:
+        self._stats_updates = 0
+        self._stats_loss = 0.0
+        self._stats_q_mean = 0.0
+        self._stats_q_max = -float("inf")
+
+    def _anneal_beta(self) -> None:
+        """Linearly anneal the importance-sampling exponent towards 1."""
+        step = (1.0 - self.config.per_beta_start) / max(self.config.per_beta_steps, 1)
+        self.beta = min(1.0, self.beta + step)
+
+    def checkpoint_state(self, include_replay: bool = False) -> dict[str, Any]:
+        """
+        Everything needed to resume training: both networks, the optimizer,
+        exploration and PER schedules, the pre-drawn random stream and the
+        replay buffer (its contents only if `include_replay`).
+        """
+        return {
+            "model": self.model.state_dict(),
+            "target_model": self.target_model.state_dict(),
+            "optimizer": self.optimizer.state_dict(),
+            "epsilon": self.epsilon,
+            "beta": self.beta,
+            "rng": self.rng.bit_generator.state,
+            "uniforms": self._uniforms,
+            "random_actions": self._random_actions,
+            "draw_pos": self._draw_pos,
+            "replay": self.memory.state_dict(include_replay),
+        }
+
+    def load_checkpoint_state(self, state: dict[str, Any]) -> None:
+        """Restore a `checkpoint_state` snapshot (NumPy parts as arrays)."""
+        self.model.load_state_dict(state["model"])
+        self.target_model.load_state_dict(state["target_model"])
+        self.optimizer.load_state_dict(state["optimizer"])
+        self.publish_acting_model()
+        self.epsilon = state["epsilon"]
+        self.beta = state["beta"]
+        self.rng.bit_generator.state = state["rng"]
+        self._uniforms = state["uniforms"]
+        self._random_actions = state["random_actions"]
+        self._draw_pos = state["draw_pos"]
+        self.memory.load_state_dict(state["replay"])
 
     def load(self, path: str | Path) -> None:
         """Load model weights from a file."""
@@ -0,0 +1,309 @@
+import dataclasses
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+
+from .agent import BaseDQNAgent
+from .checkpoint import load_checkpoint, save_checkpoint, to_torch
+from .export import sample_states
+from .tasks import BaseTask, get_all_tasks, get_task
+from .utils import Config, logger, paths
+
+# Fixed suite settings: results are only comparable between runs that use them
+SEED = 0
+# Throughputs are the best of this many timed rounds, to damp scheduler noise
+ROUNDS = 5
+ENV_STEPS = 2000
+VECTOR_ENVS = {"sync": 16, "native": 256}
+VECTOR_STEPS = 200
+ACT_BATCH_SIZES = (1, 16, 256, 4096)
+ACT_CALLS = {1: 2000, 16: 1000, 256: 300, 4096: 50}
+REPLAY_BATCH_SIZES = (32, 64, 256)
+REPLAY_MEMORY_SIZES = (2_000, 100_000)
+REPLAY_UPDATES = 50
+CHECKPOINT_MEMORY = 100_000
+CHECKPOINT_REPEATS = 5
+IMPORT_REPEATS = 5
+
+@dataclass
+class Metric:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+    # Relative change in the "worse" direction (0.1 = 10% slower)
+    regression: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1.0 if self.baseline else 0.0
+
+def _bench_config(task: BaseTask, **overrides: Any) -> Config:
+    """The task's config with everything that varies between runs pinned."""
+    return dataclasses.replace(
+        task.config,
+        seed=SEED,
+        torch_compile=False,
+        bf16_autocast=False,
+        prioritized_replay=False,
+        replay_backend="memory",
+        **overrides,
+    )
+
+def _agent(task: BaseTask, config: Config) -> BaseDQNAgent:
+    torch.manual_seed(SEED)
+    return BaseDQNAgent(
+        task.state_size, task.action_size, config,
+        model_factory=task.create_model,
+        state_codec=task.state_codec(),
+    )
+
+def _fill(agent: BaseDQNAgent, pool: np.ndarray, size: int) -> None:
+    """Push `size` random transitions drawn from a pool of real states."""
+    rng = np.random.default_rng(SEED)
+    rows = rng.integers(0, len(pool), (2, size))
+    agent.memory.push_batch(
+        pool[rows[0]],
+        rng.integers(0, agent.action_size, size),
+        rng.standard_normal(size).astype(np.float32),
+        pool[rows[1]],
+        rng.random(size) < 0.05,
+    )
+
+def _best_rate(run: Callable[[], None], items: int) -> float:
+    """Items per second of the fastest of `ROUNDS` calls to `run`."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return items / best
+
+def _env_metrics(task: BaseTask) -> list[Metric]:
+    metrics = []
+    env = task.make_limited_env()
+    env.action_space.seed(SEED)
+    env.reset(seed=SEED)
+
+    def run_single() -> None:
+        for _ in range(ENV_STEPS):
+            _, _, terminated, truncated, _ = env.step(env.action_space.sample())
+            if terminated or truncated:
+                env.reset()
+
+    rate = _best_rate(run_single, ENV_STEPS)
+    env.close()
+    metrics.append(Metric("env.single", rate, "steps/s", True))
+
+    rng = np.random.default_rng(SEED)
+    for backend, num_envs in VECTOR_ENVS.items():
+        try:
+            envs = task.get_vector_env(num_envs, backend)
+        except ValueError:
+            continue # Backend not available for this task
+        actions = rng.integers(0, task.action_size, (VECTOR_STEPS, num_envs))
+        envs.reset(seed=SEED)
+
+        def run_vector(envs=envs, actions=actions) -> None:
+            for t in range(VECTOR_STEPS):
+                envs.step(actions[t])
+
+        rate = _best_rate(run_vector, VECTOR_STEPS * num_envs)
+        envs.close()
+        metrics.append(
+            Metric(f"env.{backend}@{num_envs}", rate, "steps/s", True)
+        )
+    return metrics
+
+def _act_metrics(task: BaseTask, pool: np.ndarray) -> list[Metric]:
+    agent = _agent(task, _bench_config(task))
+    metrics = []
+    for batch_size in ACT_BATCH_SIZES:
+        states = pool[:batch_size]
+        for _ in range(10):
+            agent.act_batch(states, training=False)
+        calls = ACT_CALLS[batch_size]
+        latencies = np.empty(calls)
+        for i in range(calls):
+            start = time.perf_counter_ns()
+            agent.act_batch(states, training=False)
+            latencies[i] = time.perf_counter_ns() - start
+        for q in (50, 90, 99):
+            metrics.append(Metric(
+                f"act.b{batch_size}.p{q}", np.percentile(latencies, q) / 1e3,
+                "us", False
+            ))
+    return metrics
+
+def _replay_metrics(task: BaseTask, pool: np.ndarray) -> list[Metric]:
+    metrics = []
+    for memory_size in REPLAY_MEMORY_SIZES:
+        for batch_size in REPLAY_BATCH_SIZES:
+            config = _bench_config(
+                task, batch_size=batch_size, memory_size=memory_size,
+                train_start_size=batch_size,
+            )
+            agent = _agent(task, config)
+            _fill(agent, pool, memory_size)
+            for _ in range(10):
+                agent.replay()
+
+            def run_replay(agent=agent) -> None:
+                for _ in range(REPLAY_UPDATES):
+                    agent.replay()
+
+            metrics.append(Metric(
+                f"replay.b{batch_size}.m{memory_size}",
+                _best_rate(run_replay, REPLAY_UPDATES), "updates/s", True
+            ))
+    return metrics
+
+def _checkpoint_metrics(task: BaseTask, pool: np.ndarray) -> list[Metric]:
+    config = _bench_config(task, memory_size=CHECKPOINT_MEMORY)
+    agent = _agent(task, config)
+    _fill(agent, pool, CHECKPOINT_MEMORY)
+    agent.replay()
+    metrics = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for include_replay in (False, True):
+            label = "checkpoint_replay" if include_replay else "checkpoint"
+            path = Path(tmp) / f"{label}.ckpt"
+            save_s, load_s = [], []
+            for _ in range(CHECKPOINT_REPEATS):
+                start = time.perf_counter()
+                state = to_torch(agent.checkpoint_state(include_replay))
+                save_checkpoint(state, path)
+                save_s.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                load_checkpoint(path)
+                load_s.append(time.perf_counter() - start)
+            metrics += [
+                Metric(f"{label}.save", min(save_s) * 1e3, "ms", False),
+                Metric(f"{label}.load", min(load_s) * 1e3, "ms", False),
+                Metric(f"{label}.size", path.stat().st_size / 2**20, "MiB", False),
+            ]
+    return metrics
+
+def _import_metric() -> Metric:
+    """Fresh-interpreter import time of the CLI entry point."""
+    timings = []
+    for _ in range(IMPORT_REPEATS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", "import drl_lab.cli.main"], check=True
+        )
+        timings.append(time.perf_counter() - start)
+    return Metric("cli.import", min(timings) * 1e3, "ms", False)
+
+def run_suite(task_names: list[str] | None = None) -> dict[str, Any]:
+    """
+    Run the fixed, seeded benchmark suite for `task_names` (default: every
+    registered task). Per task it measures env steps/s (single env and the
+    vector backends the task supports), `act_batch` latency percentiles per
+    batch size, `replay()` updates/s over batch and memory sizes, and
+    checkpoint save/load time and size; plus the CLI import time.
+    """
+    task_names = task_names or list(get_all_tasks())
+    metrics: list[Metric] = []
+    for name in task_names:
+        task = get_task(name)
+        logger.info(f"Benchmarking {task.name}...")
+        pool = sample_states(task, max(ACT_BATCH_SIZES), seed=SEED)
+        for section in (_env_metrics(task), _act_metrics(task, pool),
+                        _replay_metrics(task, pool), _checkpoint_metrics(task, pool)):
+            for metric in section:
+                metric.name = f"{name}/{metric.name}"
+                metrics.append(metric)
+    metrics.append(_import_metric())
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "torch": torch.__version__,
+            "numpy": np.__version__,
+            "torch_threads": torch.get_num_threads(),
+            "device": "cuda" if torch.cuda.is_available() else "cpu",
+            "tasks": task_names,
+        },
+        "metrics": {m.name: dataclasses.asdict(m) for m in metrics},
+    }
+
+def save_results(results: dict[str, Any], path: str | Path) -> Path:
+    path = paths.ensure_dir(Path(path))
+    path.write_text(json.dumps(results, indent=2))
+    return path
+
+def load_results(path: str | Path) -> dict[str, Any]:
+    with Path(path).open() as f:
+        return json.load(f)
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any]
+) -> list[Comparison]:
+    """Metric-by-metric comparison for the metrics present in both runs."""
+    comparisons = []
+    for name, metric in current["metrics"].items():
+        base = baseline["metrics"].get(name)
+        if base is None or not base["value"]:
+            continue
+        ratio = metric["value"] / base["value"]
+        regression = 1.0 - ratio if metric["higher_is_better"] else ratio - 1.0
+        comparisons.append(
+            Comparison(name, base["value"], metric["value"], regression)
+        )
+    return comparisons
+
+def format_table(
+    results: dict[str, Any],
+    comparisons: list[Comparison] | None = None,
+    threshold: float = 0.1
+) -> str:
+    """Render results, and their change against a baseline, as a text table."""
+    by_name = {c.name: c for c in comparisons or []}
+    header = ["metric", "value", "unit"]
+    if comparisons is not None:
+        header += ["baseline", "change", ""]
+    rows = []
+    for name, m in results["metrics"].items():
+        row = [name, f"{m['value']:.4g}", m["unit"]]
+        if comparisons is not None:
+            c = by_name.get(name)
+            if c is None:
+                row += ["-", "-", "new"]
+            else:
+                flag = (
+                    "REGRESSION" if c.regression > threshold
+                    else "improved" if c.regression < -threshold
+                    else ""
+                )
+                row += [f"{c.baseline:.4g}", f"{c.change:+.1%}", flag]
+        rows.append(row)
+    widths = [
+        max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(header)
+    ]
+
+    def fmt(cells: list[str]) -> str:
+        return " | ".join(c.ljust(w) for c, w in zip(cells, widths, strict=True))
+
+    lines = [fmt(header), "-+-".join("-" * w for w in widths)]
+    lines.extend(fmt(row) for row in rows)
+    return "\n".join(lines)
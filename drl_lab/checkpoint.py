@@ -0,0 +1,201 @@
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+
+from .utils import logger, paths
+
+# Bumped when the checkpoint layout changes incompatibly
+CHECKPOINT_VERSION = 1
+
+def to_torch(tree: Any) -> Any:
+    """
+    Convert NumPy arrays and scalars nested in dicts, lists and tuples into
+    tensors and Python numbers, so the tree loads with `weights_only=True`.
+    """
+    if isinstance(tree, dict):
+        return {k: to_torch(v) for k, v in tree.items()}
+    if isinstance(tree, (list, tuple)):
+        return type(tree)(to_torch(v) for v in tree)
+    if isinstance(tree, np.ndarray):
+        return torch.from_numpy(np.ascontiguousarray(tree))
+    if isinstance(tree, np.generic):
+        return tree.item()
+    return tree
+
+def to_numpy(tree: Any) -> Any:
+    """Inverse of `to_torch`: tensors nested in `tree` become NumPy arrays."""
+    if isinstance(tree, dict):
+        return {k: to_numpy(v) for k, v in tree.items()}
+    if isinstance(tree, (list, tuple)):
+        return type(tree)(to_numpy(v) for v in tree)
+    if isinstance(tree, torch.Tensor):
+        return tree.cpu().numpy()
+    return tree
+
+def snapshot(tree: Any) -> Any:
+    """
+    Detached CPU copy of every tensor and NumPy array nested in `tree`, so
+    it can be written later while training keeps mutating the originals.
+    """
+    if isinstance(tree, dict):
+        return {k: snapshot(v) for k, v in tree.items()}
+    if isinstance(tree, (list, tuple)):
+        return type(tree)(snapshot(v) for v in tree)
+    if isinstance(tree, torch.Tensor):
+        tree = tree.detach()
+        return tree.clone() if tree.device.type == "cpu" else tree.cpu()
+    if isinstance(tree, np.ndarray):
+        return tree.copy()
+    return tree
+
+def atomic_save(obj: Any, path: str | Path) -> Path:
+    """
+    `torch.save` to a temporary file in the same directory, synced to disk
+    and renamed over `path`, so a crash mid-write leaves the previous file
+    intact.
+    """
+    path = paths.ensure_dir(Path(path))
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("wb") as f:
+        torch.save(obj, f)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp_path.replace(path)
+    return path
+
+def save_checkpoint(state: dict[str, Any], path: str | Path) -> Path:
+    """Atomically write a training checkpoint."""
+    return atomic_save({"version": CHECKPOINT_VERSION, **state}, path)
+
+def load_checkpoint(
+    path: str | Path, map_location: str | torch.device = "cpu"
+) -> dict[str, Any]:
+    """Load a checkpoint written by `save_checkpoint`."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Checkpoint not found: {path}")
+    state = torch.load(path, map_location=map_location, weights_only=True)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"Unsupported checkpoint version {state.get('version')} in {path}."
+        )
+    return state
+
+@dataclass
+class _WriteJob:
+    state: Any
+    path: Path
+    # Set for best-model snapshots that take part in top-K retention
+    score: float | None = None
+    episode: int = 0
+
+class CheckpointWriter:
+    """
+    Writes checkpoints on a background thread so training never waits on
+    disk I/O.
+
+    Callers pass CPU snapshots (see `snapshot`). Pending writes are keyed by
+    destination path: a newer submission for the same path replaces one not
+    yet written, so a burst of new bests costs a single write of the
+    latest. Every file is written with `atomic_save`. Best models saved via
+    `save_best` are also archived in `<stem>_best/` as
+    `ep{episode}_{score}.pth`, keeping only the `keep_best` highest scores.
+    """
+
+    ARCHIVE_PATTERN = re.compile(r"^ep\d+_([+-]\d+\.\d+)\.pth$")
+
+    def __init__(self, keep_best: int = 0):
+        self.keep_best = keep_best
+        self.writes = 0
+        self.coalesced = 0
+        self._pending: dict[Path, _WriteJob] = {}
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="checkpoint-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _submit(self, job: _WriteJob) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("CheckpointWriter is closed.")
+            if job.path in self._pending:
+                self.coalesced += 1
+            self._pending[job.path] = job
+            self._cond.notify_all()
+
+    def save(self, state: Any, path: str | Path) -> None:
+        """Queue `state` to be written to `path`."""
+        self._submit(_WriteJob(state, Path(path)))
+
+    def save_checkpoint(self, state: dict[str, Any], path: str | Path) -> None:
+        """Queue a training checkpoint (see `save_checkpoint`)."""
+        self.save({"version": CHECKPOINT_VERSION, **state}, path)
+
+    def save_best(
+        self, state: Any, path: str | Path, score: float, episode: int
+    ) -> None:
+        """Queue a new best model for `path` and the top-K archive."""
+        self._submit(_WriteJob(state, Path(path), score, episode))
+
+    def flush(self) -> None:
+        """Block until every queued write has finished."""
+        with self._cond:
+            self._cond.wait_for(lambda: not self._pending and not self._busy)
+
+    def close(self) -> None:
+        """Write what is still queued and stop the thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                jobs = list(self._pending.values())
+                self._pending.clear()
+                self._busy = True
+            for job in jobs:
+                try:
+                    self._write(job)
+                except Exception as e:
+                    logger.error(f"Failed to write checkpoint {job.path}: {e}")
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def _write(self, job: _WriteJob) -> None:
+        atomic_save(job.state, job.path)
+        self.writes += 1
+        logger.debug(f"Wrote checkpoint {job.path}")
+        if job.score is None or self.keep_best <= 0:
+            return
+
+        archive_dir = paths.get_best_dir(job.path)
+        archived = archive_dir / f"ep{job.episode:05d}_{job.score:+.4f}.pth"
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = archived.with_name(f"{archived.name}.tmp")
+        shutil.copyfile(job.path, tmp_path)
+        tmp_path.replace(archived)
+
+        scored = []
+        for entry in archive_dir.iterdir():
+            match = self.ARCHIVE_PATTERN.match(entry.name)
+            if match:
+                scored.append((float(match.group(1)), entry.name, entry))
+        scored.sort(reverse=True)
+        for _, _, entry in scored[self.keep_best:]:
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,75 @@
+import click
+
+from ..utils import logger, paths
+
+@click.command(name="bench")
+@click.option(
+    '--tasks', 
+    'task_names', 
+    default=None, 
+    help="Comma-separated tasks to benchmark (default: all registered)."
+)
+@click.option(
+    '--output', 
+    default=None, 
+    help="Results JSON path (default: outputs/bench.json)."
+)
+@click.option(
+    '--compare', 
+    'baseline', 
+    default=None, 
+    type=click.Path(exists=True, dir_okay=False), 
+    help="Baseline results JSON to check for regressions."
+)
+@click.option(
+    '--threshold', 
+    default=0.1, 
+    help="Relative slowdown flagged as a regression with --compare."
+)
+@click.option(
+    '--threads', 
+    type=int, 
+    default=None, 
+    help="Torch intra-op threads (default: torch's choice)."
+)
+def bench_cmd(task_names, output, baseline, threshold, threads):
+    """Run the seeded throughput suite and optionally compare to a baseline."""
+    # Imported here so commands that don't train never load torch
+    import torch
+
+    from ..bench import compare, format_table, load_results, run_suite, save_results
+    from ..tasks import get_all_tasks
+    from ..utils.matching import fuzzy_match
+
+    if threads:
+        torch.set_num_threads(threads)
+    names = None
+    if task_names:
+        available = list(get_all_tasks())
+        names = [fuzzy_match(n.strip(), available) for n in task_names.split(",")]
+
+    results = run_suite(names)
+    path = save_results(results, output or paths.get_bench_path())
+    logger.info(f"Benchmark results saved to {path}")
+
+    comparisons = None
+    if baseline:
+        base = load_results(baseline)
+        for key in ("python", "torch", "numpy", "torch_threads", "device", "processor"):
+            if base["meta"].get(key) != results["meta"][key]:
+                logger.warning(
+                    f"Baseline {key} differs: {base['meta'].get(key)} vs "
+                    f"{results['meta'][key]}"
+                )
+        comparisons = compare(results, base)
+    click.echo(format_table(results, comparisons, threshold))
+
+    if comparisons:
+        regressed = [c for c in comparisons if c.regression > threshold]
+        if regressed:
+            logger.error(
+                f"{len(regressed)} metric(s) regressed by more than "
+                f"{threshold:.0%} against {baseline}."
+            )
+            raise SystemExit(1)
+        logger.success(f"No regressions beyond {threshold:.0%} against {baseline}.")
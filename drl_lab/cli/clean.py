@@ -1,5 +1,8 @@
+import shutil
+
 import click
 
+from ..policy import EXPORT_SUFFIXES
 from ..utils import logger, paths
 
 @click.command(name="clean")
@@ -25,9 +28,23 @@ def clean_cmd(task_name, clean_all):
             logger.info("Outputs directory is already empty.")
             return
     elif task_name:
+        model_path = paths.get_model_path(task_name)
         files_to_remove = [
-            paths.get_model_path(task_name),
+            model_path,
+            *(model_path.with_suffix(s) for s in EXPORT_SUFFIXES.values()),
+            paths.get_checkpoint_path(model_path),
+            paths.get_best_dir(model_path),
+            paths.get_profile_path(model_path),
+            paths.get_metrics_path(model_path),
+            paths.get_trace_dir(model_path),
             paths.get_plot_path(task_name),
+            paths.get_replay_dir(task_name),
+            # Ensemble (`train --seeds`) outputs
+            paths.get_ensemble_summary_path(paths.get_plot_path(task_name)),
+            *paths.get_seed_paths(model_path),
+            *(paths.get_best_dir(p) for p in paths.get_seed_paths(model_path)),
+            *paths.get_seed_paths(paths.get_plot_path(task_name)),
+            *paths.get_seed_paths(paths.get_replay_dir(task_name)),
         ]
     else:
         logger.error("Please specify a TASK_NAME or use --all.")
@@ -35,9 +52,12 @@ def clean_cmd(task_name, clean_all):
     
     cleaned_count = 0
     for file_path in files_to_remove:
-        if file_path.exists() and file_path.is_file():
+        if file_path.exists():
             try:
-                file_path.unlink()
+                if file_path.is_dir():
+                    shutil.rmtree(file_path)
+                else:
+                    file_path.unlink()
                 logger.info(f"Removed: {file_path}")
                 cleaned_count += 1
             except Exception as e:
@@ -0,0 +1,45 @@
+import click
+
+from ..policy import WEIGHT_DTYPES
+from ..tasks import get_task
+from ..utils import logger, paths
+
+@click.command(name="export")
+@click.argument('task', default='cliff_walking')
+@click.option(
+    '--weight', 
+    default=None, 
+    help="Path of the trained .pth weights. Default: the task's output model."
+)
+@click.option(
+    '--output', 
+    default=None, 
+    help="Path of the exported .npz (single --dtype only)."
+)
+@click.option(
+    '--dtype', 
+    'dtypes', 
+    type=click.Choice(WEIGHT_DTYPES), 
+    multiple=True, 
+    help="Weight format to export; repeatable. Default: float32."
+)
+@click.option(
+    '--states', 
+    default=2048, 
+    help="States sampled with a random policy for the comparison."
+)
+@click.option('--batch-size', default=256, help="Batch size for latency.")
+def export_cmd(task, weight, output, dtypes, states, batch_size):
+    """Export trained weights for torch-free NumPy inference."""
+    from ..export import export_policy, format_report
+
+    rl_task = get_task(task)
+    weight_path = weight or paths.get_model_path(task)
+    try:
+        reports = export_policy(
+            rl_task, weight_path, output, dtypes or ("float32",), states, batch_size
+        )
+    except (FileNotFoundError, ValueError) as e:
+        logger.error(f"Export failed: {e}")
+        raise SystemExit(1) from e
+    click.echo(format_report(reports, batch_size))
@@ -1,6 +1,9 @@
+import os
+
 import click
 
 from ..infer import infer as infer_func
+from ..utils import paths
 from .visual import VisualInferenceApp
 
 @click.command(name="infer")
@@ -8,12 +11,27 @@ from .visual import VisualInferenceApp
 @click.option('--episodes', default=5, help="Number of episodes to infer.")
 @click.option('--weight', default=None, help="Path to load the model weights.")
 @click.option('--visual', is_flag=True, help="Enable TUI visualization.")
-def infer_cmd(task, episodes, weight, visual):
+@click.option(
+    '--compile', 'torch_compile', 
+    is_flag=True, 
+    help="Compile the policy network with torch.compile."
+)
+def infer_cmd(task, episodes, weight, visual, torch_compile):
     """Run inference with a trained agent."""
+    if torch_compile:
+        # Same compiled-kernel cache as `train --compile`
+        os.environ.setdefault(
+            "TORCHINDUCTOR_CACHE_DIR",
+            str(paths.ensure_dir(paths.get_compile_cache_dir()))
+        )
     if visual:
-        app = VisualInferenceApp(task_name=task, weight_path=weight)
+        app = VisualInferenceApp(
+            task_name=task, weight_path=weight, torch_compile=torch_compile
+        )
         app.run()
     else:
         # Fallback to standard inference (which might use gym's render if implemented, 
         # but here we focus on the TUI request)
-        infer_func(task, weight, episodes, render_mode=None)
\ No newline at end of file
+        infer_func(
+            task, weight, episodes, render_mode=None, torch_compile=torch_compile
+        )
\ No newline at end of file
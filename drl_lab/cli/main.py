@@ -1,8 +1,11 @@
 import click
 
 from ..utils import setup_logger
+from .bench import bench_cmd
 from .clean import clean_cmd
+from .export import export_cmd
 from .infer import infer_cmd
+from .sweep import sweep_cmd
 from .tasks import tasks_cmd
 from .train import train_cmd
 
@@ -16,6 +19,9 @@ cli.add_command(train_cmd)
 cli.add_command(infer_cmd)
 cli.add_command(tasks_cmd)
 cli.add_command(clean_cmd)
+cli.add_command(sweep_cmd)
+cli.add_command(export_cmd)
+cli.add_command(bench_cmd)
 
 if __name__ == '__main__':
     cli()
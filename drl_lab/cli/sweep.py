@@ -0,0 +1,63 @@
+import click
+
+from ..utils import logger
+
+@click.command(name="sweep")
+@click.argument('task', default='cliff_walking')
+@click.option(
+    '--space', 
+    'space_file', 
+    default=None, 
+    help="JSON search space: field -> [choices] or {low, high, log}."
+)
+@click.option(
+    '--param', 
+    'params', 
+    multiple=True, 
+    help="Inline choices, e.g. --param learning_rate=0.001,0.0005"
+)
+@click.option('--trials', default=16, help="Number of sampled configurations.")
+@click.option('--episodes', default=500, help="Maximum episodes per trial.")
+@click.option('--workers', default=4, help="Parallel worker processes.")
+@click.option(
+    '--threads-per-worker', 
+    default=1, 
+    help="Torch threads (and pinned cores) per worker."
+)
+@click.option(
+    '--min-episodes', 
+    default=50, 
+    help="Episodes before the first ASHA rung."
+)
+@click.option('--eta', default=3, help="ASHA reduction factor.")
+@click.option('--output', default=None, help="Directory for trial outputs.")
+@click.option('--seed', type=int, default=None, help="Seed for trial sampling.")
+def sweep_cmd(
+    task, space_file, params, trials, episodes, workers, threads_per_worker, 
+    min_episodes, eta, output, seed
+):
+    """Tune Config hyperparameters with parallel ASHA-pruned trials."""
+    from ..sweep import format_table, load_space, parse_param, run_sweep
+
+    space = load_space(space_file) if space_file else {}
+    try:
+        space.update(dict(parse_param(p) for p in params))
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--param") from e
+    if not space:
+        raise click.UsageError("Provide a search space via --space or --param.")
+
+    results = run_sweep(
+        task, 
+        space, 
+        trials=trials, 
+        episodes=episodes, 
+        workers=workers, 
+        threads_per_worker=threads_per_worker, 
+        min_episodes=min_episodes, 
+        eta=eta, 
+        output_dir=output, 
+        seed=seed
+    )
+    logger.info("Sweep results (best first):")
+    click.echo(format_table(results))
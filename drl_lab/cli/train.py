@@ -1,9 +1,21 @@
+import os
+
 import click
 from loguru import logger
 
-from ..train import Trainer
-from ..utils import setup_logger
-from .visual import VisualTrainApp
+from ..utils import paths, setup_logger
+
+def _parse_episode_range(ctx, param, value):
+    """Parse START:END into an episode range [START, END)."""
+    if value is None:
+        return None
+    try:
+        start, end = (int(part) for part in value.split(":"))
+    except ValueError:
+        raise click.BadParameter("expected START:END, e.g. 100:103.") from None
+    if not 0 <= start < end:
+        raise click.BadParameter("expected 0 <= START < END.")
+    return start, end
 
 @click.command(name="train")
 @click.argument('task', default='cliff_walking')
@@ -19,14 +31,183 @@ from .visual import VisualTrainApp
     default=5, 
     help="Number of log lines to show in visual mode."
 )
-def train_cmd(task, episodes, output, visual, visual_logs):
+@click.option(
+    '--prioritized', 
+    is_flag=True, 
+    help="Use prioritized experience replay."
+)
+@click.option(
+    '--replay-backend', 
+    type=click.Choice(["memory", "memmap"]), 
+    default=None, 
+    help="Replay storage backend (memmap stores transitions on disk)."
+)
+@click.option(
+    '--memory-size', 
+    type=int, 
+    default=None, 
+    help="Replay memory capacity (transitions)."
+)
+@click.option(
+    '--num-envs', 
+    type=int, 
+    default=1, 
+    help="Number of environment copies stepped in lockstep."
+)
+@click.option(
+    '--vector-backend', 
+    type=click.Choice(["sync", "async", "native"]), 
+    default="sync", 
+    help="Vector env backend (async runs one process per env; native steps "
+    "all envs as arrays, where the task supports it)."
+)
+@click.option(
+    '--actors', 
+    type=int, 
+    default=0, 
+    help="Run N actor processes feeding a central learner (Ape-X style)."
+)
+@click.option(
+    '--pipeline', 
+    is_flag=True, 
+    help="Run replay updates on a background learner thread."
+)
+@click.option(
+    '--replay-ratio', 
+    type=float, 
+    default=None, 
+    help="Learner updates per environment step in pipelined mode."
+)
+@click.option(
+    '--seeds', 
+    type=int, 
+    default=1, 
+    help="Train N independent seeds at once as one vectorized ensemble."
+)
+@click.option(
+    '--compile', 'torch_compile', 
+    is_flag=True, 
+    help="Compile the model and the replay update with torch.compile."
+)
+@click.option(
+    '--bf16', 
+    is_flag=True, 
+    help="Run replay updates under bfloat16 autocast."
+)
+@click.option(
+    '--resume', 
+    is_flag=True, 
+    help="Continue from the checkpoint next to the output model."
+)
+@click.option(
+    '--checkpoint-freq', 
+    type=int, 
+    default=None, 
+    help="Episodes between full training checkpoints (0 disables them)."
+)
+@click.option(
+    '--checkpoint-replay', 
+    is_flag=True, 
+    help="Include the replay buffer contents in checkpoints."
+)
+@click.option(
+    '--plot-freq', 
+    type=int, 
+    default=None, 
+    help="Episodes between background re-renders of the training plot."
+)
+@click.option(
+    '--profile', 
+    is_flag=True, 
+    help="Time each phase of the training loop and report the breakdown."
+)
+@click.option(
+    '--trace-episodes', 
+    default=None, 
+    callback=_parse_episode_range, 
+    help="Capture episodes START:END (END exclusive) with torch.profiler."
+)
+def train_cmd(
+    task, episodes, output, visual, visual_logs, prioritized, 
+    replay_backend, memory_size, num_envs, vector_backend, actors, 
+    pipeline, replay_ratio, seeds, torch_compile, bf16, resume,
+    checkpoint_freq, checkpoint_replay, plot_freq, profile, trace_episodes
+):
     """Train the agent on a task."""
+    # Imported here so commands that don't train never load torch
+    from ..distributed import DistributedTrainer
+    from ..ensemble import EnsembleTrainer
+    from ..train import Trainer
+    from .visual import VisualTrainApp
+
+    overrides = {}
+    if prioritized:
+        overrides["prioritized_replay"] = True
+    if replay_backend:
+        overrides["replay_backend"] = replay_backend
+    if memory_size:
+        overrides["memory_size"] = memory_size
+    if num_envs > 1:
+        overrides["num_envs"] = num_envs
+        overrides["vector_backend"] = vector_backend
+    if actors > 0:
+        if pipeline:
+            raise click.UsageError("--pipeline cannot be combined with --actors.")
+        overrides["num_actors"] = actors
+    if pipeline:
+        overrides["pipeline"] = True
+    if replay_ratio is not None:
+        overrides["replay_ratio"] = replay_ratio
+    if torch_compile:
+        overrides["torch_compile"] = True
+        # Inductor reads its cache location from the environment, so it is
+        # set once here (and inherited by actor and learner processes)
+        os.environ.setdefault(
+            "TORCHINDUCTOR_CACHE_DIR",
+            str(paths.ensure_dir(paths.get_compile_cache_dir()))
+        )
+    if bf16:
+        overrides["bf16_autocast"] = True
+    if checkpoint_freq is not None:
+        overrides["checkpoint_freq"] = checkpoint_freq
+    if checkpoint_replay:
+        overrides["checkpoint_replay"] = True
+    if plot_freq is not None:
+        overrides["plot_freq"] = plot_freq
+    if profile:
+        overrides["profile"] = True
+    if trace_episodes:
+        overrides["trace_episodes"] = trace_episodes
+    if resume and (actors > 0 or seeds > 1):
+        raise click.UsageError("--resume cannot be combined with --actors or --seeds.")
+    if seeds > 1:
+        if (
+            actors > 0 or pipeline or num_envs > 1 or torch_compile or bf16
+            or profile or trace_episodes
+        ):
+            raise click.UsageError(
+                "--seeds cannot be combined with --actors, --pipeline, "
+                "--num-envs, --compile, --bf16, --profile or --trace-episodes."
+            )
+        if visual:
+            raise click.UsageError("--seeds does not support --visual.")
+        overrides["num_seeds"] = seeds
+
+    trainer_cls = Trainer
+    if actors > 0:
+        trainer_cls = DistributedTrainer
+    elif seeds > 1:
+        trainer_cls = EnsembleTrainer
+
     if visual:
         app = VisualTrainApp(
             task_name=task, 
             episodes=episodes, 
             output_path=output, 
-            log_lines=visual_logs
+            log_lines=visual_logs,
+            overrides=overrides,
+            trainer_cls=trainer_cls,
+            resume=resume
         )
         app.run()
         
@@ -38,5 +219,7 @@ def train_cmd(task, episodes, output, visual, visual_logs):
             for record in app.recent_records:
                 logger.log(record["level"].name, record["message"])
     else:
-        trainer = Trainer(task, output, episodes)
+        trainer = trainer_cls(
+            task, output, episodes, overrides=overrides, resume=resume
+        )
         trainer.run()
@@ -1,4 +1,15 @@
-from .inference import VisualInferenceApp
-from .training import VisualTrainApp
+import importlib
+from typing import Any
+
+_APPS = {
+    "VisualInferenceApp": ".inference",
+    "VisualTrainApp": ".training",
+}
 
 __all__ = ["VisualInferenceApp", "VisualTrainApp"]
+
+def __getattr__(name: str) -> Any:
+    # Only the app that is used gets imported (training pulls in torch)
+    if name in _APPS:
+        return getattr(importlib.import_module(_APPS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
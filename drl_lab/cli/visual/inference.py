@@ -1,12 +1,11 @@
 import time
 
-import torch
 from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.widgets import Footer, Label
 from textual.worker import get_current_worker
 
-from ...agent import BaseDQNAgent
+from ...infer import load_policy
 from ...tasks import get_task
 from ...utils import logger, setup_logger
 
@@ -32,10 +31,17 @@ class VisualInferenceApp(App):
         ("ctrl+c", "quit", "Quit")
     ]
 
-    def __init__(self, task_name: str, weight_path: str = None, **kwargs):
+    def __init__(
+        self,
+        task_name: str,
+        weight_path: str = None,
+        torch_compile: bool = False,
+        **kwargs
+    ):
         super().__init__(**kwargs)
         self.task_name = task_name
         self.weight_path = weight_path
+        self.torch_compile = torch_compile
         self.rl_task = get_task(task_name)
         self.tui = self.rl_task.render()
         self._worker = None
@@ -47,8 +53,6 @@ class VisualInferenceApp(App):
 
     def on_mount(self) -> None:
         setup_logger(sink=self.sink_log)
-        device = "CUDA" if torch.cuda.is_available() else "CPU"
-        logger.info(f"Inference Device: {device}")
         self._worker = self.run_worker(
             self.simulation_loop, 
             exclusive=True, 
@@ -92,22 +96,13 @@ class VisualInferenceApp(App):
         worker = get_current_worker()
         try:
             env = self.rl_task.env 
-            config = self.rl_task.config
-            agent = BaseDQNAgent(
-                self.rl_task.state_size, 
-                self.rl_task.action_size, 
-                config, 
-                model_factory=self.rl_task.create_model
-            )
-            use_random_policy = False
             if self.weight_path:
                 logger.info(f"Loading weights from {self.weight_path}")
-                agent.load(self.weight_path)
-                agent.epsilon = 0.0
+                act = load_policy(self.rl_task, self.weight_path, self.torch_compile)
             else:
                 logger.warning("No weights provided. Using random policy.")
-                agent.epsilon = 1.0 
-                use_random_policy = True
+                def act(_state):
+                    return env.action_space.sample()
 
             logger.info(f"Started {self.task_name}")
             episode = 0
@@ -121,7 +116,7 @@ class VisualInferenceApp(App):
                 step = 0
                 while not done and not worker.is_cancelled:
                     step += 1
-                    action = agent.act(state, training=use_random_policy)
+                    action = act(state)
                     next_state, reward, terminated, truncated, info = env.step(action)
                     total_reward += reward
                     try:
@@ -41,13 +41,19 @@ class VisualTrainApp(App):
         task_name: str, 
         episodes: int, 
         output_path: str = None, 
-        log_lines: int = 5
+        log_lines: int = 5,
+        overrides: dict[str, Any] | None = None,
+        trainer_cls: type[Trainer] = Trainer,
+        resume: bool = False
     ):
         super().__init__()
         self.task_name = task_name
         self.episodes = episodes
         self.output_path = output_path
         self.log_lines = log_lines
+        self.overrides = overrides
+        self.trainer_cls = trainer_cls
+        self.resume = resume
         
         self.rl_task = get_task(task_name)
         self.tui = self.rl_task.render()
@@ -120,12 +126,14 @@ class VisualTrainApp(App):
     def training_loop(self):
         worker = get_current_worker()
         callbacks = TrainingAppCallback(self)
-        trainer = Trainer(
+        trainer = self.trainer_cls(
             task_name=self.task_name, 
             episodes=self.episodes, 
             output_path=self.output_path,
             callbacks=callbacks,
-            should_stop=lambda: worker.is_cancelled
+            should_stop=lambda: worker.is_cancelled,
+            overrides=self.overrides,
+            resume=self.resume
         )
         trainer.run()
         if worker.is_cancelled:
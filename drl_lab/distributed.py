@@ -0,0 +1,258 @@
+import contextlib
+import queue
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+from torch.nn.utils import parameters_to_vector, vector_to_parameters
+
+from .tasks import get_task
+from .train import Trainer, TrainingCallbacks
+from .utils import apply_overrides, logger
+
+class SharedWeights:
+    """
+    Policy parameters flattened into one shared-memory CPU tensor.
+    The learner publishes into it; actors copy out whenever the version moves.
+    """
+
+    def __init__(self, model: nn.Module, ctx: Any):
+        params = parameters_to_vector(model.parameters()).detach().cpu()
+        self.flat = params.clone().share_memory_()
+        self.version = ctx.Value("q", 0)
+
+    def publish(self, model: nn.Module) -> None:
+        """Copy the model's parameters into shared memory."""
+        with self.version.get_lock():
+            self.flat.copy_(parameters_to_vector(model.parameters()).detach())
+            self.version.value += 1
+
+    def pull(self, model: nn.Module, seen_version: int) -> int:
+        """Load newer parameters into `model`; returns the version now held."""
+        if self.version.value == seen_version:
+            return seen_version
+        with self.version.get_lock():
+            vector_to_parameters(self.flat, model.parameters())
+            return self.version.value
+
+def actor_epsilons(num_actors: int, base: float, alpha: float) -> list[float]:
+    """
+    Fixed per-actor exploration rates from Ape-X (Horgan et al., 2018):
+    eps_i = base ** (1 + alpha * i / (N - 1)).
+    """
+    if num_actors == 1:
+        return [base]
+    return [
+        base ** (1 + alpha * i / (num_actors - 1)) for i in range(num_actors)
+    ]
+
+def _actor_main(
+    actor_id: int,
+    task_name: str,
+    overrides: dict[str, Any],
+    epsilon: float,
+    weights: SharedWeights,
+    transitions: Any,
+    stop_event: Any
+) -> None:
+    """
+    Actor process: steps one environment with a CPU copy of the policy and
+    streams transitions to the learner in fixed-size chunks.
+    """
+    torch.set_num_threads(1)
+    task = get_task(task_name)
+    config = apply_overrides(task.config, overrides)
+    env = task.make_limited_env()
+    model = task.create_model()
+    model.eval()
+    version = weights.pull(model, -1)
+    seed = None if config.seed is None else config.seed + actor_id
+    rng = np.random.default_rng(seed)
+
+    codec = task.state_codec()
+    chunk = config.actor_chunk_size
+    state_shape = (chunk, *codec.input_shape)
+    states = np.empty(state_shape, dtype=codec.input_dtype)
+    actions = np.empty(chunk, dtype=np.int64)
+    rewards = np.empty(chunk, dtype=np.float32)
+    next_states = np.empty(state_shape, dtype=codec.input_dtype)
+    dones = np.empty(chunk, dtype=np.float32)
+    finished: list[tuple[float, int]] = []
+    filled = 0
+
+    obs, _ = env.reset(seed=seed)
+    state = task.preprocess_state(obs)
+    ep_reward, ep_steps = 0.0, 0
+
+    while not stop_event.is_set():
+        if rng.random() <= epsilon:
+            action = int(rng.integers(task.action_size))
+        else:
+            with torch.inference_mode():
+                state_t = torch.as_tensor(
+                    np.asarray(state, dtype=codec.input_dtype)
+                ).unsqueeze(0)
+                action = int(model(state_t).argmax(1).item())
+
+        obs, reward, terminated, truncated, _ = env.step(action)
+        next_state = task.preprocess_state(obs)
+        done = terminated or truncated
+        ep_reward += reward
+        ep_steps += 1
+
+        states[filled] = state
+        actions[filled] = action
+        rewards[filled] = reward
+        next_states[filled] = next_state
+        dones[filled] = done
+        filled += 1
+
+        if done:
+            finished.append((ep_reward, ep_steps))
+            obs, _ = env.reset()
+            next_state = task.preprocess_state(obs)
+            ep_reward, ep_steps = 0.0, 0
+        state = next_state
+
+        if filled == chunk:
+            batch = (
+                states.copy(), actions.copy(), rewards.copy(),
+                next_states.copy(), dones.copy()
+            )
+            while not stop_event.is_set():
+                try:
+                    transitions.put((actor_id, batch, finished), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            finished = []
+            filled = 0
+            version = weights.pull(model, version)
+
+    env.close()
+
+class DistributedTrainer(Trainer):
+    """
+    Ape-X style training on one machine: `Config.num_actors` processes act
+    with CPU copies of the policy and stream transitions to this process,
+    which owns the replay memory and runs `BaseDQNAgent.replay()`.
+    Fresh weights are published to shared memory every
+    `Config.weight_sync_freq` learner updates.
+    """
+
+    supports_resume = False
+    # Actors explore with fixed `actor_epsilons`; the learner steps no env
+    acts_locally = False
+
+    def __init__(
+        self,
+        task_name: str,
+        output_path: str | Path | None = None,
+        episodes: int | None = None,
+        callbacks: TrainingCallbacks | None = None,
+        should_stop: Callable[[], bool] | None = None,
+        overrides: dict[str, Any] | None = None,
+        resume: bool = False
+    ):
+        super().__init__(
+            task_name, output_path, episodes, callbacks, should_stop, overrides,
+            resume
+        )
+        self.env_steps = 0
+        self.updates = 0
+        # Throughput is measured from the first transition the learner receives
+        self.started_at: float | None = None
+        self.elapsed = 0.0
+        self.epsilons: list[float] = []
+
+    def _train_loop(self) -> None:
+        num_actors = self.config.num_actors
+        ctx = mp.get_context("spawn")
+        weights = SharedWeights(self.agent.model, ctx)
+        transitions = ctx.Queue(maxsize=num_actors * 4)
+        stop_event = ctx.Event()
+        self.epsilons = epsilons = actor_epsilons(
+            num_actors, self.config.apex_epsilon, self.config.apex_alpha
+        )
+        logger.info(
+            f"   Actors: {num_actors} | "
+            f"Eps: {', '.join(f'{e:.3f}' for e in epsilons)}"
+        )
+
+        actors = [
+            ctx.Process(
+                target=_actor_main,
+                args=(
+                    i, self.task_name, self.overrides, epsilons[i],
+                    weights, transitions, stop_event
+                ),
+                daemon=True,
+            )
+            for i in range(num_actors)
+        ]
+        for actor in actors:
+            actor.start()
+
+        try:
+            self._learn(weights, transitions)
+        finally:
+            if self.started_at is not None:
+                self.elapsed = time.perf_counter() - self.started_at
+            stop_event.set()
+            # Drain so actors blocked on a full queue can observe the stop
+            deadline = time.monotonic() + 5.0
+            while any(a.is_alive() for a in actors) and time.monotonic() < deadline:
+                with contextlib.suppress(queue.Empty):
+                    transitions.get(timeout=0.05)
+            for actor in actors:
+                actor.join(timeout=1.0)
+                if actor.is_alive():
+                    actor.terminate()
+            logger.info(
+                f"Env steps: {self.env_steps} "
+                f"({self.env_steps / max(self.elapsed, 1e-9):.0f}/s) | "
+                f"Updates: {self.updates} "
+                f"({self.updates / max(self.elapsed, 1e-9):.0f}/s)"
+            )
+
+    def _learn(self, weights: SharedWeights, transitions: Any) -> None:
+        """Learner loop: ingest actor chunks, update, publish weights."""
+        completed = 0
+        max_drain = self.config.num_actors * 4
+        while completed < self.config.episodes and not self.should_stop():
+            # Ingest what the actors have produced; block briefly only while
+            # replay is still warming up and there is nothing to learn from
+            for _ in range(max_drain):
+                learning = len(self.agent.memory) >= self.config.train_start_size
+                try:
+                    with self.profiler.section("actors.wait"):
+                        actor_id, batch, finished = transitions.get(
+                            block=not learning, timeout=0.1
+                        )
+                except queue.Empty:
+                    break
+                if self.started_at is None:
+                    self.started_at = time.perf_counter()
+                with self.profiler.section("agent.remember"):
+                    self.agent.remember_batch(*batch)
+                self.env_steps += len(batch[1])
+                self._maybe_record_steps()
+                for reward, steps in finished:
+                    if completed >= self.config.episodes:
+                        break
+                    self._update_agent_state(completed)
+                    self._log_and_save(
+                        completed, steps, reward, self.epsilons[actor_id]
+                    )
+                    completed += 1
+
+            if len(self.agent.memory) >= self.config.train_start_size:
+                self.agent.replay()
+                self.updates += 1
+                if self.updates % self.config.weight_sync_freq == 0:
+                    weights.publish(self.agent.model)
@@ -0,0 +1,364 @@
+import copy
+import dataclasses
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+import torch.optim as optim
+from torch.func import functional_call, stack_module_state, vmap
+
+from .checkpoint import snapshot
+from .replay import PrioritizedReplayBuffer, ReplayBuffer, create_replay_buffer
+from .train import Trainer, TrainingCallbacks
+from .utils import PlotRenderer, logger, paths
+from .utils.plot import render_ensemble
+
+class EnsembleDQN:
+    """
+    K independent Double DQN learners evaluated as one vectorized model.
+
+    Parameters of K freshly initialized networks are stacked along a leading
+    seed dimension with `torch.func.stack_module_state`; forward passes and
+    the loss run for every seed at once through `vmap`. Adam is elementwise,
+    so a single optimizer over the stacked tensors performs K independent
+    Adam updates. Gradient-norm clipping is applied per seed.
+    """
+
+    def __init__(
+        self,
+        model_factory: Callable[[], nn.Module],
+        memories: list[ReplayBuffer],
+        action_size: int,
+        learning_rate: float,
+        gamma: float,
+        seeds: list[int],
+        device: torch.device
+    ):
+        self.num_seeds = len(seeds)
+        self.memories = memories
+        self.action_size = action_size
+        self.gamma = gamma
+        self.device = device
+
+        models = []
+        for seed in seeds:
+            torch.manual_seed(seed)
+            models.append(model_factory().to(device))
+        params, buffers = stack_module_state(models)
+        self.params = {k: v.detach().requires_grad_() for k, v in params.items()}
+        self.buffers = buffers
+        self.target_params = {k: v.detach().clone() for k, v in params.items()}
+
+        # Stateless copy of the architecture used as the functional template
+        self._base = copy.deepcopy(models[0]).to("meta")
+        self._forward = vmap(self._call)
+        self._loss = vmap(self._seed_loss)
+        self.optimizer = optim.Adam(self.params.values(), lr=learning_rate)
+
+    def _call(
+        self, params: dict[str, torch.Tensor], buffers: dict[str, torch.Tensor],
+        x: torch.Tensor
+    ) -> torch.Tensor:
+        return functional_call(self._base, (params, buffers), (x,))
+
+    def _seed_loss(
+        self,
+        params: dict[str, torch.Tensor],
+        target_params: dict[str, torch.Tensor],
+        buffers: dict[str, torch.Tensor],
+        states: torch.Tensor,
+        actions: torch.Tensor,
+        rewards: torch.Tensor,
+        next_states: torch.Tensor,
+        dones: torch.Tensor,
+        weights: torch.Tensor
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Weighted Huber DDQN loss and TD errors for one seed's batch."""
+        current_q = self._call(params, buffers, states).gather(1, actions)
+        next_online = self._call(params, buffers, next_states).detach()
+        next_actions = next_online.argmax(1, keepdim=True)
+        next_q = self._call(target_params, buffers, next_states).gather(
+            1, next_actions
+        )
+        target_q = (rewards + self.gamma * next_q * (1.0 - dones)).detach()
+        elementwise = F.smooth_l1_loss(current_q, target_q, reduction="none")
+        return (weights * elementwise).mean(), (target_q - current_q).detach()
+
+    def act(
+        self, states: np.ndarray, epsilons: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        """One action per seed for a (K, ...) batch of that seed's states."""
+        states = np.asarray(states, dtype=self.memories[0].codec.input_dtype)
+        states_t = torch.as_tensor(states, device=self.device)
+        with torch.inference_mode():
+            q_values = self._forward(self.params, self.buffers, states_t.unsqueeze(1))
+        actions = q_values.squeeze(1).argmax(1).cpu().numpy()
+        explore = rng.random(self.num_seeds) <= epsilons
+        actions[explore] = rng.integers(0, self.action_size, int(explore.sum()))
+        return actions
+
+    def replay(self, batch_size: int, betas: np.ndarray) -> np.ndarray:
+        """One vectorized update for every seed; returns per-seed losses."""
+        columns: list[list[np.ndarray]] = [[] for _ in range(6)]
+        indices = []
+        for k, memory in enumerate(self.memories):
+            if isinstance(memory, PrioritizedReplayBuffer):
+                *batch, idx, weights = memory.sample(batch_size, betas[k])
+                indices.append(idx)
+            else:
+                batch = list(memory.sample(batch_size))
+                weights = np.ones(batch_size, dtype=np.float32)
+            for column, values in zip(columns, [*batch, weights], strict=True):
+                column.append(values)
+
+        states, actions, rewards, next_states, dones, weights = (
+            torch.as_tensor(np.stack(c), device=self.device) for c in columns
+        )
+        losses, td_errors = self._loss(
+            self.params, self.target_params, self.buffers,
+            states, actions.unsqueeze(-1), rewards.unsqueeze(-1),
+            next_states, dones.unsqueeze(-1), weights.unsqueeze(-1)
+        )
+
+        self.optimizer.zero_grad()
+        losses.sum().backward()
+        self._clip_grad_norm(1.0)
+        self.optimizer.step()
+
+        if indices:
+            errors = td_errors.squeeze(-1).cpu().numpy()
+            for k, idx in enumerate(indices):
+                self.memories[k].update_priorities(idx, errors[k])
+        return losses.detach().cpu().numpy()
+
+    def _clip_grad_norm(self, max_norm: float) -> None:
+        """Per-seed equivalent of `clip_grad_norm_` on the stacked gradients."""
+        grads = [p.grad for p in self.params.values() if p.grad is not None]
+        norms = torch.sqrt(sum(g.pow(2).flatten(1).sum(1) for g in grads))
+        scale = (max_norm / (norms + 1e-6)).clamp(max=1.0)
+        for g in grads:
+            g.mul_(scale.view(-1, *([1] * (g.dim() - 1))))
+
+    def update_target(self, seed_index: int) -> None:
+        with torch.no_grad():
+            for name, value in self.params.items():
+                self.target_params[name][seed_index].copy_(value[seed_index])
+
+    def state_dict(self, seed_index: int) -> dict[str, torch.Tensor]:
+        """Weights of one seed in the layout `BaseDQNAgent.load` expects."""
+        state = {k: v[seed_index].detach().cpu() for k, v in self.params.items()}
+        state.update({k: v[seed_index].cpu() for k, v in self.buffers.items()})
+        return state
+
+class EnsembleTrainer(Trainer):
+    """
+    Trains `Config.num_seeds` independent seeds of one task in a single process.
+
+    Each seed has its own environment, replay buffer, epsilon schedule and
+    target network; all seeds act and learn through one vectorized model
+    (see `EnsembleDQN`). Environments step in lockstep until every seed has
+    completed `Config.episodes` episodes. Per-seed curves and aggregate
+    statistics are reported at the end.
+    """
+
+    supports_resume = False
+
+    def __init__(
+        self,
+        task_name: str,
+        output_path: str | Path | None = None,
+        episodes: int | None = None,
+        callbacks: TrainingCallbacks | None = None,
+        should_stop: Callable[[], bool] | None = None,
+        overrides: dict[str, Any] | None = None,
+        resume: bool = False
+    ):
+        super().__init__(
+            task_name, output_path, episodes, callbacks, should_stop, overrides,
+            resume
+        )
+        self.num_seeds = self.config.num_seeds
+        self.ensemble: EnsembleDQN | None = None
+        self.plotters: list[PlotRenderer] = []
+        self.best_rewards = np.full(self.num_seeds, -np.inf)
+
+    def _initialize(self) -> None:
+        base_seed = self.config.seed if self.config.seed is not None else 0
+        self.seeds = [base_seed + k for k in range(self.num_seeds)]
+        self.rng = np.random.default_rng(base_seed)
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+        memories = []
+        for k in range(self.num_seeds):
+            seed_config = dataclasses.replace(
+                self.config,
+                replay_dir=str(paths.get_seed_path(self.config.replay_dir, k)),
+                seed=self.seeds[k],
+            )
+            memories.append(
+                create_replay_buffer(
+                    seed_config, self.task.state_size, self.task.state_codec()
+                )
+            )
+        self.ensemble = EnsembleDQN(
+            self.task.create_model,
+            memories,
+            self.task.action_size,
+            self.config.learning_rate,
+            self.config.gamma,
+            self.seeds,
+            device,
+        )
+        self.plotters = [
+            PlotRenderer(
+                f"{self.task.name} (seed {seed})",
+                paths.get_seed_path(self.config.plot_path, k),
+            )
+            for k, seed in enumerate(self.seeds)
+        ]
+
+        logger.info(f"Initialized ensemble training for task: {self.task.name}")
+        logger.info(f"   Seeds: {self.seeds}")
+        logger.info(f"   Episodes per seed: {self.config.episodes}")
+        logger.info(f"   Device: {device}")
+        logger.info(
+            f"   Batch Size: {self.config.batch_size} | "
+            f"LR: {self.config.learning_rate}"
+        )
+
+    def _train_loop(self) -> None:
+        try:
+            self._run_ensemble()
+        finally:
+            for memory in self.ensemble.memories:
+                memory.close()
+            self._report()
+
+    def _run_ensemble(self) -> None:
+        k_seeds = self.num_seeds
+        config = self.config
+        envs = self.task.get_vector_env(k_seeds)
+        try:
+            obs, _ = envs.reset(seed=self.seeds)
+            states = self.task.preprocess_batch(obs)
+            epsilons = np.full(k_seeds, config.epsilon_start)
+            betas = np.full(k_seeds, config.per_beta_start)
+            beta_step = (1.0 - config.per_beta_start) / max(config.per_beta_steps, 1)
+            ep_rewards = np.zeros(k_seeds)
+            ep_steps = np.zeros(k_seeds, dtype=np.int64)
+            completed = np.zeros(k_seeds, dtype=np.int64)
+
+            while (completed < config.episodes).any() and not self.should_stop():
+                actions = self.ensemble.act(states, epsilons, self.rng)
+                next_obs, rewards, terminated, truncated, infos = envs.step(actions)
+                dones = terminated | truncated
+                ep_rewards += rewards
+                ep_steps += 1
+
+                next_states = self.task.preprocess_batch(next_obs)
+                final_states = next_states
+                finished = np.flatnonzero(dones)
+                if len(finished):
+                    final_obs = np.stack([infos["final_obs"][i] for i in finished])
+                    final_states = next_states.copy()
+                    final_states[finished] = self.task.preprocess_batch(final_obs)
+
+                for k, memory in enumerate(self.ensemble.memories):
+                    memory.push(
+                        states[k], actions[k], rewards[k], final_states[k], dones[k]
+                    )
+                states = next_states
+
+                warm = min(len(m) for m in self.ensemble.memories)
+                if warm >= config.train_start_size:
+                    self.ensemble.replay(config.batch_size, betas)
+                    betas = np.minimum(1.0, betas + beta_step)
+
+                for k in finished:
+                    if completed[k] < config.episodes:
+                        self._end_episode(
+                            int(k), int(completed[k]), ep_rewards[k],
+                            int(ep_steps[k])
+                        )
+                        completed[k] += 1
+                        if epsilons[k] > config.epsilon_min:
+                            epsilons[k] *= config.epsilon_decay
+                    ep_rewards[k] = 0.0
+                    ep_steps[k] = 0
+        finally:
+            envs.close()
+
+    def _end_episode(
+        self, k: int, episode_idx: int, reward: float, steps: int
+    ) -> None:
+        """Per-seed bookkeeping: target update, curve, metrics and best model."""
+        if episode_idx % self.config.target_update_freq == 0:
+            self.ensemble.update_target(k)
+
+        plotter = self.plotters[k]
+        plotter.update(float(reward))
+        avg_reward = plotter.moving_avgs[-1]
+        self.metrics.write(
+            "episode",
+            seed=self.seeds[k],
+            episode=episode_idx,
+            reward=float(reward),
+            steps=steps,
+            avg_reward=float(avg_reward),
+        )
+        if avg_reward > self.best_rewards[k]:
+            self.best_rewards[k] = avg_reward
+            path = paths.get_seed_path(self.config.model_path, k)
+            self.writer.save_best(
+                snapshot(self.ensemble.state_dict(k)), path, avg_reward,
+                episode_idx + 1
+            )
+
+        if (episode_idx + 1) % 10 == 0:
+            logger.info(
+                f"Seed {self.seeds[k]} | "
+                f"Ep {episode_idx + 1:03d}/{self.config.episodes} | "
+                f"Reward: {reward: >6.2f} | Avg: {avg_reward: >6.2f}"
+            )
+
+    def _report(self) -> None:
+        """Render per-seed and aggregate curves and log summary statistics."""
+        finals = np.array(
+            [p.moving_avgs[-1] if p.moving_avgs else np.nan for p in self.plotters]
+        )
+        for k, plotter in enumerate(self.plotters):
+            logger.info(
+                f"Seed {self.seeds[k]}: episodes {len(plotter.rewards)} | "
+                f"final avg {finals[k]:.2f} | best avg {self.best_rewards[k]:.2f}"
+            )
+        if np.isfinite(finals).any():
+            logger.success(
+                f"Ensemble final avg: {np.nanmean(finals):.2f} "
+                f"± {np.nanstd(finals):.2f} "
+                f"(min {np.nanmin(finals):.2f}, max {np.nanmax(finals):.2f})"
+            )
+        self.best_reward = float(np.max(self.best_rewards))
+
+        render_ensemble(
+            self.task.name,
+            [p.moving_avgs for p in self.plotters],
+            [f"seed {s}" for s in self.seeds],
+            Path(self.config.plot_path),
+        )
+        summary_path = paths.get_ensemble_summary_path(self.config.plot_path)
+        with summary_path.open("w") as f:
+            json.dump(
+                {
+                    "seeds": self.seeds,
+                    "episodes": [len(p.rewards) for p in self.plotters],
+                    "final_avg": [float(x) for x in finals],
+                    "best_avg": [float(x) for x in self.best_rewards],
+                },
+                f,
+                indent=2,
+            )
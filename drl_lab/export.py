@@ -0,0 +1,181 @@
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from .models import DuelingMLP, EmbeddingDuelingMLP, SimpleMLP
+from .policy import EXPORT_SUFFIXES, WEIGHT_DTYPES, Layer, PolicyRunner
+from .tasks import BaseTask
+from .utils import logger
+
+@dataclass
+class ExportReport:
+    weight_dtype: str
+    path: Path
+    file_bytes: int
+    memory_bytes: int
+    batch_us: float
+    single_us: float
+    # Latencies relative to the float32 policy (1.0 = same speed)
+    batch_vs_float32: float
+    single_vs_float32: float
+    agreement: float
+
+def _linear_layers(module: nn.Module) -> list[Layer]:
+    """(weight^T, bias) of every `nn.Linear` in `module`, in order."""
+    return [
+        (
+            m.weight.detach().cpu().numpy().T,
+            m.bias.detach().cpu().numpy(),
+        )
+        for m in module.modules()
+        if isinstance(m, nn.Linear)
+    ]
+
+def policy_from_model(model: nn.Module) -> PolicyRunner:
+    """Convert a `SimpleMLP` or (embedding) `DuelingMLP` into a `PolicyRunner`."""
+    if isinstance(model, EmbeddingDuelingMLP):
+        table = model.feature[0].weight.detach().cpu().numpy()
+        return PolicyRunner(
+            "embedding",
+            [(table, np.zeros(table.shape[1], dtype=np.float32))]
+            + _linear_layers(model.feature),
+            value=_linear_layers(model.value_stream),
+            advantage=_linear_layers(model.advantage_stream),
+        )
+    if isinstance(model, DuelingMLP):
+        return PolicyRunner(
+            "dueling",
+            _linear_layers(model.feature),
+            value=_linear_layers(model.value_stream),
+            advantage=_linear_layers(model.advantage_stream),
+        )
+    if isinstance(model, SimpleMLP):
+        return PolicyRunner("mlp", _linear_layers(model))
+    raise ValueError(
+        f"Cannot export {type(model).__name__}; "
+        "only SimpleMLP, DuelingMLP and EmbeddingDuelingMLP are supported."
+    )
+
+def load_model(task: BaseTask, weight_path: str | Path) -> nn.Module:
+    """Build the task's model on CPU and load trained weights into it."""
+    weight_path = Path(weight_path)
+    if not weight_path.exists():
+        raise FileNotFoundError(f"Model file not found: {weight_path}")
+    model = task.create_model()
+    model.load_state_dict(torch.load(weight_path, map_location="cpu"))
+    model.eval()
+    return model
+
+def sample_states(task: BaseTask, num_states: int, seed: int = 0) -> np.ndarray:
+    """Preprocessed states visited by a uniformly random policy."""
+    env = task.make_limited_env()
+    env.action_space.seed(seed)
+    states = []
+    obs, _ = env.reset(seed=seed)
+    while len(states) < num_states:
+        states.append(task.preprocess_state(obs))
+        obs, _, terminated, truncated, _ = env.step(env.action_space.sample())
+        if terminated or truncated:
+            obs, _ = env.reset()
+    env.close()
+    return np.asarray(states, dtype=task.state_codec().input_dtype)
+
+def _latency_us(runner: PolicyRunner, states: np.ndarray, iters: int) -> float:
+    runner.q_values(states)
+    start = time.perf_counter()
+    for _ in range(iters):
+        runner.q_values(states)
+    return (time.perf_counter() - start) / iters * 1e6
+
+def export_policy(
+    task: BaseTask,
+    weight_path: str | Path,
+    output_path: str | Path | None = None,
+    weight_dtypes: tuple[str, ...] = ("float32",),
+    num_states: int = 2048,
+    batch_size: int = 256
+) -> list[ExportReport]:
+    """
+    Export trained weights as `.npz` files for `PolicyRunner`, one per
+    entry of `weight_dtypes` ("float32", "float16", "int8").
+
+    Each variant is compared with the float32 torch model on states sampled
+    by a random policy: file and in-memory size, latency per batch of
+    `batch_size` and per single state (also relative to the float32 NumPy
+    policy), and the fraction of states on which the greedy action agrees.
+    Files default to the weight path with the suffixes in `EXPORT_SUFFIXES`;
+    `output_path` names the file when exactly one variant is exported.
+    """
+    for weight_dtype in weight_dtypes:
+        if weight_dtype not in WEIGHT_DTYPES:
+            raise ValueError(f"Unknown weight dtype: '{weight_dtype}'")
+    if output_path and len(weight_dtypes) != 1:
+        raise ValueError("An output path needs exactly one weight dtype.")
+
+    weight_path = Path(weight_path)
+    model = load_model(task, weight_path)
+    base = policy_from_model(model)
+
+    states = sample_states(task, num_states)
+    with torch.inference_mode():
+        expected = model(torch.from_numpy(states)).argmax(1).numpy()
+    batch = states[:batch_size]
+    base_batch_us = _latency_us(base, batch, 200)
+    base_single_us = _latency_us(base, states[:1], 2000)
+
+    reports = []
+    for weight_dtype in weight_dtypes:
+        runner = base.astype(weight_dtype)
+        if output_path:
+            path = Path(output_path)
+        else:
+            path = weight_path.with_suffix(EXPORT_SUFFIXES[weight_dtype])
+        runner.save(path)
+        batch_us = _latency_us(runner, batch, 200)
+        single_us = _latency_us(runner, states[:1], 2000)
+        reports.append(
+            ExportReport(
+                weight_dtype=weight_dtype,
+                path=path,
+                file_bytes=path.stat().st_size,
+                memory_bytes=runner.nbytes,
+                batch_us=batch_us,
+                single_us=single_us,
+                batch_vs_float32=batch_us / base_batch_us,
+                single_vs_float32=single_us / base_single_us,
+                agreement=float((runner.act_batch(states) == expected).mean()),
+            )
+        )
+        logger.success(f"Exported {task.name} policy ({weight_dtype}) to {path}")
+    return reports
+
+def format_report(reports: list[ExportReport], batch_size: int) -> str:
+    """Render export reports as a fixed-width text table."""
+    header = [
+        "dtype", "file KiB", "mem KiB", f"us/batch({batch_size})",
+        "us/state", "vs f32 (batch/state)", "agreement", "path",
+    ]
+    rows = [
+        [
+            r.weight_dtype, f"{r.file_bytes / 1024:.1f}",
+            f"{r.memory_bytes / 1024:.1f}", f"{r.batch_us:.1f}",
+            f"{r.single_us:.1f}",
+            f"{r.batch_vs_float32:.2f}x / {r.single_vs_float32:.2f}x",
+            f"{r.agreement:.2%}", str(r.path),
+        ]
+        for r in reports
+    ]
+    widths = [
+        max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(header)
+    ]
+
+    def fmt(cells: list[str]) -> str:
+        return " | ".join(c.ljust(w) for c, w in zip(cells, widths, strict=True))
+
+    lines = [fmt(header), "-+-".join("-" * w for w in widths)]
+    lines.extend(fmt(row) for row in rows)
+    return "\n".join(lines)
@@ -1,39 +1,70 @@
 import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
 
-from .agent import BaseDQNAgent
-from .tasks import get_task
+from .policy import PolicyRunner
+from .tasks import BaseTask, get_task
 from .utils import Config, logger
 
+def load_policy(
+    task: BaseTask, weight_path: str | Path, torch_compile: bool = False
+) -> Callable[[Any], int]:
+    """
+    Greedy action function for the weights at `weight_path`.
+
+    `.npz` exports run on `PolicyRunner` without importing torch. Torch
+    checkpoints are loaded into the task's model and converted to a
+    `PolicyRunner`, unless `torch_compile` asks for the compiled torch
+    forward instead.
+    """
+    weight_path = Path(weight_path)
+    if weight_path.suffix == ".npz":
+        runner = PolicyRunner.load(weight_path)
+        if runner.architecture == "dueling" and task.state_codec().input_shape == ():
+            # Export of a one-hot model for a task that now feeds state indices
+            logger.info("Converting one-hot policy to an embedding table")
+            runner = runner.to_embedding()
+        return runner.act
+
+    # Torch is only imported for torch checkpoints
+    from .export import load_model, policy_from_model
+
+    model = load_model(task, weight_path)
+    if not torch_compile:
+        return policy_from_model(model).act
+
+    from .agent import BaseDQNAgent
+
+    agent = BaseDQNAgent(
+        task.state_size, 
+        task.action_size, 
+        Config(), 
+        model_factory=task.create_model,
+        state_codec=task.state_codec()
+    )
+    agent.model.load_state_dict(model.state_dict())
+    agent.enable_compile(training=False)
+    return lambda state: agent.act(state, training=False)
+
 def infer(
     task_name: str, 
     weight_path: str, 
     episodes: int = 5, 
-    render_mode: str = None
+    render_mode: str = None,
+    torch_compile: bool = False
 ):
-    config = Config()
-    if weight_path:
-        config.model_path = weight_path
-    
     task = get_task(task_name)
-    env = task.make_env(render_mode=render_mode)
-    
-    agent = BaseDQNAgent(
-        task.state_size, 
-        task.action_size, 
-        config, 
-        model_factory=task.create_model
-    )
+    weight_path = weight_path or Config().model_path
     
     try:
-        agent.load(config.model_path)
+        act = load_policy(task, weight_path, torch_compile)
     except Exception as e:
-        logger.error(f"Could not load model from {config.model_path}. Error: {e}")
+        logger.error(f"Could not load model from {weight_path}. Error: {e}")
         return
 
+    env = task.make_limited_env()
     logger.info(f"Starting inference on {task.name} for {episodes} episodes...")
-    
-    # Disable exploration
-    agent.epsilon = 0.0
 
     for e in range(episodes):
         state, info = env.reset()
@@ -42,7 +73,7 @@ def infer(
         done = False
         
         while not done:
-            action = agent.act(state, training=False)
+            action = act(state)
             next_state, reward, terminated, truncated, _ = env.step(action)
             next_state = task.preprocess_state(next_state)
             done = terminated or truncated
@@ -0,0 +1,100 @@
+import json
+import math
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .utils import logger, paths
+
+def read_metrics(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Records of a metrics file written by `MetricsWriter`. A torn last line
+    (the writer was killed mid-flush) is skipped, so this is safe to run on
+    the file of a live or crashed run.
+    """
+    with Path(path).open() as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            yield json.loads(line)
+
+def _finite(value: Any) -> Any:
+    """JSON has no inf/nan: report non-finite floats as null."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+class MetricsWriter:
+    """
+    Streams training records to a JSON Lines file, one object per line.
+
+    Records are buffered in memory and handed to the OS whenever
+    `flush_secs` have passed since the last flush (checked on each write),
+    so the file can be followed with `tail -f` while training runs and a
+    crash loses at most that window; `close` also fsyncs. Every record has
+    a `kind` ("episode" or "step") and `time`, the seconds since training
+    started. With `resume_episode`, records of episodes from that index on
+    (written after the checkpoint being resumed) are dropped and the rest
+    are kept; otherwise an existing file is replaced.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        flush_secs: float = 5.0,
+        resume_episode: int | None = None,
+        start_time: float = 0.0
+    ):
+        self.path = paths.ensure_dir(Path(path))
+        self.flush_secs = flush_secs
+        self.records = 0
+        kept = []
+        if resume_episode is not None and self.path.exists():
+            kept = [
+                r for r in read_metrics(self.path)
+                if r.get("episode", 0) < resume_episode
+            ]
+            start_time = max((r["time"] for r in kept), default=start_time)
+        self._buffer: list[str] = [json.dumps(r) + "\n" for r in kept]
+        # Rewrite the kept records, then append to the new file
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text("".join(self._buffer))
+        tmp_path.replace(self.path)
+        self._buffer.clear()
+        self._file = self.path.open("a")
+        self._origin = time.perf_counter() - start_time
+        self._last_flush = time.monotonic()
+
+    def write(self, kind: str, **fields: Any) -> None:
+        """Buffer one record, flushing if `flush_secs` have passed."""
+        record = {
+            "kind": kind,
+            "time": round(time.perf_counter() - self._origin, 3),
+            **{k: _finite(v) for k, v in fields.items()},
+        }
+        self._buffer.append(json.dumps(record) + "\n")
+        self.records += 1
+        if time.monotonic() - self._last_flush >= self.flush_secs:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand buffered records to the OS as whole lines."""
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+            self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush, sync the file to disk and close it."""
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            logger.error(f"Failed to sync metrics file {self.path}: {e}")
+        finally:
+            self._file.close()
@@ -1,6 +1,11 @@
+import math
+
+import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
+from .utils import logger
+
 class SimpleMLP(nn.Module):
     def __init__(self, state_size: int, action_size: int, hidden_size: int = 128):
         super().__init__()
@@ -24,7 +29,7 @@ class DuelingMLP(nn.Module):
         
         # Feature extraction layer
         self.feature = nn.Sequential(
-            nn.Linear(state_size, hidden_size),
+            self._input_layer(state_size, hidden_size),
             nn.ReLU(),
             nn.Linear(hidden_size, hidden_size),
             nn.ReLU()
@@ -44,6 +49,9 @@ class DuelingMLP(nn.Module):
             nn.Linear(hidden_size, action_size)
         )
 
+    def _input_layer(self, state_size: int, hidden_size: int) -> nn.Module:
+        return nn.Linear(state_size, hidden_size)
+
     def forward(self, x):
         features = self.feature(x)
         
@@ -53,4 +61,38 @@ class DuelingMLP(nn.Module):
         # Combine V and A
         # Q(s,a) = V(s) + (A(s,a) - 1/|A| * sum A(s,a'))
         Q = V + (A - A.mean(dim=1, keepdim=True))
-        return Q
\ No newline at end of file
+        return Q
+
+class EmbeddingDuelingMLP(DuelingMLP):
+    """
+    Dueling network over integer states of a discrete space.
+    The first feature layer is an embedding table, so a state index selects
+    its row directly instead of multiplying a one-hot vector by a dense
+    weight matrix. Both compute the same function (a row of the table plays
+    the role of weight column plus bias), but the lookup costs O(hidden)
+    per state regardless of the number of states. Rows are initialized like
+    that weight column plus bias of a default `nn.Linear` with fan-in
+    `num_states`, without building the dense layer.
+
+    Weights saved from a one-hot `DuelingMLP` (a `feature.0.bias` entry) are
+    converted to the table on load, so they keep working unchanged.
+    """
+    def __init__(self, num_states: int, action_size: int, hidden_size: int = 128):
+        super().__init__(num_states, action_size, hidden_size)
+        self.register_load_state_dict_pre_hook(self._convert_one_hot)
+
+    @staticmethod
+    def _convert_one_hot(module, state_dict, prefix, *args) -> None:
+        weight_key, bias_key = f"{prefix}feature.0.weight", f"{prefix}feature.0.bias"
+        if bias_key not in state_dict:
+            return
+        logger.info("Converting one-hot DuelingMLP weights to an embedding table")
+        bias = state_dict.pop(bias_key)
+        state_dict[weight_key] = state_dict[weight_key].T + bias
+
+    def _input_layer(self, state_size: int, hidden_size: int) -> nn.Module:
+        # nn.Linear draws weight and bias from U(-1/sqrt(fan_in), 1/sqrt(fan_in))
+        bound = 1.0 / math.sqrt(state_size)
+        table = torch.empty(state_size, hidden_size).uniform_(-bound, bound)
+        table += torch.empty(hidden_size).uniform_(-bound, bound)
+        return nn.Embedding.from_pretrained(table, freeze=False)
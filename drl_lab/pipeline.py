@@ -0,0 +1,103 @@
+import threading
+
+from .agent import BaseDQNAgent
+from .replay import ThreadSafeReplayBuffer
+from .utils import logger
+
+class PipelinedLearner:
+    """
+    Runs `BaseDQNAgent.replay()` on a background thread so gradient updates
+    overlap with environment stepping.
+
+    The acting thread reports environment steps through `notify_steps`; the
+    learner keeps `updates ~= replay_ratio * steps` (counted once replay is
+    warm) and blocks the acting thread if it falls more than `max_lag` updates
+    behind. Acting uses a copy of the policy republished every
+    `publish_freq` updates. Anything else that touches the online or target
+    network from the acting thread must hold `update_lock`.
+    """
+
+    def __init__(
+        self,
+        agent: BaseDQNAgent,
+        replay_ratio: float = 1.0,
+        publish_freq: int = 20,
+        max_lag: int = 200
+    ):
+        self.agent = agent
+        self.replay_ratio = replay_ratio
+        self.publish_freq = publish_freq
+        self.max_lag = max_lag
+
+        agent.memory = ThreadSafeReplayBuffer(agent.memory)
+        agent.use_acting_copy()
+
+        self.update_lock = threading.Lock()
+        self.env_steps = 0
+        self.updates = 0
+        self._warm_steps: int | None = None
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._run, name="learner", daemon=True
+        )
+
+    def _due(self) -> int:
+        """Number of updates the replay ratio calls for so far."""
+        if self._warm_steps is None:
+            return 0
+        return int(self.replay_ratio * (self.env_steps - self._warm_steps))
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the learner thread and re-raise any error it hit."""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def notify_steps(self, steps: int) -> None:
+        """Report `steps` new environment steps from the acting thread."""
+        with self._cond:
+            self.env_steps += steps
+            if (
+                self._warm_steps is None
+                and len(self.agent.memory) >= self.agent.config.train_start_size
+            ):
+                self._warm_steps = self.env_steps
+            self._cond.notify_all()
+            # Back-pressure: don't let acting run arbitrarily far ahead
+            while (
+                self._due() - self.updates > self.max_lag
+                and not self._stop.is_set()
+                and self._error is None
+            ):
+                self._cond.wait(timeout=0.1)
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                with self._cond:
+                    while self.updates >= self._due() and not self._stop.is_set():
+                        self._cond.wait(timeout=0.1)
+                if self._stop.is_set():
+                    break
+
+                with self.update_lock:
+                    self.agent.replay()
+                    self.updates += 1
+                    if self.updates % self.publish_freq == 0:
+                        self.agent.publish_acting_model()
+
+                with self._cond:
+                    self._cond.notify_all()
+        except BaseException as e:
+            logger.exception(f"Learner thread failed: {e}")
+            self._error = e
+            with self._cond:
+                self._cond.notify_all()
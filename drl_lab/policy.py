@@ -0,0 +1,319 @@
+import math
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Layer = (weight of shape (in, out), bias of shape (out,))
+Layer = tuple[np.ndarray, np.ndarray]
+
+ARCHITECTURES = ("mlp", "dueling", "embedding")
+WEIGHT_DTYPES = ("float32", "float16", "int8")
+STACKS = ("trunk", "value", "advantage")
+# File suffix of each exported weight format (`rlab export`)
+EXPORT_SUFFIXES = {"float32": ".npz", "float16": ".fp16.npz", "int8": ".int8.npz"}
+STORAGE_DTYPES = {
+    "float32": np.dtype(np.float32),
+    "float16": np.dtype(np.float16),
+    "int8": np.dtype(np.int8),
+}
+
+_scratch = threading.local()
+
+def _float_scratch(shape: tuple[int, ...]) -> np.ndarray:
+    """
+    Per-thread float32 buffer of `shape` for expanding a reduced-precision
+    weight, shared by every policy on the thread and grown to the largest
+    layer seen.
+    """
+    size = math.prod(shape)
+    buf = getattr(_scratch, "buf", None)
+    if buf is None or buf.size < size:
+        buf = _scratch.buf = np.empty(size, dtype=np.float32)
+    return buf[:size].reshape(shape)
+
+class PolicyRunner:
+    """
+    Greedy policy of a trained Q-network evaluated in pure NumPy.
+
+    Supports the architectures in `drl_lab.models`: a plain ReLU MLP
+    ("mlp", `SimpleMLP`) and the dueling network ("dueling", `DuelingMLP`),
+    whose trunk feeds separate value and advantage heads combined as
+    Q = V + (A - mean(A)). "embedding" (`EmbeddingDuelingMLP`) is the
+    dueling network over integer states: the first trunk weight is an
+    embedding table of shape (num_states, hidden) indexed by state.
+    Activations, the advantage mean and the actions are written into
+    buffers reused across calls of the same batch size, so once those exist
+    acting on float32 (int64 for "embedding") state arrays creates no new
+    arrays; the only per-call memory is NumPy's broadcasting scratch, capped
+    by its fixed ufunc buffer size (about 32 KiB) whatever the batch size.
+    Weights are loaded from the `.npz` files written by `save` (see
+    `drl_lab.export`) and this module never imports torch.
+
+    `weight_dtype` selects how weights are stored, on disk and in memory:
+    "float16" halves them, "int8" quarters them with symmetric
+    per-output-channel float32 scales. NumPy has no fast reduced-precision
+    matmul, so each layer is expanded into a per-thread float32 scratch
+    (shared by all policies on the thread, one layer in size) right before
+    its matmul, and int8 outputs are rescaled per channel afterwards. The
+    expansion costs about as much as a single-state matmul (more for
+    float16, whose NumPy cast is slow): many more policies fit in a host's
+    memory, at a higher per-state latency while large batches stay close to
+    float32 (`rlab export` reports the ratios).
+    """
+
+    def __init__(
+        self,
+        architecture: str,
+        trunk: list[Layer],
+        value: list[Layer] | None = None,
+        advantage: list[Layer] | None = None,
+        weight_dtype: str = "float32",
+        scales: dict[str, list[np.ndarray]] | None = None
+    ):
+        if architecture not in ARCHITECTURES:
+            raise ValueError(f"Unknown policy architecture: '{architecture}'")
+        if architecture != "mlp" and not (value and advantage):
+            raise ValueError("A dueling policy needs value and advantage heads.")
+        if weight_dtype not in WEIGHT_DTYPES:
+            raise ValueError(f"Unknown weight dtype: '{weight_dtype}'")
+        if weight_dtype == "int8" and scales is None:
+            raise ValueError("int8 weights need per-channel scales.")
+        self.architecture = architecture
+        self.weight_dtype = weight_dtype
+        stacks = {"trunk": trunk, "value": value or [], "advantage": advantage or []}
+        self.scales: dict[str, list[np.ndarray | None]] = {
+            name: (
+                [np.ascontiguousarray(x, dtype=np.float32) for x in scales[name]]
+                if scales else [None] * len(layers)
+            )
+            for name, layers in stacks.items()
+        }
+        stored = STORAGE_DTYPES[weight_dtype]
+        for name, layers in stacks.items():
+            setattr(self, name, [
+                (
+                    np.ascontiguousarray(w, dtype=stored),
+                    np.ascontiguousarray(b, dtype=np.float32),
+                )
+                for w, b in layers
+            ])
+        self.state_size = self.trunk[0][0].shape[0]
+        out_layer = self.advantage[-1] if self.advantage else self.trunk[-1]
+        self.action_size = out_layer[0].shape[1]
+
+        self._batch_size = 0
+        self._buffers: dict[str, list[np.ndarray]] = {}
+        self._actions = np.empty(0, dtype=np.int64)
+        self._mean = np.empty((0, 1), dtype=np.float32)
+        # Embedding rows gathered in the stored dtype before expansion
+        self._rows = np.empty((0, 0), dtype=stored)
+
+    def _stacks(self) -> dict[str, list[Layer]]:
+        return {name: getattr(self, name) for name in STACKS}
+
+    def _float_stacks(self) -> dict[str, list[Layer]]:
+        """Layers with weights expanded (and dequantized) to float32."""
+        return {
+            name: [
+                (
+                    w.astype(np.float32) * scale if scale is not None
+                    else w.astype(np.float32),
+                    b,
+                )
+                for (w, b), scale in zip(layers, self.scales[name], strict=True)
+            ]
+            for name, layers in self._stacks().items()
+        }
+
+    def astype(self, weight_dtype: str) -> "PolicyRunner":
+        """
+        Copy of this float32 policy with weights stored as `weight_dtype`.
+        int8 uses symmetric per-output-channel scales: w = q * max|w| / 127.
+        """
+        if self.weight_dtype != "float32":
+            raise ValueError("Only float32 policies can be converted.")
+        stacks = self._stacks()
+        if weight_dtype == "float16":
+            stacks = {
+                name: [(w.astype(np.float16), b) for w, b in layers]
+                for name, layers in stacks.items()
+            }
+            return PolicyRunner(self.architecture, **stacks, weight_dtype="float16")
+        if weight_dtype != "int8":
+            return PolicyRunner(self.architecture, **stacks, weight_dtype=weight_dtype)
+
+        quantized: dict[str, list[Layer]] = {}
+        scales: dict[str, list[np.ndarray]] = {}
+        for name, layers in stacks.items():
+            quantized[name], scales[name] = [], []
+            for weight, bias in layers:
+                scale = np.abs(weight).max(axis=0) / 127.0
+                scale[scale == 0.0] = 1.0
+                q = np.clip(np.rint(weight / scale), -127, 127).astype(np.int8)
+                quantized[name].append((q, bias))
+                scales[name].append(scale.astype(np.float32))
+        return PolicyRunner(
+            self.architecture, **quantized, weight_dtype="int8", scales=scales
+        )
+
+    def to_embedding(self) -> "PolicyRunner":
+        """
+        "embedding" copy of a one-hot "dueling" policy: row i of the table is
+        the first trunk layer applied to one-hot state i (weight row + bias).
+        """
+        if self.architecture != "dueling":
+            raise ValueError("Only dueling policies can be converted.")
+        stacks = self._float_stacks()
+        (weight, bias), *rest = stacks["trunk"]
+        runner = PolicyRunner(
+            "embedding", [(weight + bias, np.zeros_like(bias)), *rest],
+            value=stacks["value"], advantage=stacks["advantage"],
+        )
+        # Keep the storage format of the loaded policy
+        return runner.astype(self.weight_dtype)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PolicyRunner":
+        """Load a policy written by `save`."""
+        with np.load(Path(path)) as data:
+            architecture = str(data["architecture"])
+            weight_dtype = (
+                str(data["weight_dtype"]) if "weight_dtype" in data else "float32"
+            )
+            counts = {
+                name: int(data[f"{name}.layers"])
+                for name in STACKS
+                if f"{name}.layers" in data
+            }
+            stacks = {
+                name: [
+                    (data[f"{name}.{i}.weight"], data[f"{name}.{i}.bias"])
+                    for i in range(count)
+                ]
+                for name, count in counts.items()
+            }
+            scales = None
+            if weight_dtype == "int8":
+                scales = {
+                    name: [
+                        data[f"{name}.{i}.scale"] for i in range(counts.get(name, 0))
+                    ]
+                    for name in STACKS
+                }
+        return cls(architecture, **stacks, weight_dtype=weight_dtype, scales=scales)
+
+    def save(self, path: str | Path) -> Path:
+        """Write the weights to an uncompressed `.npz` file."""
+        arrays: dict[str, Any] = {
+            "architecture": np.array(self.architecture),
+            "weight_dtype": np.array(self.weight_dtype),
+        }
+        for name, layers in self._stacks().items():
+            if not layers:
+                continue
+            arrays[f"{name}.layers"] = np.array(len(layers))
+            for i, ((weight, bias), scale) in enumerate(
+                zip(layers, self.scales[name], strict=True)
+            ):
+                arrays[f"{name}.{i}.weight"] = weight
+                arrays[f"{name}.{i}.bias"] = bias
+                if scale is not None:
+                    arrays[f"{name}.{i}.scale"] = scale
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            np.savez(f, **arrays)
+        return path
+
+    @property
+    def nbytes(self) -> int:
+        """In-memory size of all stored weights, biases and scales in bytes."""
+        return sum(
+            w.nbytes + b.nbytes + (0 if s is None else s.nbytes)
+            for name, layers in self._stacks().items()
+            for (w, b), s in zip(layers, self.scales[name], strict=True)
+        )
+
+    def _stack_buffers(self, layers: list[Layer], batch_size: int) -> list[np.ndarray]:
+        return [
+            np.empty((batch_size, w.shape[1]), dtype=np.float32) for w, _ in layers
+        ]
+
+    def _ensure_buffers(self, batch_size: int) -> None:
+        if batch_size == self._batch_size:
+            return
+        self._buffers = {
+            name: self._stack_buffers(layers, batch_size)
+            for name, layers in self._stacks().items()
+        }
+        self._actions = np.empty(batch_size, dtype=np.int64)
+        self._mean = np.empty((batch_size, 1), dtype=np.float32)
+        if self.architecture == "embedding":
+            table = self.trunk[0][0]
+            self._rows = np.empty((batch_size, table.shape[1]), dtype=table.dtype)
+        self._batch_size = batch_size
+
+    def _run_stack(self, x: np.ndarray, name: str, relu_last: bool) -> np.ndarray:
+        """Affine layers with ReLU between them (and after the last if asked)."""
+        layers = getattr(self, name)
+        last = len(layers) - 1
+        for i, ((weight, bias), scale, out) in enumerate(
+            zip(layers, self.scales[name], self._buffers[name], strict=True)
+        ):
+            if i == 0 and name == "trunk" and self.architecture == "embedding":
+                # Row lookup of integer states instead of a one-hot matmul
+                if weight.dtype == out.dtype:
+                    np.take(weight, x, axis=0, out=out)
+                else:
+                    np.copyto(out, np.take(weight, x, axis=0, out=self._rows))
+            elif weight.dtype == out.dtype:
+                np.matmul(x, weight, out=out)
+            else:
+                expanded = _float_scratch(weight.shape)
+                np.copyto(expanded, weight)
+                np.matmul(x, expanded, out=out)
+            if scale is not None:
+                # Per-output-channel scales commute with the matmul
+                out *= scale
+            out += bias
+            if i < last or relu_last:
+                np.maximum(out, 0.0, out=out)
+            x = out
+        return x
+
+    def q_values(self, states: np.ndarray) -> np.ndarray:
+        """
+        Q-values for a batch of preprocessed states (shape (N, state_size),
+        or (N,) state indices for "embedding"). The returned array is reused
+        by the next call with the same N.
+        """
+        if self.architecture == "embedding":
+            states = np.asarray(states, dtype=np.int64).reshape(-1)
+        else:
+            states = np.asarray(states, dtype=np.float32)
+            if states.ndim == 1:
+                states = states.reshape(1, -1)
+        self._ensure_buffers(len(states))
+
+        dueling = self.architecture != "mlp"
+        features = self._run_stack(states, "trunk", relu_last=dueling)
+        if not dueling:
+            return features
+
+        value = self._run_stack(features, "value", relu_last=False)
+        q = self._run_stack(features, "advantage", relu_last=False)
+        # Q(s,a) = V(s) + (A(s,a) - 1/|A| * sum A(s,a'))
+        q -= np.mean(q, axis=1, keepdims=True, out=self._mean)
+        q += value
+        return q
+
+    def act_batch(self, states: np.ndarray) -> np.ndarray:
+        """Greedy action for every row of `states` (array reused per call)."""
+        q = self.q_values(states)
+        return np.argmax(q, axis=1, out=self._actions)
+
+    def act(self, state: np.ndarray | list) -> int:
+        """Greedy action for a single preprocessed state."""
+        return int(self.act_batch(state)[0])
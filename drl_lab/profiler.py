@@ -0,0 +1,248 @@
+import contextlib
+import json
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import torch
+
+from .utils import logger, paths
+
+# Returned for every section of a disabled profiler: entering and leaving it
+# does nothing, so instrumented code pays one method call per phase
+_NULL_SECTION = contextlib.nullcontext()
+
+class _Section:
+    """Cumulative wall time and call count of one named phase."""
+
+    __slots__ = (
+        "name", "background", "calls", "total_ns", "_start", "_sync", "_label"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        synchronize: Callable[[], None] | None,
+        label: bool = False
+    ):
+        self.name = name
+        # Timed on a thread other than the main (acting) thread
+        self.background = threading.current_thread() is not threading.main_thread()
+        self.calls = 0
+        self.total_ns = 0
+        self._start = 0
+        self._sync = synchronize
+        # Also marks each occurrence as a `record_function` range
+        self._label = torch.profiler.record_function(name) if label else None
+
+    def __enter__(self) -> None:
+        if self._label:
+            self._label.__enter__()
+        if self._sync:
+            self._sync()
+        self._start = time.perf_counter_ns()
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._sync:
+            self._sync()
+        self.total_ns += time.perf_counter_ns() - self._start
+        self.calls += 1
+        if self._label:
+            self._label.__exit__(*exc)
+
+class PhaseProfiler:
+    """
+    Cumulative wall time and call counts per training phase.
+
+    Code marks a phase with `with profiler.section("env.step"): ...`. When
+    the profiler is disabled every section is a shared `nullcontext`, so the
+    instrumentation can stay in the hot loop. Names containing `/` are
+    sub-phases of the part before it (`agent.replay/forward`) and are not
+    counted again in the parent's share. Each phase must only be timed from
+    one thread at a time; phases first timed off the main thread (the
+    pipelined learner) are reported separately from the acting loop's wall
+    time. With `synchronize` (e.g. `torch.cuda.synchronize`) each section
+    waits for queued device work on entry and exit, so asynchronous kernels
+    are charged to the phase that launched them.
+
+    With `labels`, every section is also a `torch.profiler.record_function`
+    range under the same name, so phases show up in `torch.profiler`
+    traces whether or not timing is enabled.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        synchronize: Callable[[], None] | None = None,
+        labels: bool = False
+    ):
+        self.enabled = enabled
+        self.synchronize = synchronize
+        self.labels = labels
+        self._sections: dict[str, _Section] = {}
+        self._started = 0
+        self.wall_ns = 0
+
+    def section(self, name: str) -> contextlib.AbstractContextManager:
+        """Context manager timing one occurrence of phase `name`."""
+        if not self.enabled:
+            if self.labels:
+                return torch.profiler.record_function(name)
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(
+                name, self.synchronize, self.labels
+            )
+        return section
+
+    def start(self) -> None:
+        """Start the wall clock that phase shares are measured against."""
+        self._started = time.perf_counter_ns()
+
+    def stop(self) -> None:
+        if self._started:
+            self.wall_ns += time.perf_counter_ns() - self._started
+            self._started = 0
+
+    def report(self) -> dict[str, Any]:
+        """Per-phase totals, plus the acting loop's untracked remainder."""
+        wall = self.wall_ns / 1e9
+        phases = []
+        tracked_ns = 0
+        for s in self._sections.values():
+            if "/" not in s.name and not s.background:
+                tracked_ns += s.total_ns
+            phases.append({
+                "name": s.name,
+                "calls": s.calls,
+                "total_s": s.total_ns / 1e9,
+                "mean_us": s.total_ns / max(s.calls, 1) / 1e3,
+                "share": s.total_ns / self.wall_ns if self.wall_ns else 0.0,
+                "background": s.background,
+            })
+        return {
+            "wall_s": wall,
+            "untracked_s": max(self.wall_ns - tracked_ns, 0) / 1e9,
+            "phases": phases,
+        }
+
+    def log_summary(self) -> None:
+        """Log the breakdown as a table, nested and background phases last."""
+        report = self.report()
+        # Phases in order of first use, each followed by its sub-phases
+        first: dict[str, int] = {}
+        for i, p in enumerate(report["phases"]):
+            first.setdefault(p["name"].split("/")[0], i)
+        rows = sorted(
+            report["phases"],
+            key=lambda p: (
+                p["background"], first[p["name"].split("/")[0]], "/" in p["name"]
+            ),
+        )
+        logger.info(f"Profile over {report['wall_s']:.2f}s wall time:")
+        logger.info(
+            f"   {'phase':<26} {'calls':>9} {'total s':>9} {'mean us':>10} {'share':>7}"
+        )
+        for p in rows:
+            name = p["name"]
+            if "/" in name:
+                name = "  " + name.split("/", 1)[1]
+            if p["background"]:
+                name += " (bg)"
+            logger.info(
+                f"   {name:<26} {p['calls']:>9} {p['total_s']:>9.3f} "
+                f"{p['mean_us']:>10.1f} {p['share']:>6.1%}"
+            )
+        untracked = report["untracked_s"]
+        share = untracked / report["wall_s"] if report["wall_s"] else 0.0
+        logger.info(
+            f"   {'(untracked)':<26} {'':>9} {untracked:>9.3f} {'':>10} {share:>6.1%}"
+        )
+
+    def save(self, path: str | Path) -> Path:
+        """Write `report()` as JSON."""
+        path = paths.ensure_dir(Path(path))
+        path.write_text(json.dumps(self.report(), indent=2))
+        return path
+
+class EpisodeTracer:
+    """
+    `torch.profiler` capture of the training episodes in `[start, end)`.
+
+    The profiler steps once per completed episode on a wait/warmup/active
+    schedule: it idles through the episodes before the window, warms up on
+    the one right before `start` and records `start` to `end - 1`. The
+    Chrome/Perfetto trace (`trace_ep<start>-<end>.json`, open in
+    chrome://tracing or ui.perfetto.dev) and an operator summary sorted by
+    self time (`ops_ep<start>-<end>.txt`) are written to `output_dir` once
+    the window closes, or when training stops inside it.
+    """
+
+    def __init__(
+        self, start: int, end: int, first_episode: int, output_dir: str | Path
+    ):
+        self.start = max(start, first_episode)
+        self.end = end
+        self.output_dir = Path(output_dir)
+        self._episode = first_episode
+        self._profile: torch.profiler.profile | None = None
+
+        activities = [torch.profiler.ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(torch.profiler.ProfilerActivity.CUDA)
+        lead = self.start - first_episode
+        warmup = min(lead, 1)
+        self._activities = activities
+        self._schedule = torch.profiler.schedule(
+            wait=lead - warmup, warmup=warmup, active=self.end - self.start,
+            repeat=1
+        )
+
+    @property
+    def done(self) -> bool:
+        return self._episode >= self.end
+
+    def begin(self) -> None:
+        """Start the profiler; call before the first episode runs."""
+        if self.done or self.start >= self.end:
+            return
+        self._profile = torch.profiler.profile(
+            activities=self._activities,
+            schedule=self._schedule,
+            on_trace_ready=self._export,
+            record_shapes=True,
+        )
+        self._profile.start()
+
+    def episode_done(self) -> None:
+        """Advance the schedule past one completed episode."""
+        if self._profile is None:
+            return
+        self._episode += 1
+        self._profile.step()
+        if self.done:
+            self.close()
+
+    def close(self) -> None:
+        """Stop profiling, exporting whatever part of the window was recorded."""
+        if self._profile is None:
+            return
+        profile, self._profile = self._profile, None
+        profile.stop()
+
+    def _export(self, profile: torch.profiler.profile) -> None:
+        span = f"ep{self.start}-{min(self._episode, self.end)}"
+        trace_path = paths.ensure_dir(self.output_dir / f"trace_{span}.json")
+        profile.export_chrome_trace(str(trace_path))
+        sort_by = (
+            "self_cuda_time_total" if torch.cuda.is_available()
+            else "self_cpu_time_total"
+        )
+        ops_path = self.output_dir / f"ops_{span}.txt"
+        ops_path.write_text(
+            profile.key_averages().table(sort_by=sort_by, row_limit=50)
+        )
+        logger.info(f"Trace saved to {trace_path} (operators: {ops_path})")
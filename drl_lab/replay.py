@@ -0,0 +1,793 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+
+from .utils import Config, logger
+
+class StateCodec:
+    """
+    Storage encoding for states held in replay.
+
+    The base codec stores model inputs verbatim as float32 vectors. Subclasses
+    store a compact form and expand a whole sampled batch back into model
+    inputs in one vectorized step.
+    """
+
+    dtype: np.dtype = np.dtype(np.float32)
+    # Dtype of the decoded model inputs
+    input_dtype: np.dtype = np.dtype(np.float32)
+
+    def __init__(self, state_size: int):
+        self.state_size = state_size
+
+    @property
+    def storage_shape(self) -> tuple[int, ...]:
+        """Per-state shape of the stored form."""
+        return (self.state_size,)
+
+    @property
+    def input_shape(self) -> tuple[int, ...]:
+        """Per-state shape of the decoded model input."""
+        return (self.state_size,)
+
+    def encode(self, state: np.ndarray | list) -> np.ndarray | int:
+        """Convert a preprocessed state into its stored form."""
+        return state
+
+    def encode_batch(self, states: np.ndarray) -> np.ndarray:
+        """Convert a batch of preprocessed states into their stored form."""
+        return np.asarray(states)
+
+    def decode(self, stored: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Expand a batch of stored states into model inputs."""
+        return stored
+
+class Float16Codec(StateCodec):
+    """
+    Stores states as float16. Only safe for bounded observations whose values
+    fit comfortably within float16 range and precision.
+    """
+
+    dtype = np.dtype(np.float16)
+
+    def decode(self, stored: np.ndarray, out: np.ndarray) -> np.ndarray:
+        np.copyto(out, stored, casting="unsafe")
+        return out
+
+class IndexCodec(StateCodec):
+    """
+    Stores one-hot states of a `Discrete` space as a single integer index,
+    using the smallest unsigned dtype that can hold it.
+    """
+
+    def __init__(self, n: int):
+        super().__init__(n)
+        self.dtype = np.min_scalar_type(max(n - 1, 0))
+        self._eye = np.eye(n, dtype=np.float32)
+
+    @property
+    def storage_shape(self) -> tuple[int, ...]:
+        return ()
+
+    def encode(self, state: np.ndarray | list | int) -> int:
+        if isinstance(state, np.ndarray) and state.ndim:
+            return int(state.argmax())
+        return int(state)
+
+    def encode_batch(self, states: np.ndarray) -> np.ndarray:
+        states = np.asarray(states)
+        if states.ndim == 2:
+            return states.argmax(axis=1)
+        return states
+
+    def decode(self, stored: np.ndarray, out: np.ndarray) -> np.ndarray:
+        np.take(self._eye, stored, axis=0, out=out)
+        return out
+
+class DiscreteCodec(IndexCodec):
+    """
+    Stores integer states of a `Discrete` space in the smallest unsigned
+    dtype and decodes them to int64 indices rather than one-hot vectors,
+    for models that look states up in an embedding table.
+    """
+
+    input_dtype = np.dtype(np.int64)
+
+    def __init__(self, n: int):
+        StateCodec.__init__(self, n)
+        self.dtype = np.min_scalar_type(max(n - 1, 0))
+
+    @property
+    def input_shape(self) -> tuple[int, ...]:
+        return ()
+
+    def decode(self, stored: np.ndarray, out: np.ndarray) -> np.ndarray:
+        np.copyto(out, stored)
+        return out
+
+def codec_for_space(space: gym.Space) -> StateCodec:
+    """
+    Pick the most compact codec for an observation space: an integer index
+    for `Discrete`, float16 for a `Box` bounded within float16 range, and
+    plain float32 otherwise.
+    """
+    if isinstance(space, gym.spaces.Discrete):
+        return IndexCodec(int(space.n))
+    size = int(np.prod(space.shape))
+    if isinstance(space, gym.spaces.Box):
+        bounds = np.concatenate([space.low.ravel(), space.high.ravel()])
+        limit = np.finfo(np.float16).max
+        if np.all(np.isfinite(bounds)) and np.all(np.abs(bounds) <= limit):
+            return Float16Codec(size)
+    return StateCodec(size)
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring buffer of transitions backed by preallocated arrays.
+
+    Transitions live in contiguous NumPy arrays instead of a deque of tuples,
+    so sampling is a vectorized gather of random indices into reusable batch
+    buffers rather than a Python-level rebuild of every minibatch. States are
+    stored in the compact form given by `codec`.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        state_size: int,
+        seed: int | None = None,
+        codec: StateCodec | None = None
+    ):
+        if capacity <= 0:
+            raise ValueError(f"Replay capacity must be positive, got {capacity}.")
+
+        self.capacity = capacity
+        self.state_size = state_size
+        self.codec = codec or StateCodec(state_size)
+        self.rng = np.random.default_rng(seed)
+
+        self._ptr = 0
+        self._size = 0
+
+        state_shape = (capacity, *self.codec.storage_shape)
+        state_dtype = self.codec.dtype
+        self.states = self._allocate("states", state_shape, state_dtype)
+        self.actions = self._allocate("actions", (capacity,), np.int64)
+        self.rewards = self._allocate("rewards", (capacity,), np.float32)
+        self.next_states = self._allocate("next_states", state_shape, state_dtype)
+        self.dones = self._allocate("dones", (capacity,), np.float32)
+
+        # Reusable output buffers, (re)allocated when the batch size changes
+        self._batch_size = 0
+        self._batch: tuple[np.ndarray, ...] = ()
+        self._decoded: tuple[np.ndarray, np.ndarray] = ()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes of transition storage."""
+        return sum(
+            arr.nbytes for arr in (
+                self.states, self.actions, self.rewards, self.next_states, self.dones
+            )
+        )
+
+    def _allocate(
+        self, name: str, shape: tuple[int, ...], dtype: np.dtype
+    ) -> np.ndarray:
+        """Allocate the storage array for one transition field."""
+        return np.zeros(shape, dtype=dtype)
+
+    def push(
+        self,
+        state: np.ndarray | list,
+        action: int,
+        reward: float,
+        next_state: np.ndarray | list,
+        done: bool
+    ) -> None:
+        """Write a single transition, overwriting the oldest one when full."""
+        i = self._ptr
+        self.states[i] = self.codec.encode(state)
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = self.codec.encode(next_state)
+        self.dones[i] = done
+
+        self._ptr = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def push_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray
+    ) -> np.ndarray:
+        """
+        Write a batch of transitions (one per row) in a single vectorized step.
+        Returns the ring slots that were written.
+        """
+        n = len(actions)
+        slots = (self._ptr + np.arange(n)) % self.capacity
+        self.states[slots] = self.codec.encode_batch(states)
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.next_states[slots] = self.codec.encode_batch(next_states)
+        self.dones[slots] = dones
+
+        self._ptr = (self._ptr + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        return slots
+
+    def _batch_buffers(self, batch_size: int) -> tuple[np.ndarray, ...]:
+        if batch_size != self._batch_size:
+            # Decoded states and next states share one contiguous block
+            pair = np.empty(
+                (2 * batch_size, *self.codec.input_shape), dtype=self.codec.input_dtype
+            )
+            self._decoded = (pair[:batch_size], pair[batch_size:])
+            if (
+                self.codec.dtype == pair.dtype
+                and self.codec.storage_shape == self.codec.input_shape
+            ):
+                # Identity storage: gather straight into the decoded block
+                stored_states, stored_next_states = self._decoded
+            else:
+                stored_shape = (batch_size, *self.codec.storage_shape)
+                stored_states = np.empty(stored_shape, dtype=self.codec.dtype)
+                stored_next_states = np.empty(stored_shape, dtype=self.codec.dtype)
+            self._batch = (
+                stored_states,
+                np.empty(batch_size, dtype=np.int64),
+                np.empty(batch_size, dtype=np.float32),
+                stored_next_states,
+                np.empty(batch_size, dtype=np.float32),
+            )
+            self._batch_size = batch_size
+        return self._batch
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        """Draw `batch_size` slot indices uniformly (with replacement)."""
+        return self.rng.integers(0, self._size, size=batch_size)
+
+    def _gather_stored(self, indices: np.ndarray) -> tuple[np.ndarray, ...]:
+        """Gather the stored (still encoded) transitions at `indices`."""
+        states, actions, rewards, next_states, dones = self._batch_buffers(
+            len(indices)
+        )
+        np.take(self.states, indices, axis=0, out=states)
+        np.take(self.actions, indices, out=actions)
+        np.take(self.rewards, indices, out=rewards)
+        np.take(self.next_states, indices, axis=0, out=next_states)
+        np.take(self.dones, indices, out=dones)
+        return states, actions, rewards, next_states, dones
+
+    def gather(self, indices: np.ndarray) -> tuple[np.ndarray, ...]:
+        """
+        Gather the transitions at `indices` into the reusable batch buffers,
+        expanding states into model inputs.
+
+        The returned arrays are overwritten by the next call, so callers must
+        consume (or copy) them before sampling again. States and next states
+        are the two halves of one contiguous (2 * batch, *input_shape) array.
+        """
+        states, actions, rewards, next_states, dones = self._gather_stored(indices)
+        out_states, out_next_states = self._decoded
+        return (
+            self.codec.decode(states, out_states),
+            actions,
+            rewards,
+            self.codec.decode(next_states, out_next_states),
+            dones,
+        )
+
+    def sample(self, batch_size: int) -> tuple[np.ndarray, ...]:
+        """
+        Sample a minibatch as (states, actions, rewards, next_states, dones).
+        """
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer.")
+        return self.gather(self.sample_indices(batch_size))
+
+    def close(self) -> None:
+        """Release any resources held by the storage backend."""
+        pass
+
+    def _field_arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "states": self.states,
+            "actions": self.actions,
+            "rewards": self.rewards,
+            "next_states": self.next_states,
+            "dones": self.dones,
+        }
+
+    def state_dict(self, include_data: bool = True) -> dict[str, Any]:
+        """
+        Snapshot for checkpoints: ring position, sampling RNG and, if
+        `include_data`, the filled slots of every field in stored form.
+        """
+        state: dict[str, Any] = {
+            "capacity": self.capacity,
+            "ptr": self._ptr,
+            "size": self._size,
+            "rng": self.rng.bit_generator.state,
+        }
+        if include_data:
+            state["fields"] = {
+                name: arr[:self._size] for name, arr in self._field_arrays().items()
+            }
+        return state
+
+    def load_state_dict(self, state: dict[str, Any]) -> None:
+        """
+        Restore a `state_dict` snapshot. Without stored fields only the
+        sampling RNG is restored and the contents are left as they are.
+        """
+        self.rng.bit_generator.state = state["rng"]
+        if "fields" not in state:
+            return
+        if state["capacity"] != self.capacity:
+            raise ValueError(
+                f"Replay snapshot has capacity {state['capacity']}, "
+                f"buffer has {self.capacity}."
+            )
+        size = state["size"]
+        for name, arr in self._field_arrays().items():
+            arr[:size] = state["fields"][name]
+        self._ptr = state["ptr"]
+        self._size = size
+
+class SegmentTree:
+    """
+    Array-backed binary segment tree over `capacity` leaves.
+
+    Node `i` has children `2i` and `2i + 1`; leaves occupy
+    `[size, 2 * size)` where `size` is `capacity` rounded up to a power of two.
+    Updates are vectorized over a batch of leaves and touch O(log n) nodes each.
+    """
+
+    def __init__(self, capacity: int, neutral: float, op: np.ufunc):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.capacity = capacity
+        self.size = size
+        self.depth = size.bit_length() - 1
+        self.op = op
+        self.tree = np.full(2 * size, neutral, dtype=np.float64)
+
+    def update(self, indices: np.ndarray, values: np.ndarray) -> None:
+        """Set the leaves at `indices` to `values` and refresh their ancestors."""
+        nodes = np.asarray(indices, dtype=np.int64) + self.size
+        self.tree[nodes] = values
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.op(self.tree[2 * nodes], self.tree[2 * nodes + 1])
+            nodes = np.unique(nodes // 2)
+
+    def get(self, indices: np.ndarray) -> np.ndarray:
+        return self.tree[np.asarray(indices, dtype=np.int64) + self.size]
+
+    def root(self) -> float:
+        return float(self.tree[1])
+
+class SumTree(SegmentTree):
+    def __init__(self, capacity: int):
+        super().__init__(capacity, 0.0, np.add)
+
+    def find_prefixsum(self, prefix: np.ndarray) -> np.ndarray:
+        """
+        Return, for every prefix sum in the batch, the leaf whose cumulative
+        range contains it. The whole batch descends the tree together.
+        """
+        prefix = np.array(prefix, dtype=np.float64)
+        nodes = np.ones(len(prefix), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = prefix >= left_sum
+            prefix -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        return np.minimum(nodes - self.size, self.capacity - 1)
+
+class MinTree(SegmentTree):
+    def __init__(self, capacity: int):
+        super().__init__(capacity, np.inf, np.minimum)
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Proportional prioritized experience replay (Schaul et al., 2015).
+
+    Transitions are drawn with probability p_i^alpha / sum_k p_k^alpha using
+    stratified sampling over a sum-tree; a min-tree tracks the smallest
+    priority to normalize importance-sampling weights.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        state_size: int,
+        alpha: float = 0.6,
+        eps: float = 1e-6,
+        seed: int | None = None,
+        codec: StateCodec | None = None
+    ):
+        super().__init__(capacity, state_size, seed, codec)
+        self.alpha = alpha
+        self.eps = eps
+        self.max_priority = 1.0
+        self.sum_tree = SumTree(capacity)
+        self.min_tree = MinTree(capacity)
+        self._weights = np.empty(0, dtype=np.float32)
+
+    def push(
+        self,
+        state: np.ndarray | list,
+        action: int,
+        reward: float,
+        next_state: np.ndarray | list,
+        done: bool
+    ) -> None:
+        """Write a transition with the current maximum priority."""
+        i = self._ptr
+        super().push(state, action, reward, next_state, done)
+        self._set_priorities(np.array([i]), np.array([self.max_priority]))
+
+    def push_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray
+    ) -> np.ndarray:
+        """Write a batch of transitions with the current maximum priority."""
+        slots = super().push_batch(states, actions, rewards, next_states, dones)
+        self._set_priorities(slots, np.full(len(slots), self.max_priority))
+        return slots
+
+    def _set_priorities(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        scaled = priorities ** self.alpha
+        self.sum_tree.update(indices, scaled)
+        self.min_tree.update(indices, scaled)
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        """Stratified proportional sampling: one draw per equal-mass segment."""
+        segment = self.sum_tree.root() / batch_size
+        prefix = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        return np.minimum(self.sum_tree.find_prefixsum(prefix), self._size - 1)
+
+    def importance_weights(self, indices: np.ndarray, beta: float) -> np.ndarray:
+        """Importance-sampling weights normalized by the largest possible weight."""
+        if len(self._weights) != len(indices):
+            self._weights = np.empty(len(indices), dtype=np.float32)
+        total = self.sum_tree.root()
+        p_min = self.min_tree.root() / total
+        probs = self.sum_tree.get(indices) / total
+        np.divide(
+            (probs * self._size) ** -beta,
+            (p_min * self._size) ** -beta,
+            out=self._weights,
+            casting="unsafe",
+        )
+        return self._weights
+
+    def sample(
+        self, batch_size: int, beta: float = 0.4
+    ) -> tuple[np.ndarray, ...]:
+        """
+        Sample a minibatch as
+        (states, actions, rewards, next_states, dones, indices, weights).
+        """
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer.")
+        indices = self.sample_indices(batch_size)
+        weights = self.importance_weights(indices, beta)
+        return (*self.gather(indices), indices, weights)
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray) -> None:
+        """Feed absolute TD errors of a sampled batch back as new priorities."""
+        priorities = np.abs(td_errors) + self.eps
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self._set_priorities(indices, priorities)
+
+    def state_dict(self, include_data: bool = True) -> dict[str, Any]:
+        state = super().state_dict(include_data)
+        if include_data:
+            state["max_priority"] = self.max_priority
+            state["sum_tree"] = self.sum_tree.tree
+            state["min_tree"] = self.min_tree.tree
+        return state
+
+    def load_state_dict(self, state: dict[str, Any]) -> None:
+        super().load_state_dict(state)
+        if "sum_tree" in state:
+            self.max_priority = state["max_priority"]
+            self.sum_tree.tree[:] = state["sum_tree"]
+            self.min_tree.tree[:] = state["min_tree"]
+
+class MemmapReplayBuffer(ReplayBuffer):
+    """
+    Replay buffer whose transition arrays live in `np.memmap` files.
+
+    Only the ring indices and a small hot window of recent transitions are
+    kept in RAM. The window is written to disk as contiguous slices once it
+    fills up, and sampled indices are sorted so gathers walk the files in
+    page order. With `reopen`, an existing buffer of the same shape in
+    `directory` is continued in place (for resumed runs); otherwise its
+    files are truncated and the buffer starts empty.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(
+        self,
+        capacity: int,
+        state_size: int,
+        directory: str | Path,
+        hot_size: int = 1024,
+        seed: int | None = None,
+        codec: StateCodec | None = None,
+        reopen: bool = False
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        codec = codec or StateCodec(state_size)
+        meta = self._read_meta()
+        if meta is not None and not reopen:
+            logger.warning(
+                f"Discarding the replay buffer in {self.directory} "
+                f"({meta['size']} transitions of a previous run)."
+            )
+            meta = None
+        self._reopen = (
+            meta is not None
+            and meta["capacity"] == capacity
+            and meta["state_size"] == state_size
+            and meta.get("state_dtype") == codec.dtype.str
+        )
+        if meta is not None and not self._reopen:
+            logger.warning(
+                f"Replay buffer in {self.directory} has a different shape; "
+                "starting a new one."
+            )
+
+        super().__init__(capacity, state_size, seed, codec)
+
+        if self._reopen:
+            self._ptr = meta["ptr"]
+            self._size = meta["size"]
+            logger.info(
+                f"Reopened replay buffer at {self.directory} "
+                f"({self._size} transitions)"
+            )
+
+        # Hot window: pending transitions not yet written to the files
+        self.hot_size = max(1, min(hot_size, capacity))
+        self._hot = tuple(
+            np.zeros((self.hot_size, *arr.shape[1:]), dtype=arr.dtype)
+            for arr in self._fields()
+        )
+        self._hot_count = 0
+        self._flush_pos = self._ptr
+
+    def _fields(self) -> tuple[np.ndarray, ...]:
+        return self.states, self.actions, self.rewards, self.next_states, self.dones
+
+    def _read_meta(self) -> dict | None:
+        meta_path = self.directory / self.META_FILE
+        if not meta_path.exists():
+            return None
+        with meta_path.open() as f:
+            return json.load(f)
+
+    def _write_meta(self) -> None:
+        meta = {
+            "capacity": self.capacity,
+            "state_size": self.state_size,
+            "state_dtype": self.codec.dtype.str,
+            "ptr": self._ptr,
+            "size": self._size,
+        }
+        tmp_path = self.directory / f"{self.META_FILE}.tmp"
+        with tmp_path.open("w") as f:
+            json.dump(meta, f)
+        tmp_path.replace(self.directory / self.META_FILE)
+
+    def _allocate(
+        self, name: str, shape: tuple[int, ...], dtype: np.dtype
+    ) -> np.ndarray:
+        file_path = self.directory / f"{name}.bin"
+        mode = "r+" if self._reopen and file_path.exists() else "w+"
+        return np.memmap(file_path, dtype=dtype, mode=mode, shape=shape)
+
+    def push(
+        self,
+        state: np.ndarray | list,
+        action: int,
+        reward: float,
+        next_state: np.ndarray | list,
+        done: bool
+    ) -> None:
+        """Stage a transition in the hot window, flushing it when full."""
+        k = self._hot_count
+        states, actions, rewards, next_states, dones = self._hot
+        states[k] = self.codec.encode(state)
+        actions[k] = action
+        rewards[k] = reward
+        next_states[k] = self.codec.encode(next_state)
+        dones[k] = done
+
+        self._hot_count = k + 1
+        self._ptr = (self._ptr + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        if self._hot_count == self.hot_size:
+            self.flush()
+
+    def push_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray
+    ) -> np.ndarray:
+        """Stage a batch of transitions, flushing each time the window fills."""
+        n = len(actions)
+        slots = (self._ptr + np.arange(n)) % self.capacity
+        fields = (
+            self.codec.encode_batch(states),
+            actions,
+            rewards,
+            self.codec.encode_batch(next_states),
+            dones,
+        )
+        start = 0
+        while start < n:
+            k = self._hot_count
+            m = min(n - start, self.hot_size - k)
+            for hot, values in zip(self._hot, fields, strict=True):
+                hot[k:k + m] = values[start:start + m]
+            self._hot_count = k + m
+            self._ptr = (self._ptr + m) % self.capacity
+            self._size = min(self._size + m, self.capacity)
+            start += m
+            if self._hot_count == self.hot_size:
+                self.flush()
+        return slots
+
+    def flush(self) -> None:
+        """Write the hot window to the memory-mapped files."""
+        k = self._hot_count
+        if k:
+            start = self._flush_pos
+            head = min(k, self.capacity - start)
+            for disk, hot in zip(self._fields(), self._hot, strict=True):
+                disk[start:start + head] = hot[:head]
+                # Wrap around the end of the ring
+                disk[:k - head] = hot[head:k]
+            self._hot_count = 0
+            self._flush_pos = self._ptr
+        self._write_meta()
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        """Uniform indices, sorted so the gather reads pages in file order."""
+        indices = super().sample_indices(batch_size)
+        indices.sort()
+        return indices
+
+    def _gather_stored(self, indices: np.ndarray) -> tuple[np.ndarray, ...]:
+        batch = super()._gather_stored(indices)
+        if self._hot_count:
+            # Slots still pending in the hot window hold stale data on disk
+            offsets = (indices - self._flush_pos) % self.capacity
+            pending = offsets < self._hot_count
+            if pending.any():
+                hot_indices = offsets[pending]
+                for out, hot in zip(batch, self._hot, strict=True):
+                    out[pending] = hot[hot_indices]
+        return batch
+
+    def close(self) -> None:
+        """Flush pending transitions and the memory maps to disk."""
+        self.flush()
+        for disk in self._fields():
+            disk.flush()
+
+    def state_dict(self, include_data: bool = True) -> dict[str, Any]:
+        """
+        The files in `directory` already hold the contents, so only the
+        pending window is flushed and the contents are never copied.
+        """
+        self.close()
+        return super().state_dict(include_data=False)
+
+class ThreadSafeReplayBuffer:
+    """
+    Serializes access to a replay buffer shared between an acting thread that
+    pushes transitions and a learner thread that samples and reprioritizes.
+    Other attributes are forwarded to the wrapped buffer.
+    """
+
+    def __init__(self, buffer: ReplayBuffer):
+        self.buffer = buffer
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.buffer, name)
+
+    def push(self, *args: Any) -> None:
+        with self.lock:
+            self.buffer.push(*args)
+
+    def push_batch(self, *args: Any) -> np.ndarray:
+        with self.lock:
+            return self.buffer.push_batch(*args)
+
+    def sample(self, *args: Any) -> tuple[np.ndarray, ...]:
+        """
+        Sample under the lock. The batch arrays are the wrapped buffer's
+        reusable outputs, so only one thread may sample.
+        """
+        with self.lock:
+            return self.buffer.sample(*args)
+
+    def update_priorities(self, *args: Any) -> None:
+        with self.lock:
+            self.buffer.update_priorities(*args)
+
+    def close(self) -> None:
+        with self.lock:
+            self.buffer.close()
+
+    def state_dict(self, *args: Any) -> dict[str, Any]:
+        with self.lock:
+            return self.buffer.state_dict(*args)
+
+def create_replay_buffer(
+    config: Config, state_size: int, codec: StateCodec | None = None
+) -> ReplayBuffer:
+    """Build the replay memory selected by `config`, storing states via `codec`."""
+    if config.replay_backend == "memmap":
+        if config.prioritized_replay:
+            raise ValueError(
+                "Prioritized replay is only supported with the 'memory' backend."
+            )
+        if not config.replay_dir:
+            raise ValueError("The 'memmap' replay backend requires a replay_dir.")
+        return MemmapReplayBuffer(
+            config.memory_size,
+            state_size,
+            config.replay_dir,
+            hot_size=config.replay_hot_size,
+            seed=config.seed,
+            codec=codec,
+            reopen=config.replay_reopen,
+        )
+    if config.replay_backend != "memory":
+        raise ValueError(f"Unknown replay backend: '{config.replay_backend}'")
+
+    if config.prioritized_replay:
+        return PrioritizedReplayBuffer(
+            config.memory_size,
+            state_size,
+            alpha=config.per_alpha,
+            eps=config.per_eps,
+            seed=config.seed,
+            codec=codec,
+        )
+    return ReplayBuffer(
+        config.memory_size, state_size, seed=config.seed, codec=codec
+    )
@@ -0,0 +1,327 @@
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from types import UnionType
+from typing import Any, Union, get_args, get_origin, get_type_hints
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from .train import Trainer, TrainingCallbacks
+from .utils import Config, logger, paths
+
+TRUE_STRINGS = ("1", "true", "yes", "on")
+FALSE_STRINGS = ("0", "false", "no", "off")
+
+@dataclass
+class TrialResult:
+    trial_id: int
+    params: dict[str, Any]
+    status: str = "completed"
+    episodes: int = 0
+    # None until the trial finishes an episode, so summaries stay valid JSON
+    final_avg: float | None = None
+    best_avg: float | None = None
+    duration: float = 0.0
+    rung_metrics: list[float] = field(default_factory=list)
+
+def _field_type(key: str) -> Any:
+    """Annotated type of the `Config` field `key`, with `X | None` unwrapped."""
+    hints = get_type_hints(Config)
+    if key not in hints:
+        raise ValueError(f"Unknown config field: '{key}'")
+    args = [a for a in get_args(hints[key]) if a is not type(None)]
+    if get_origin(hints[key]) in (Union, UnionType) and len(args) == 1:
+        return args[0]
+    return hints[key]
+
+def parse_value(key: str, raw: str) -> Any:
+    """
+    Convert a CLI string into the annotated type of the `Config` field `key`
+    ("none" gives None for optional fields). Raises `ValueError` for a bool
+    field given anything outside `TRUE_STRINGS` and `FALSE_STRINGS`.
+    """
+    field_type = _field_type(key)
+    if raw.lower() == "none" and field_type is not get_type_hints(Config)[key]:
+        return None
+    if field_type is bool:
+        if raw.lower() in TRUE_STRINGS:
+            return True
+        if raw.lower() in FALSE_STRINGS:
+            return False
+        raise ValueError(f"Expected a boolean for '{key}' but got '{raw}'")
+    if field_type is int:
+        return int(float(raw))
+    if field_type is float:
+        return float(raw)
+    return raw
+
+def parse_param(spec: str) -> tuple[str, list[Any]]:
+    """Parse a `key=v1,v2,...` choice specification."""
+    key, sep, values = spec.partition("=")
+    if not sep or not values:
+        raise ValueError(f"Expected KEY=V1,V2,... but got '{spec}'")
+    key = key.strip()
+    return key, [parse_value(key, v.strip()) for v in values.split(",")]
+
+def load_space(path: str | Path) -> dict[str, Any]:
+    """
+    Load a search space from JSON. Each field maps either to a list of
+    choices or to a range `{"low": a, "high": b, "log": bool}`.
+    """
+    with Path(path).open() as f:
+        space = json.load(f)
+    valid = {f.name for f in fields(Config)}
+    for key in space:
+        if key not in valid:
+            raise ValueError(f"Unknown config field in search space: '{key}'")
+    return space
+
+def sample_params(
+    space: dict[str, Any], rng: np.random.Generator
+) -> dict[str, Any]:
+    """Draw one configuration from the search space."""
+    params = {}
+    for key, dist in space.items():
+        field_type = _field_type(key)
+        if isinstance(dist, list):
+            value = dist[rng.integers(len(dist))]
+        elif field_type is bool:
+            # A bool "range" is a choice between its ends
+            value = bool((dist["low"], dist["high"])[rng.integers(2)])
+        else:
+            low, high = dist["low"], dist["high"]
+            if dist.get("log", False):
+                value = math.exp(rng.uniform(math.log(low), math.log(high)))
+            else:
+                value = rng.uniform(low, high)
+            if field_type is int:
+                value = round(value)
+        params[key] = value.item() if isinstance(value, np.generic) else value
+    return params
+
+def rung_milestones(min_episodes: int, max_episodes: int, eta: int) -> list[int]:
+    """Episode counts at which ASHA compares trials: r, r*eta, r*eta^2, ..."""
+    milestones = []
+    budget = min_episodes
+    while budget < max_episodes:
+        milestones.append(budget)
+        budget *= eta
+    return milestones
+
+class _RungCallback(TrainingCallbacks):
+    """
+    Reports the `PlotRenderer` moving average at each rung boundary and stops
+    the trial unless it is in the top 1/eta of results recorded at that rung
+    (asynchronous successive halving, stopping variant).
+    """
+
+    def __init__(
+        self,
+        milestones: list[int],
+        eta: int,
+        rungs: Any,
+        lock: Any,
+        result: TrialResult
+    ):
+        self.milestones = milestones
+        self.eta = eta
+        self.rungs = rungs
+        self.lock = lock
+        self.result = result
+        self.trainer: Trainer | None = None
+        self.stopped = False
+
+    def on_step(
+        self, step: int, state: Any, reward: float, info: dict[str, Any]
+    ) -> None:
+        pass
+
+    def on_episode_end(self, episode: int, steps: int, reward: float) -> None:
+        self.result.episodes = episode + 1
+        metric = float(self.trainer.plotter.moving_avgs[-1])
+        self.result.final_avg = metric
+        best = self.result.best_avg
+        self.result.best_avg = metric if best is None else max(best, metric)
+
+        if self.result.episodes not in self.milestones:
+            return
+        rung = self.milestones.index(self.result.episodes)
+        self.result.rung_metrics.append(metric)
+        with self.lock:
+            recorded = list(self.rungs.get(rung, [])) + [metric]
+            self.rungs[rung] = recorded
+        if len(recorded) < self.eta:
+            return
+        cutoff = float(np.quantile(recorded, 1.0 - 1.0 / self.eta))
+        if metric < cutoff:
+            self.stopped = True
+            self.result.status = f"stopped@{self.result.episodes}"
+
+def _init_worker(threads: int, cores: Any) -> None:
+    """Pin a pool worker to its own slice of cores and torch thread count."""
+    logger.remove()
+    torch.set_num_threads(threads)
+    core_set = cores.get()
+    if core_set and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, core_set)
+
+def _run_trial(
+    trial_id: int,
+    task_name: str,
+    params: dict[str, Any],
+    episodes: int,
+    output_dir: str,
+    milestones: list[int],
+    eta: int,
+    rungs: Any,
+    lock: Any
+) -> TrialResult:
+    result = TrialResult(trial_id, params)
+    callback = _RungCallback(milestones, eta, rungs, lock, result)
+    trainer = Trainer(
+        task_name,
+        Path(output_dir) / f"trial_{trial_id:03d}.pth",
+        episodes,
+        callbacks=callback,
+        should_stop=lambda: callback.stopped,
+        overrides=params,
+    )
+    callback.trainer = trainer
+
+    start = time.perf_counter()
+    trainer.run()
+    result.duration = time.perf_counter() - start
+    return result
+
+def _core_slices(workers: int, threads: int) -> list[set[int]]:
+    """Disjoint core sets for each worker, or empty sets if cores run out."""
+    if not hasattr(os, "sched_getaffinity"):
+        return [set() for _ in range(workers)]
+    available = sorted(os.sched_getaffinity(0))
+    if len(available) < workers * threads:
+        return [set() for _ in range(workers)]
+    return [
+        set(available[i * threads:(i + 1) * threads]) for i in range(workers)
+    ]
+
+def run_sweep(
+    task_name: str,
+    space: dict[str, Any],
+    trials: int,
+    episodes: int,
+    workers: int,
+    threads_per_worker: int = 1,
+    min_episodes: int = 50,
+    eta: int = 3,
+    output_dir: str | Path | None = None,
+    seed: int | None = None
+) -> list[TrialResult]:
+    """
+    Run `trials` sampled configurations of `task_name` on a process pool,
+    early-stopping weak trials with ASHA. Writes `summary.csv` and
+    `summary.json` to `output_dir` and returns results sorted best first.
+    """
+    out = Path(output_dir) if output_dir else paths.get_sweep_dir(task_name)
+    paths.ensure_dir(out)
+    rng = np.random.default_rng(seed)
+    configs = [sample_params(space, rng) for _ in range(trials)]
+    milestones = rung_milestones(min_episodes, episodes, eta)
+
+    logger.info(
+        f"Sweeping {task_name}: {trials} trials on {workers} workers "
+        f"({threads_per_worker} thread(s) each)"
+    )
+    logger.info(f"   ASHA rungs at episodes {milestones} (eta={eta})")
+
+    ctx = mp.get_context("spawn")
+    cores = ctx.Queue()
+    for core_set in _core_slices(workers, threads_per_worker):
+        cores.put(core_set)
+
+    results: list[TrialResult] = []
+    with ctx.Manager() as manager:
+        rungs = manager.dict()
+        lock = manager.Lock()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(threads_per_worker, cores),
+        ) as pool:
+            futures = {
+                pool.submit(
+                    _run_trial, i, task_name, params, episodes, str(out),
+                    milestones, eta, rungs, lock
+                ): i
+                for i, params in enumerate(configs)
+            }
+            for future in as_completed(futures):
+                trial_id = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Trial {trial_id} failed: {e}")
+                    result = TrialResult(trial_id, configs[trial_id], "failed")
+                results.append(result)
+                logger.info(
+                    f"Trial {result.trial_id:03d} {result.status} | "
+                    f"Episodes: {result.episodes} | "
+                    f"Best Avg: {_format_avg(result.best_avg, 2): >7}"
+                )
+
+    results.sort(
+        key=lambda r: -math.inf if r.best_avg is None else r.best_avg,
+        reverse=True
+    )
+    _write_summary(results, out)
+    return results
+
+def _format_avg(value: float | None, digits: int, missing: str = "-") -> str:
+    """Format a moving average, or `missing` if the trial never reported one."""
+    return missing if value is None else f"{value:.{digits}f}"
+
+def _write_summary(results: list[TrialResult], output_dir: Path) -> None:
+    keys = sorted({k for r in results for k in r.params})
+    with (output_dir / "summary.csv").open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["trial", *keys, "status", "episodes", "best_avg", "final_avg",
+             "duration_s"]
+        )
+        for r in results:
+            writer.writerow(
+                [r.trial_id, *(r.params.get(k) for k in keys), r.status,
+                 r.episodes, _format_avg(r.best_avg, 3, ""),
+                 _format_avg(r.final_avg, 3, ""),
+                 f"{r.duration:.1f}"]
+            )
+    with (output_dir / "summary.json").open("w") as f:
+        json.dump([r.__dict__ for r in results], f, indent=2)
+    logger.success(f"Sweep summary saved to {output_dir / 'summary.csv'}")
+
+def format_table(results: list[TrialResult]) -> str:
+    """Render results as a fixed-width text table."""
+    keys = sorted({k for r in results for k in r.params})
+    header = ["trial", *keys, "status", "episodes", "best_avg"]
+    rows = [
+        [f"{r.trial_id:03d}", *(str(r.params.get(k)) for k in keys), r.status,
+         str(r.episodes), _format_avg(r.best_avg, 2)]
+        for r in results
+    ]
+    widths = [
+        max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(header)
+    ]
+
+    def fmt(cells: list[str]) -> str:
+        return " | ".join(c.ljust(w) for c, w in zip(cells, widths, strict=True))
+
+    lines = [fmt(header), "-+-".join("-" * w for w in widths)]
+    lines.extend(fmt(row) for row in rows)
+    return "\n".join(lines)
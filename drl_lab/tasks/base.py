@@ -1,12 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import gymnasium as gym
-import torch.nn as nn
+import numpy as np
+from gymnasium.vector import AsyncVectorEnv, AutoresetMode, SyncVectorEnv, VectorEnv
+from gymnasium.wrappers import TimeLimit
 
+from ..replay import StateCodec, codec_for_space
 from ..utils import Config
 from .visual import BaseTaskTUI, DefaultTaskTUI
 
+if TYPE_CHECKING:
+    import torch.nn as nn
+
 class BaseTask(ABC):
     """
     Abstract Base Class for Reinforcement Learning Tasks.
@@ -55,6 +61,31 @@ class BaseTask(ABC):
         """
         pass
     
+    def make_limited_env(self) -> gym.Env:
+        """
+        Creates an environment truncated at `config.max_steps` steps.
+        """
+        return TimeLimit(self.get_env(), max_episode_steps=self.config.max_steps)
+
+    def get_vector_env(self, num_envs: int, backend: str = "sync") -> VectorEnv:
+        """
+        Creates `num_envs` copies of the environment stepped as one batch.
+        Finished sub-environments reset within the same step; their final
+        observation is reported in `info["final_obs"]`.
+
+        `backend` is "sync", "async" (one process per env) or "native", an
+        array-based implementation of the whole batch that tasks may
+        provide by overriding this method.
+        """
+        if backend == "native":
+            raise ValueError(f"Task '{self.name}' has no native vector env.")
+        env_fns = [self.make_limited_env] * num_envs
+        if backend == "sync":
+            return SyncVectorEnv(env_fns, autoreset_mode=AutoresetMode.SAME_STEP)
+        if backend == "async":
+            return AsyncVectorEnv(env_fns, autoreset_mode=AutoresetMode.SAME_STEP)
+        raise ValueError(f"Unknown vector env backend: '{backend}'")
+    
     def render(self) -> BaseTaskTUI:
         """
         Returns the TUI interface for this task.
@@ -75,7 +106,7 @@ class BaseTask(ABC):
         pass
 
     @abstractmethod
-    def create_model(self) -> nn.Module:
+    def create_model(self) -> "nn.Module":
         """Creates and returns the neural network model for this task."""
         pass
 
@@ -85,6 +116,36 @@ class BaseTask(ABC):
         """
         return state
 
+    def preprocess_batch(self, states: np.ndarray) -> np.ndarray:
+        """
+        Preprocesses a batch of observations (one per row).
+        Defaults to stacking `preprocess_state` over the rows.
+        """
+        return np.stack([self.preprocess_state(s) for s in states])
+
+    def state_codec(self) -> StateCodec:
+        """
+        Returns the storage encoding replay uses for preprocessed states.
+        Defaults to `codec_for_space` of the observation space (an integer
+        index for one-hot `Discrete` states, float16 for a bounded `Box`),
+        or plain float32 vectors when `preprocess_state` changes the state
+        size; override when preprocessing needs another encoding.
+
+        The codec also declares the model input: returning a
+        `DiscreteCodec` means `preprocess_state` yields integer indices in
+        `[0, state_size)` (and `preprocess_batch` a 1-D int64 array), which
+        the agent feeds to the model as int64 tensors, e.g. into an
+        `EmbeddingDuelingMLP`.
+        """
+        env = self.get_env()
+        try:
+            codec = codec_for_space(env.observation_space)
+        finally:
+            env.close()
+        if codec.state_size != self.state_size:
+            return StateCodec(self.state_size)
+        return codec
+
     # --- Hooks ---
     
     def pre_training(self) -> None:
@@ -1,11 +1,16 @@
+from typing import TYPE_CHECKING
+
 import gymnasium as gym
-import torch.nn as nn
 from gymnasium import Wrapper
+from gymnasium.vector import VectorEnv
 
-from ...models import DuelingMLP
 from ..base import BaseTask
 from ..visual import BaseTaskTUI
 from .tui import CartPoleTUI
+from .vector import CartPoleVectorEnv
+
+if TYPE_CHECKING:
+    import torch.nn as nn
 
 class CenteredRewardWrapper(Wrapper):
     """
@@ -29,12 +34,23 @@ class CartPoleTask(BaseTask):
         temp_env = gym.make("CartPole-v1")
         self._state_size = int(temp_env.observation_space.shape[0])
         self._action_size = int(temp_env.action_space.n)
+        self._spec_steps = temp_env.spec.max_episode_steps
         temp_env.close()
 
     def get_env(self) -> gym.Env:
         env = gym.make("CartPole-v1")
         return CenteredRewardWrapper(env)
 
+    def get_vector_env(self, num_envs: int, backend: str = "sync") -> VectorEnv:
+        if backend == "native":
+            return CartPoleVectorEnv(
+                num_envs,
+                # gym.make's own limit still applies under `make_limited_env`
+                max_episode_steps=min(self.config.max_steps, self._spec_steps),
+                seed=self.config.seed,
+            )
+        return super().get_vector_env(num_envs, backend)
+
     @property
     def state_size(self) -> int:
         return self._state_size
@@ -43,7 +59,9 @@ class CartPoleTask(BaseTask):
     def action_size(self) -> int:
         return self._action_size
 
-    def create_model(self) -> nn.Module:
+    def create_model(self) -> "nn.Module":
+        from ...models import DuelingMLP
+
         return DuelingMLP(self.state_size, self.action_size)
     
     def render(self) -> BaseTaskTUI:
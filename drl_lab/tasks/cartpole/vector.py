@@ -0,0 +1,117 @@
+import math
+from typing import Any
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+class CartPoleVectorEnv(VectorEnv):
+    """
+    `num_envs` CartPole-v1 environments stepped as whole arrays.
+
+    Reproduces gymnasium's `CartPoleEnv` dynamics (Euler integration in
+    float64, float32 observations) with the physics state of every env held
+    in one (num_envs, 4) array, so a step is a handful of vectorized NumPy
+    operations instead of one Python `step` per env. Rewards include the
+    `CenteredRewardWrapper` shaping, episodes are truncated after
+    `max_episode_steps`, and finished envs reset within the same step: their
+    last observation is reported in `info["final_obs"]`, matching the
+    `AutoresetMode.SAME_STEP` vector envs from `BaseTask.get_vector_env`.
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.SAME_STEP}
+
+    # Constants of gymnasium's CartPoleEnv
+    GRAVITY = 9.8
+    MASSCART = 1.0
+    MASSPOLE = 0.1
+    TOTAL_MASS = MASSPOLE + MASSCART
+    LENGTH = 0.5
+    POLEMASS_LENGTH = MASSPOLE * LENGTH
+    FORCE_MAG = 10.0
+    TAU = 0.02
+    THETA_THRESHOLD = 12 * 2 * math.pi / 360
+    X_THRESHOLD = 2.4
+
+    def __init__(
+        self,
+        num_envs: int,
+        max_episode_steps: int = 500,
+        seed: int | None = None
+    ):
+        self.num_envs = num_envs
+        self.max_episode_steps = max_episode_steps
+
+        high = np.array(
+            [self.X_THRESHOLD * 2, np.inf, self.THETA_THRESHOLD * 2, np.inf],
+            dtype=np.float32,
+        )
+        self.single_observation_space = spaces.Box(-high, high, dtype=np.float32)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.single_action_space = spaces.Discrete(2)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        self.state = np.zeros((num_envs, 4), dtype=np.float64)
+        self.elapsed = np.zeros(num_envs, dtype=np.int64)
+        self._rng = np.random.default_rng(seed)
+
+    def _reset_rows(self, rows: np.ndarray | slice) -> None:
+        n = len(self.state[rows])
+        self.state[rows] = self._rng.uniform(-0.05, 0.05, size=(n, 4))
+        self.elapsed[rows] = 0
+
+    def reset(
+        self,
+        *,
+        seed: int | None = None,
+        options: dict[str, Any] | None = None
+    ) -> tuple[np.ndarray, dict[str, Any]]:
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._reset_rows(slice(None))
+        return self.state.astype(np.float32), {}
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict[str, Any]]:
+        x, x_dot, theta, theta_dot = self.state.T
+        force = np.where(np.asarray(actions) == 1, self.FORCE_MAG, -self.FORCE_MAG)
+        costheta = np.cos(theta)
+        sintheta = np.sin(theta)
+
+        temp = (
+            force + self.POLEMASS_LENGTH * np.square(theta_dot) * sintheta
+        ) / self.TOTAL_MASS
+        thetaacc = (self.GRAVITY * sintheta - costheta * temp) / (
+            self.LENGTH
+            * (4.0 / 3.0 - self.MASSPOLE * np.square(costheta) / self.TOTAL_MASS)
+        )
+        xacc = temp - self.POLEMASS_LENGTH * thetaacc * costheta / self.TOTAL_MASS
+
+        # Euler: positions advance with the velocities from before this step.
+        # The columns are views, so this updates `self.state` in place.
+        x += self.TAU * x_dot
+        x_dot += self.TAU * xacc
+        theta += self.TAU * theta_dot
+        theta_dot += self.TAU * thetaacc
+        self.elapsed += 1
+
+        obs = self.state.astype(np.float32)
+        terminated = (np.abs(x) > self.X_THRESHOLD) | (
+            np.abs(theta) > self.THETA_THRESHOLD
+        )
+        truncated = self.elapsed >= self.max_episode_steps
+        # CenteredRewardWrapper: 1 per step minus half the normalized distance
+        rewards = (1.0 - np.abs(obs[:, 0]) / self.X_THRESHOLD * 0.5).astype(
+            np.float64
+        )
+
+        infos: dict[str, Any] = {}
+        dones = terminated | truncated
+        if dones.any():
+            infos = {"final_obs": obs, "_final_obs": dones}
+            self._reset_rows(dones)
+            obs = obs.copy()
+            obs[dones] = self.state[dones]
+        return obs, rewards, terminated, truncated, infos
@@ -1,13 +1,17 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import gymnasium as gym
 import numpy as np
-import torch.nn as nn
+from gymnasium.vector import VectorEnv
 
-from ...models import DuelingMLP
+from ...replay import DiscreteCodec, StateCodec
 from ..base import BaseTask
 from ..visual import BaseTaskTUI
 from .tui import CliffWalkingTUI
+from .vector import CliffWalkingVectorEnv
+
+if TYPE_CHECKING:
+    import torch.nn as nn
 
 class CliffWalkingTask(BaseTask):
     def __init__(self, config=None):
@@ -16,11 +20,20 @@ class CliffWalkingTask(BaseTask):
         temp_env = gym.make("CliffWalking-v1")
         self._action_size = int(temp_env.action_space.n)
         self._n_states = int(temp_env.observation_space.n)
+        # States are integer indices into the model's embedding table
+        self._codec = DiscreteCodec(self._n_states)
         temp_env.close()
 
     def get_env(self) -> gym.Env:
         return gym.make("CliffWalking-v1")
 
+    def get_vector_env(self, num_envs: int, backend: str = "sync") -> VectorEnv:
+        if backend == "native":
+            return CliffWalkingVectorEnv(
+                num_envs, max_episode_steps=self.config.max_steps, seed=self.config.seed
+            )
+        return super().get_vector_env(num_envs, backend)
+
     @property
     def state_size(self) -> int:
         return self._n_states
@@ -29,18 +42,21 @@ class CliffWalkingTask(BaseTask):
     def action_size(self) -> int:
         return self._action_size
 
-    def create_model(self) -> nn.Module:
-        return DuelingMLP(self.state_size, self.action_size)
+    def create_model(self) -> "nn.Module":
+        from ...models import EmbeddingDuelingMLP
+
+        return EmbeddingDuelingMLP(self.state_size, self.action_size)
 
     def preprocess_state(self, state: Any) -> Any:
         if isinstance(state, (np.ndarray, list)):
             state = state[0] if len(state) > 0 else 0
-        
-        state = int(state)
-        one_hot = np.zeros(self._n_states, dtype=np.float32)
-        if 0 <= state < self._n_states:
-            one_hot[state] = 1.0
-        return one_hot
+        return int(state)
+
+    def preprocess_batch(self, states: np.ndarray) -> np.ndarray:
+        return np.asarray(states, dtype=np.int64).reshape(-1)
+
+    def state_codec(self) -> StateCodec:
+        return self._codec
 
     def render(self) -> BaseTaskTUI:
         return CliffWalkingTUI(self.name)
\ No newline at end of file
@@ -0,0 +1,100 @@
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+class CliffWalkingVectorEnv(VectorEnv):
+    """
+    `num_envs` CliffWalking-v1 agents stepped through precomputed tables.
+
+    The transition model `P` of gymnasium's `CliffWalkingEnv` is flattened
+    once into next-state, reward and termination arrays indexed by
+    `state * num_actions + action`, so one step for every agent is a single
+    fancy-indexing gather into each table. Observations are int64 state
+    indices. Walking into the cliff keeps gymnasium's semantics: a -100
+    reward and a move back to the start without ending the episode.
+    Episodes are truncated after `max_episode_steps`, and finished agents
+    reset within the same step with their last state in `info["final_obs"]`
+    (`AutoresetMode.SAME_STEP`).
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(
+        self,
+        num_envs: int,
+        max_episode_steps: int,
+        seed: int | None = None,
+        env_id: str = "CliffWalking-v1"
+    ):
+        self.num_envs = num_envs
+        self.max_episode_steps = max_episode_steps
+
+        env = gym.make(env_id)
+        model = env.unwrapped
+        n_states = int(env.observation_space.n)
+        n_actions = int(env.action_space.n)
+        self._next_state = np.empty(n_states * n_actions, dtype=np.int64)
+        self._reward = np.empty(n_states * n_actions, dtype=np.float64)
+        self._terminal = np.empty(n_states * n_actions, dtype=bool)
+        for s in range(n_states):
+            for a in range(n_actions):
+                outcomes = model.P[s][a]
+                if len(outcomes) != 1:
+                    raise ValueError(
+                        f"{env_id} is stochastic; only deterministic "
+                        "transition tables are supported."
+                    )
+                _, next_state, reward, terminated = outcomes[0]
+                i = s * n_actions + a
+                self._next_state[i] = next_state
+                self._reward[i] = reward
+                self._terminal[i] = terminated
+        self._initial = np.asarray(model.initial_state_distrib, dtype=np.float64)
+        self._num_actions = n_actions
+        self.single_observation_space = env.observation_space
+        self.single_action_space = env.action_space
+        env.close()
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        self.state = np.zeros(num_envs, dtype=np.int64)
+        self.elapsed = np.zeros(num_envs, dtype=np.int64)
+        self._rng = np.random.default_rng(seed)
+
+    def _reset_rows(self, rows: np.ndarray | slice) -> None:
+        n = len(self.state[rows])
+        self.state[rows] = self._rng.choice(len(self._initial), n, p=self._initial)
+        self.elapsed[rows] = 0
+
+    def reset(
+        self,
+        *,
+        seed: int | None = None,
+        options: dict[str, Any] | None = None
+    ) -> tuple[np.ndarray, dict[str, Any]]:
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._reset_rows(slice(None))
+        return self.state.copy(), {}
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict[str, Any]]:
+        flat = self.state * self._num_actions + np.asarray(actions)
+        obs = self._next_state[flat]
+        rewards = self._reward[flat]
+        terminated = self._terminal[flat]
+        self.elapsed += 1
+        truncated = self.elapsed >= self.max_episode_steps
+
+        infos: dict[str, Any] = {}
+        dones = terminated | truncated
+        self.state[:] = obs
+        if dones.any():
+            infos = {"final_obs": obs, "_final_obs": dones}
+            self._reset_rows(dones)
+            obs = self.state.copy()
+        return obs, rewards, terminated, truncated, infos
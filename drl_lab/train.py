@@ -1,10 +1,26 @@
+import contextlib
+import time
 from collections.abc import Callable
 from pathlib import Path
 from typing import Any, Protocol
 
+import numpy as np
+import torch
+
 from .agent import BaseDQNAgent
+from .checkpoint import (
+    CheckpointWriter,
+    load_checkpoint,
+    save_checkpoint,
+    snapshot,
+    to_numpy,
+    to_torch,
+)
+from .metrics import MetricsWriter
+from .pipeline import PipelinedLearner
+from .profiler import EpisodeTracer, PhaseProfiler
 from .tasks import BaseTask, get_task
-from .utils import PlotRenderer, logger, paths
+from .utils import PlotRenderer, apply_overrides, logger, paths
 
 class TrainingCallbacks(Protocol):
     def on_step(
@@ -15,21 +31,47 @@ class TrainingCallbacks(Protocol):
 class Trainer:
     """
     Manages the training lifecycle for a Reinforcement Learning agent.
+
+    Every `Config.checkpoint_freq` episodes, and when training ends, the
+    full training state is written to a checkpoint next to the model file;
+    with `resume` a run continues from that checkpoint. New best models and
+    periodic checkpoints are snapshotted to CPU memory and written by a
+    background `CheckpointWriter`, so the loop never waits on disk.
+
+    With `Config.profile` the loop's phases are timed by a `PhaseProfiler`;
+    the breakdown is logged at the end and written next to the model.
+    `Config.trace_episodes` captures a window of episodes with
+    `torch.profiler`, with the same phase names as `record_function` labels.
+
+    Per-episode records, and every `Config.metrics_step_freq` environment
+    steps a record with throughput, loss and Q statistics, are streamed to
+    `<model>.metrics.jsonl` as training runs.
     """
 
+    # Whether this trainer writes and resumes from full checkpoints
+    supports_resume = True
+    # Whether episodes are stepped here with the agent's decaying epsilon
+    acts_locally = True
+
     def __init__(
         self, 
         task_name: str, 
         output_path: str | Path | None = None, 
         episodes: int | None = None,
         callbacks: TrainingCallbacks | None = None,
-        should_stop: Callable[[], bool] | None = None
+        should_stop: Callable[[], bool] | None = None,
+        overrides: dict[str, Any] | None = None,
+        resume: bool = False
     ):
+        if resume and not self.supports_resume:
+            raise ValueError(f"{type(self).__name__} does not support resuming.")
         self.task_name = task_name
         self.output_path = Path(output_path) if output_path else None
         self.episodes_override = episodes
+        self.overrides = overrides or {}
         self.callbacks = callbacks
         self.should_stop = should_stop or (lambda: False)
+        self.resume = resume
         
         self.task: BaseTask = get_task(task_name)
         self._setup_config()
@@ -37,13 +79,26 @@ class Trainer:
         
         # Lazy initialization
         self.agent: BaseDQNAgent | None = None
+        self.learner: PipelinedLearner | None = None
         self.plotter: PlotRenderer | None = None
+        self.writer: CheckpointWriter | None = None
+        self.profiler = PhaseProfiler(
+            enabled=self.config.profile,
+            labels=self.config.trace_episodes is not None,
+        )
+        self.tracer: EpisodeTracer | None = None
+        self.metrics: MetricsWriter | None = None
+        self.env_steps = 0
         self.best_reward = -float('inf')
+        # First episode to run and number of episodes completed so far
+        self.start_episode = 0
+        self.episodes_done = 0
 
     def _setup_config(self) -> None:
         """Applies configuration overrides."""
         if self.episodes_override:
             self.task.config.episodes = self.episodes_override
+        apply_overrides(self.task.config, self.overrides)
         self.config = self.task.config
 
     def _setup_paths(self) -> None:
@@ -53,36 +108,185 @@ class Trainer:
         )
         self.config.model_path = str(model_path)
         self.config.plot_path = str(plot_path)
+        if not self.config.replay_dir:
+            replay_dir = paths.get_replay_dir(model_path.stem, model_path.parent)
+            self.config.replay_dir = str(replay_dir)
+        # On-disk replay only carries over into the run it was checkpointed with
+        self.config.replay_reopen = self.resume and self.checkpoint_path.exists()
 
     def _initialize(self) -> None:
         """Initializes the agent, environment, and resources."""
-        # Ensure environment is ready
-        _ = self.task.env 
+        # Ensure environment is ready (vector mode builds its own copies)
+        if self.acts_locally and self.config.num_envs <= 1:
+            _ = self.task.env
         
         self.agent = BaseDQNAgent(
             state_size=self.task.state_size, 
             action_size=self.task.action_size, 
             config=self.config, 
-            model_factory=self.task.create_model
+            model_factory=self.task.create_model,
+            state_codec=self.task.state_codec()
         )
+        self.agent.profiler = self.profiler
+        if self.agent.device.type == "cuda":
+            self.profiler.synchronize = torch.cuda.synchronize
         self.plotter = PlotRenderer(self.task.name, Path(self.config.plot_path))
         
         logger.info(f"Initialized training for task: {self.task.name}")
         logger.info(f"   Episodes: {self.config.episodes}")
         logger.info(f"   Device: {self.agent.device}")
+        if self.config.num_envs > 1:
+            logger.info(
+                f"   Envs: {self.config.num_envs} ({self.config.vector_backend})"
+            )
         logger.info(
             f"   Batch Size: {self.config.batch_size} | "
             f"LR: {self.config.learning_rate}"
         )
         logger.info(f"   Output: {self.config.model_path}")
+        if self.config.replay_backend != "memory":
+            logger.info(
+                f"   Replay: {self.config.replay_backend} "
+                f"({self.config.memory_size} @ {self.config.replay_dir})"
+            )
+
+        if self.resume:
+            self._restore_checkpoint()
+
+        if self.config.pipeline:
+            self.learner = PipelinedLearner(
+                self.agent,
+                replay_ratio=self.config.replay_ratio,
+                publish_freq=self.config.pipeline_publish_freq,
+                max_lag=self.config.pipeline_max_lag,
+            )
+            self.learner.start()
+            logger.info(
+                f"   Pipeline: learner thread (replay ratio "
+                f"{self.config.replay_ratio})"
+            )
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return paths.get_checkpoint_path(Path(self.config.model_path))
+
+    def _env_rng(self) -> np.random.Generator | None:
+        """RNG of the single training environment (none in vector mode)."""
+        if self.config.num_envs > 1:
+            return None
+        return self.task.env.unwrapped.np_random
+
+    def _checkpoint_state(self) -> dict[str, Any]:
+        """Full training state after `episodes_done` episodes, as tensors."""
+        env_rng = self._env_rng()
+        with self._network_lock():
+            agent_state = self.agent.checkpoint_state(self.config.checkpoint_replay)
+        state = {
+            "task": self.task.name,
+            "episode": self.episodes_done,
+            "best_reward": float(self.best_reward),
+            "env_steps": self.env_steps,
+            "plot": self.plotter.state_dict(),
+            "agent": agent_state,
+            "torch_rng": torch.get_rng_state(),
+            "env_rng": env_rng.bit_generator.state if env_rng else None,
+        }
+        return to_torch(state)
+
+    def save_checkpoint(self) -> Path:
+        """Write the full training state now, on the calling thread."""
+        return save_checkpoint(self._checkpoint_state(), self.checkpoint_path)
+
+    def _queue_checkpoint(self) -> None:
+        """Snapshot the full training state for the background writer."""
+        with self.profiler.section("checkpoint"):
+            self.writer.save_checkpoint(
+                snapshot(self._checkpoint_state()), self.checkpoint_path
+            )
+
+    def _restore_checkpoint(self) -> None:
+        """Continue from the checkpoint next to the model file, if any."""
+        path = self.checkpoint_path
+        if not path.exists():
+            logger.warning(f"No checkpoint at {path}; starting a new run.")
+            return
+        state = load_checkpoint(path, map_location=self.agent.device)
+        if state["task"] != self.task.name:
+            raise ValueError(
+                f"Checkpoint {path} is for {state['task']}, not {self.task.name}."
+            )
+        agent_state = dict(state["agent"])
+        for key in ("uniforms", "random_actions", "replay"):
+            agent_state[key] = to_numpy(agent_state[key])
+        self.agent.load_checkpoint_state(agent_state)
+        self.plotter.load_state_dict(to_numpy(state["plot"]))
+        self.best_reward = state["best_reward"]
+        self.start_episode = self.episodes_done = state["episode"]
+        self.env_steps = state.get("env_steps", 0)
+        torch.set_rng_state(state["torch_rng"].cpu())
+        env_rng = self._env_rng()
+        if env_rng and state["env_rng"]:
+            env_rng.bit_generator.state = state["env_rng"]
+        logger.info(
+            f"Resumed from {path} at episode {self.start_episode} "
+            f"({len(self.agent.memory)} transitions in replay, "
+            f"eps {self.agent.epsilon:.3f})"
+        )
+
+    def _learn_step(self, env_steps: int) -> None:
+        """
+        Trains after `env_steps` environment steps: one synchronous update, or
+        a notification to the background learner in pipelined mode.
+        """
+        self.env_steps += env_steps
+        self._maybe_record_steps()
+        if self.learner:
+            # Time spent handing off steps, including back-pressure waits
+            with self.profiler.section("learner.wait"):
+                self.learner.notify_steps(env_steps)
+        else:
+            self.agent.replay()
+
+    def _maybe_record_steps(self) -> None:
+        """Write a "step" metrics record once `metrics_step_freq` steps passed."""
+        if self.metrics and self.env_steps >= self._next_step_record:
+            self._record_steps()
+
+    def _record_steps(self) -> None:
+        """Throughput and update statistics since the previous "step" record."""
+        now = time.perf_counter()
+        mark_time, mark_steps = self._steps_mark
+        self._steps_mark = (now, self.env_steps)
+        self._next_step_record = self.env_steps + self.config.metrics_step_freq
+        with self._network_lock():
+            stats = self.agent.pop_update_stats() or {"updates": 0}
+        with self.profiler.section("metrics"):
+            self.metrics.write(
+                "step",
+                episode=self.episodes_done,
+                env_steps=self.env_steps,
+                steps_per_s=(self.env_steps - mark_steps) / max(now - mark_time, 1e-9),
+                epsilon=self.agent.epsilon,
+                replay_size=len(self.agent.memory),
+                **stats,
+            )
+
+    def _network_lock(self) -> contextlib.AbstractContextManager:
+        """Guards the online/target networks against the learner thread."""
+        return self.learner.update_lock if self.learner else contextlib.nullcontext()
 
     def _run_episode(self, episode_idx: int) -> tuple[float, int]:
         """Runs a single episode."""
         self.task.pre_episode(episode_idx)
+        section = self.profiler.section
         
-        state, info = self.task.env.reset()
+        # Seed the environment once; resumed runs restore its RNG instead
+        seed = self.config.seed if episode_idx == 0 else None
+        with section("env.reset"):
+            state, info = self.task.env.reset(seed=seed)
         raw_state = state
-        state = self.task.preprocess_state(state)
+        with section("preprocess_state"):
+            state = self.task.preprocess_state(state)
         
         total_reward = 0.0
         steps = 0
@@ -90,13 +294,18 @@ class Trainer:
         
         # Initial callback
         if self.callbacks:
-            self.callbacks.on_step(steps, raw_state, total_reward, info)
+            with section("callbacks"):
+                self.callbacks.on_step(steps, raw_state, total_reward, info)
         
         while not done and not self.should_stop():
             steps += 1
-            action = self.agent.act(state, training=True)
+            with section("agent.act"):
+                action = self.agent.act(state, training=True)
             
-            next_state, reward, terminated, truncated, info = self.task.env.step(action)
+            with section("env.step"):
+                next_state, reward, terminated, truncated, info = (
+                    self.task.env.step(action)
+                )
             total_reward += reward
             
             # Enforce max steps
@@ -105,36 +314,156 @@ class Trainer:
             
             # Callback update with real-time reward
             if self.callbacks:
-                self.callbacks.on_step(steps, next_state, total_reward, info)
+                with section("callbacks"):
+                    self.callbacks.on_step(steps, next_state, total_reward, info)
 
-            next_state_pre = self.task.preprocess_state(next_state)
+            with section("preprocess_state"):
+                next_state_pre = self.task.preprocess_state(next_state)
             done = terminated or truncated
             
-            self.agent.remember(state, action, reward, next_state_pre, done)
+            with section("agent.remember"):
+                self.agent.remember(state, action, reward, next_state_pre, done)
             state = next_state_pre
             
-            self.agent.replay()
+            self._learn_step(1)
         
         self.task.post_episode(episode_idx, total_reward)
         return total_reward, steps
 
+    def _train_loop(self) -> None:
+        """Runs the configured training loop until all episodes complete."""
+        if self.config.num_envs > 1:
+            self._run_vectorized()
+        else:
+            self._run_episodes()
+
+    def _run_episodes(self) -> None:
+        """Runs training one episode at a time on the task's environment."""
+        for e in range(self.start_episode, self.config.episodes):
+            if self.should_stop():
+                logger.warning("Training stop signal received.")
+                break
+                
+            reward, steps = self._run_episode(e)
+            
+            if self.should_stop():
+                break
+                
+            self._update_agent_state(e)
+            self._log_and_save(e, steps, reward)
+
+    def _run_vectorized(self) -> None:
+        """
+        Runs training over `num_envs` environments stepped in lockstep.
+        Actions for all environments come from one batched forward pass and
+        every step pushes one transition per environment into replay.
+        Episodes are numbered in order of completion.
+        """
+        num_envs = self.config.num_envs
+        section = self.profiler.section
+        envs = self.task.get_vector_env(num_envs, self.config.vector_backend)
+        try:
+            with section("env.reset"):
+                obs, infos = envs.reset()
+            with section("preprocess_state"):
+                states = self.task.preprocess_batch(obs)
+
+            ep_rewards = np.zeros(num_envs)
+            ep_steps = np.zeros(num_envs, dtype=np.int64)
+            # Hook index of the episode each environment is currently running
+            completed = self.start_episode
+            ep_starts = list(range(completed, completed + num_envs))
+            for idx in ep_starts:
+                self.task.pre_episode(idx)
+            started = completed + num_envs
+
+            if self.callbacks:
+                self.callbacks.on_step(0, obs[0], 0.0, _env_info(infos, 0))
+
+            while completed < self.config.episodes and not self.should_stop():
+                with section("agent.act"):
+                    actions = self.agent.act_batch(states, training=True)
+                with section("env.step"):
+                    next_obs, rewards, terminated, truncated, infos = envs.step(
+                        actions
+                    )
+                dones = terminated | truncated
+                ep_rewards += rewards
+                ep_steps += 1
+
+                with section("preprocess_state"):
+                    next_states = self.task.preprocess_batch(next_obs)
+                    finished = np.flatnonzero(dones)
+                    final_states = next_states
+                    if len(finished):
+                        # Same-step autoreset: next_obs already holds reset states
+                        final_obs = np.stack(
+                            [infos["final_obs"][i] for i in finished]
+                        )
+                        final_states = next_states.copy()
+                        final_states[finished] = self.task.preprocess_batch(
+                            final_obs
+                        )
+
+                if self.callbacks:
+                    raw = infos["final_obs"][0] if dones[0] else next_obs[0]
+                    with section("callbacks"):
+                        self.callbacks.on_step(
+                            int(ep_steps[0]), raw, float(ep_rewards[0]),
+                            _env_info(infos, 0)
+                        )
+
+                with section("agent.remember"):
+                    self.agent.remember_batch(
+                        states, actions, rewards, final_states, dones
+                    )
+                states = next_states
+                self._learn_step(num_envs)
+
+                for i in finished:
+                    reward, steps = float(ep_rewards[i]), int(ep_steps[i])
+                    self.task.post_episode(ep_starts[i], reward)
+                    self._update_agent_state(completed)
+                    self._log_and_save(completed, steps, reward)
+                    completed += 1
+
+                    ep_rewards[i] = 0.0
+                    ep_steps[i] = 0
+                    ep_starts[i] = started
+                    self.task.pre_episode(started)
+                    started += 1
+                    if completed >= self.config.episodes:
+                        break
+        finally:
+            envs.close()
+
     def _update_agent_state(self, episode_idx: int) -> None:
         """Updates agent internal state."""
         if episode_idx % self.config.target_update_freq == 0:
-            self.agent.update_target_model()
+            with self.profiler.section("target_update"), self._network_lock():
+                self.agent.update_target_model()
 
-        if self.agent.epsilon > self.config.epsilon_min:
+        if self.acts_locally and self.agent.epsilon > self.config.epsilon_min:
             self.agent.epsilon *= self.config.epsilon_decay
 
-    def _log_and_save(self, episode_idx: int, steps: int, reward: float) -> None:
-        """Handles logging and model saving."""
+    def _log_and_save(
+        self, episode_idx: int, steps: int, reward: float,
+        epsilon: float | None = None
+    ) -> None:
+        """
+        Handles logging and model saving. `epsilon` is the exploration rate
+        the episode ran with, the agent's own by default.
+        """
+        if epsilon is None:
+            epsilon = self.agent.epsilon
         self.plotter.update(reward)
         avg_reward = (
             self.plotter.moving_avgs[-1] if self.plotter.moving_avgs else reward
         )
         
         if self.callbacks:
-            self.callbacks.on_episode_end(episode_idx, steps, reward)
+            with self.profiler.section("callbacks"):
+                self.callbacks.on_episode_end(episode_idx, steps, reward)
 
         should_log = (episode_idx < 20) or ((episode_idx + 1) % 10 == 0)
         
@@ -144,7 +473,7 @@ class Trainer:
                 f"Steps: {steps:03d} | "
                 f"Reward: {reward: >6.2f} | "
                 f"Avg: {avg_reward: >6.2f} | "
-                f"Eps: {self.agent.epsilon:.3f}"
+                f"Eps: {epsilon:.3f}"
             )
 
         if avg_reward > self.best_reward:
@@ -153,7 +482,38 @@ class Trainer:
                 f"(prev: {self.best_reward:.2f}). Saving..."
             )
             self.best_reward = avg_reward
-            self.agent.save(self.config.model_path)
+            with self.profiler.section("checkpoint"):
+                with self._network_lock():
+                    weights = snapshot(self.agent.model.state_dict())
+                self.writer.save_best(
+                    weights, self.config.model_path, avg_reward, episode_idx + 1
+                )
+
+        with self.profiler.section("metrics"):
+            self.metrics.write(
+                "episode",
+                episode=episode_idx,
+                reward=float(reward),
+                steps=steps,
+                avg_reward=float(avg_reward),
+                reward_min=self.plotter.window.min,
+                reward_p50=self.plotter.window.percentile(50),
+                reward_max=self.plotter.window.max,
+                epsilon=epsilon,
+                env_steps=self.env_steps,
+                replay_size=len(self.agent.memory),
+            )
+
+        self.episodes_done = episode_idx + 1
+        if self.config.plot_freq and self.episodes_done % self.config.plot_freq == 0:
+            self.plotter.render_async()
+
+        freq = self.config.checkpoint_freq
+        if freq and self.supports_resume and self.episodes_done % freq == 0:
+            self._queue_checkpoint()
+
+        if self.tracer:
+            self.tracer.episode_done()
 
     def run(self) -> None:
         """Executes the full training loop."""
@@ -165,36 +525,109 @@ class Trainer:
             logger.error(f"Error in pre_training hook: {e}")
             return
 
+        self.writer = CheckpointWriter(keep_best=self.config.keep_best)
+        self._open_metrics()
+        if self.config.trace_episodes:
+            start, end = self.config.trace_episodes
+            self.tracer = EpisodeTracer(
+                start, end, self.start_episode,
+                paths.get_trace_dir(Path(self.config.model_path)),
+            )
+            self.tracer.begin()
+        self.profiler.start()
         try:
-            for e in range(self.config.episodes):
-                if self.should_stop():
-                    logger.warning("Training stop signal received.")
-                    break
-                    
-                reward, steps = self._run_episode(e)
-                
-                if self.should_stop():
-                    break
-                    
-                self._update_agent_state(e)
-                self._log_and_save(e, steps, reward)
+            self._train_loop()
         except KeyboardInterrupt:
             logger.warning("Training interrupted by user.")
         except Exception as e:
             logger.exception(f"Unexpected error during training: {e}")
         finally:
+            self.profiler.stop()
+            if self.tracer:
+                try:
+                    self.tracer.close()
+                except Exception as e:
+                    logger.error(f"Failed to save trace: {e}")
             try:
                 self.task.post_training()
             except Exception as e:
                 logger.error(f"Error in post_training hook: {e}")
             
+            if self.learner:
+                try:
+                    self.learner.stop()
+                except Exception as e:
+                    logger.error(f"Learner thread failed: {e}")
+                logger.info(
+                    f"Learner: {self.learner.updates} updates over "
+                    f"{self.learner.env_steps} env steps"
+                )
+
+            if self.agent and self.supports_resume and self.config.checkpoint_freq:
+                try:
+                    self._queue_checkpoint()
+                    logger.info(
+                        f"Checkpoint after {self.episodes_done} episodes: "
+                        f"{self.checkpoint_path}"
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to save checkpoint: {e}")
+
+            self.metrics.close()
+            logger.info(
+                f"Metrics: {self.metrics.records} records in {self.metrics.path}"
+            )
+
+            # Waits for queued writes, so every file is complete on return
+            self.writer.close()
+            logger.info(
+                f"Checkpoint writer: {self.writer.writes} writes, "
+                f"{self.writer.coalesced} superseded before writing"
+            )
+
+            if self.agent:
+                self.agent.memory.close()
+
             if self.plotter:
                 self.plotter.render()
+
+            if self.profiler.enabled:
+                self._report_profile()
                 
             logger.success(
                 f"Training session ended. Best Avg Reward: {self.best_reward:.2f}"
             )
 
+    def _open_metrics(self) -> None:
+        """Start the metrics stream, continuing the resumed run's records."""
+        self.metrics = MetricsWriter(
+            paths.get_metrics_path(Path(self.config.model_path)),
+            flush_secs=self.config.metrics_flush_secs,
+            resume_episode=self.start_episode if self.resume else None,
+        )
+        freq = self.config.metrics_step_freq
+        self._next_step_record = self.env_steps + freq if freq else float("inf")
+        self._steps_mark = (time.perf_counter(), self.env_steps)
+
+    def _report_profile(self) -> None:
+        """Log the phase breakdown and write it next to the model."""
+        self.profiler.log_summary()
+        try:
+            path = self.profiler.save(
+                paths.get_profile_path(Path(self.config.model_path))
+            )
+            logger.info(f"Profile saved to {path}")
+        except Exception as e:
+            logger.error(f"Failed to save profile: {e}")
+
+def _env_info(infos: dict[str, Any], index: int) -> dict[str, Any]:
+    """Extract the info dict of a single sub-environment from a vector env."""
+    return {
+        key: value[index]
+        for key, value in infos.items()
+        if not key.startswith("_") and key not in ("final_obs", "final_info")
+    }
+
 def train(task_name: str, output_path: str, episodes: int) -> None:
     """Legacy wrapper."""
     trainer = Trainer(task_name, output_path, episodes)
@@ -1,4 +1,4 @@
-from .config import Config
+from .config import Config, apply_overrides
 from .logging import get_logger, setup_logger
 from .paths import (
     OUTPUTS_DIR,
@@ -6,8 +6,20 @@ from .paths import (
     WORK_DIR,
     ensure_dir,
     ensure_outputs_dir,
+    get_bench_path,
+    get_best_dir,
+    get_checkpoint_path,
+    get_compile_cache_dir,
+    get_ensemble_summary_path,
+    get_metrics_path,
     get_model_path,
     get_plot_path,
+    get_profile_path,
+    get_replay_dir,
+    get_seed_path,
+    get_seed_paths,
+    get_sweep_dir,
+    get_trace_dir,
     resolve_path,
     resolve_task_paths,
 )
@@ -21,14 +33,27 @@ __all__ = [
     "get_logger",
     "logger",
     "Config",
+    "apply_overrides",
     "PlotRenderer",
     "PROJECT_ROOT",
     "WORK_DIR",
     "OUTPUTS_DIR",
     "ensure_dir",
     "ensure_outputs_dir",
+    "get_bench_path",
+    "get_best_dir",
+    "get_checkpoint_path",
+    "get_compile_cache_dir",
+    "get_ensemble_summary_path",
+    "get_metrics_path",
     "get_model_path",
     "get_plot_path",
+    "get_profile_path",
+    "get_replay_dir",
+    "get_seed_path",
+    "get_seed_paths",
+    "get_sweep_dir",
+    "get_trace_dir",
     "resolve_path",
     "resolve_task_paths",
 ]
\ No newline at end of file
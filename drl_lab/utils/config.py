@@ -1,10 +1,14 @@
 from dataclasses import dataclass
+from typing import Any
 
 from . import paths
 
 @dataclass
 class Config:
     env_name: str = "CartPole-v1"
+    seed: int | None = None # Seeds the agent's exploration stream
+    torch_compile: bool = False # Compile acting and the replay loss
+    bf16_autocast: bool = False # Replay forward/backward in bfloat16
     gamma: float = 0.99
     epsilon_start: float = 1.0
     epsilon_min: float = 0.01
@@ -14,10 +18,57 @@ class Config:
     memory_size: int = 2000
     train_start_size: int = 1000
     target_update_freq: int = 10
+    # Replay storage: "memory" (RAM arrays) or "memmap" (files in replay_dir)
+    replay_backend: str = "memory"
+    replay_dir: str | None = None
+    replay_reopen: bool = False # Continue the memmap files (set by --resume)
+    replay_hot_size: int = 1024
+    # Prioritized experience replay (proportional variant)
+    prioritized_replay: bool = False
+    per_alpha: float = 0.6
+    per_beta_start: float = 0.4
+    per_beta_steps: int = 100_000 # Updates over which beta anneals to 1.0
+    per_eps: float = 1e-6
+    # Vectorized acting: >1 steps that many env copies in lockstep
+    num_envs: int = 1
+    vector_backend: str = "sync" # "sync", "async" (one process per env) or "native"
+    # Pipelined mode: replay updates run on a background learner thread
+    pipeline: bool = False
+    replay_ratio: float = 1.0 # Learner updates per environment step
+    pipeline_publish_freq: int = 20 # Updates between acting-weight refreshes
+    pipeline_max_lag: int = 200 # Updates the learner may fall behind
+    # Ape-X style actor processes (0 disables distributed training)
+    num_actors: int = 0
+    actor_chunk_size: int = 64 # Transitions per message sent to the learner
+    weight_sync_freq: int = 50 # Learner updates between weight publications
+    apex_epsilon: float = 0.4
+    apex_alpha: float = 7.0
+    # Independent seeds trained together as one vectorized ensemble
+    num_seeds: int = 1
+    # Full training checkpoints for `rlab train --resume` (0 disables them)
+    checkpoint_freq: int = 50 # Episodes between checkpoints
+    checkpoint_replay: bool = False # Also store the replay buffer contents
+    keep_best: int = 3 # Best-model snapshots kept in `<model>_best/` (0: none)
+    plot_freq: int = 0 # Episodes between background plot re-renders (0: at end)
+    # Streaming metrics file (`<model>.metrics.jsonl`)
+    metrics_step_freq: int = 1000 # Env steps between "step" records (0: none)
+    metrics_flush_secs: float = 5.0 # Max seconds records stay buffered
+    # Per-phase wall time of the training loop (`rlab train --profile`)
+    profile: bool = False
+    # Episodes [start, end) captured by torch.profiler (`--trace-episodes`)
+    trace_episodes: tuple[int, int] | None = None
     episodes: int = 500  # CartPole-v1 is solved at 475 avg reward
     max_steps: int = 200 # Force end episode if taking too long
     # Default paths using centralized utils
     model_path: str = str(paths.get_model_path("dqn_cartpole_model"))
     plot_path: str = str(paths.get_plot_path("training_plot"))
     log_file: str = str(paths.OUTPUTS_DIR / "training.log")
-    render_mode: str = None # Set to 'human' for visualization during inference
\ No newline at end of file
+    render_mode: str = None # Set to 'human' for visualization during inference
+
+def apply_overrides(config: Config, overrides: dict[str, Any]) -> Config:
+    """Set `overrides` on `config` in place, rejecting unknown fields."""
+    for key, value in overrides.items():
+        if not hasattr(config, key):
+            raise ValueError(f"Unknown config field: '{key}'")
+        setattr(config, key, value)
+    return config
@@ -31,6 +31,58 @@ def get_plot_path(task_name: str, output_dir: Path = OUTPUTS_DIR) -> Path:
     """Returns the standard path for a task training plot."""
     return output_dir / f"{task_name}.png"
 
+def get_replay_dir(task_name: str, output_dir: Path = OUTPUTS_DIR) -> Path:
+    """Returns the standard directory for a task's on-disk replay buffer."""
+    return output_dir / f"{task_name}_replay"
+
+def get_checkpoint_path(model_path: Path) -> Path:
+    """Returns the full training checkpoint stored next to a model file."""
+    return Path(model_path).with_suffix(".ckpt")
+
+def get_best_dir(model_path: Path) -> Path:
+    """Returns the directory archiving the top-scoring snapshots of a model."""
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}_best")
+
+def get_metrics_path(model_path: Path) -> Path:
+    """Returns the path of the streamed training metrics of a model."""
+    return Path(model_path).with_suffix(".metrics.jsonl")
+
+def get_profile_path(model_path: Path) -> Path:
+    """Returns the path of the phase profile written for a model's run."""
+    return Path(model_path).with_suffix(".profile.json")
+
+def get_trace_dir(model_path: Path) -> Path:
+    """Returns the directory for torch.profiler traces of a model's run."""
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}_trace")
+
+def get_seed_path(path: Path, k: int) -> Path:
+    """Returns the variant of `path` for seed index `k` of an ensemble run."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}_seed{k}{path.suffix}")
+
+def get_seed_paths(path: Path) -> list[Path]:
+    """Returns the existing per-seed variants of `path`, for any seed index."""
+    path = Path(path)
+    return sorted(path.parent.glob(f"{path.stem}_seed[0-9]*{path.suffix}"))
+
+def get_ensemble_summary_path(plot_path: Path) -> Path:
+    """Returns the per-seed summary written next to an ensemble plot."""
+    return Path(plot_path).with_suffix(".ensemble.json")
+
+def get_bench_path(output_dir: Path = OUTPUTS_DIR) -> Path:
+    """Returns the default path for `rlab bench` results."""
+    return output_dir / "bench.json"
+
+def get_sweep_dir(task_name: str, output_dir: Path = OUTPUTS_DIR) -> Path:
+    """Returns the standard directory for a task's hyperparameter sweep."""
+    return output_dir / "sweeps" / task_name
+
+def get_compile_cache_dir(output_dir: Path = OUTPUTS_DIR) -> Path:
+    """Returns the directory for cached torch.compile (Inductor) artifacts."""
+    return output_dir / "compile_cache"
+
 def resolve_path(path_str: str) -> Path:
     """Resolves a string path to a Path object."""
     return Path(path_str).resolve()
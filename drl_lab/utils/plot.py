@@ -1,50 +1,171 @@
+import threading
+from array import array
 from pathlib import Path
 
 import matplotlib
-import matplotlib.pyplot as plt
 import numpy as np
 from loguru import logger
+from matplotlib.figure import Figure
 
-# Force non-interactive backend 'Agg' before importing pyplot
+# Force non-interactive backend 'Agg'; figures are drawn without pyplot so
+# they can be rendered off the training thread
 matplotlib.use('Agg')
 
 from . import paths
+from .stats import RollingWindow, lttb
+
+# Series longer than this are downsampled with LTTB before plotting
+MAX_PLOT_POINTS = 4000
+
+def _downsample(y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(x, y) of at most `MAX_PLOT_POINTS` points that keep the curve's shape."""
+    idx = lttb(y, MAX_PLOT_POINTS)
+    return idx, y[idx]
+
+def _save_figure(fig: Figure, filepath: Path) -> None:
+    """Write the figure next to `filepath` and rename it into place."""
+    paths.ensure_dir(filepath)
+    tmp_path = filepath.with_name(f"{filepath.stem}.tmp{filepath.suffix}")
+    fig.savefig(tmp_path)
+    tmp_path.replace(filepath)
 
 class PlotRenderer:
+    """
+    Reward curve of a training run.
+
+    Rewards and moving averages are kept in compact float64 arrays, and the
+    moving average comes from an O(1) `RollingWindow` rather than re-averaging
+    the last `window_size` rewards each episode. Long series are downsampled
+    with LTTB when plotted. `render_async` re-renders on a background thread
+    from a snapshot of the curves; requests made while a render is running
+    are coalesced into one render of the latest data.
+    """
+
     def __init__(self, task_name: str, filepath: Path):
         self.task_name = task_name
         self.filepath = Path(filepath)
-        self.rewards = []
-        self.moving_avgs = []
+        self.rewards = array('d')
+        self.moving_avgs = array('d')
         self.window_size = 100
+        self.window = RollingWindow(self.window_size)
+        self._lock = threading.Lock()
+        self._pending: tuple[np.ndarray, np.ndarray] | None = None
+        self._rendering = False
+        self._worker: threading.Thread | None = None
 
     def update(self, reward: float):
         """Updates the internal data with a new episode reward."""
         self.rewards.append(reward)
-        avg = np.mean(self.rewards[-self.window_size:])
-        self.moving_avgs.append(avg)
+        self.window.push(reward)
+        self.moving_avgs.append(self.window.mean)
+
+    def state_dict(self) -> dict[str, np.ndarray]:
+        """Reward history as arrays, for training checkpoints."""
+        return {
+            "rewards": np.array(self.rewards, dtype=np.float64),
+            "moving_avgs": np.array(self.moving_avgs, dtype=np.float64),
+        }
+
+    def load_state_dict(self, state: dict[str, np.ndarray]) -> None:
+        """Restore the reward history saved by `state_dict`."""
+        self.rewards = array('d', np.asarray(state["rewards"], np.float64).tobytes())
+        self.moving_avgs = array(
+            'd', np.asarray(state["moving_avgs"], np.float64).tobytes()
+        )
+        self.window.restore(self.rewards)
+
+    def _snapshot(self) -> tuple[np.ndarray, np.ndarray]:
+        return np.array(self.rewards), np.array(self.moving_avgs)
+
+    def _draw(self, rewards: np.ndarray, moving_avgs: np.ndarray) -> None:
+        fig = Figure(figsize=(10, 5))
+        ax = fig.subplots()
+        ax.plot(*_downsample(rewards), label='Episode Reward', alpha=0.5)
+        ax.plot(
+            *_downsample(moving_avgs),
+            label=f'Moving Average ({self.window_size} eps)',
+            linewidth=2
+        )
+        ax.set_xlabel('Episode')
+        ax.set_ylabel('Reward')
+        ax.set_title(f'DQN Training: {self.task_name}')
+        ax.legend()
+        ax.grid(True)
+        _save_figure(fig, self.filepath)
+
+    def render_async(self) -> None:
+        """Re-render in the background from a snapshot of the current curves."""
+        with self._lock:
+            self._pending = self._snapshot()
+            if self._rendering:
+                return
+            self._rendering = True
+        self._worker = threading.Thread(
+            target=self._render_pending, name="plot-render", daemon=True
+        )
+        self._worker.start()
+
+    def _render_pending(self) -> None:
+        while True:
+            with self._lock:
+                snapshot, self._pending = self._pending, None
+                if snapshot is None:
+                    self._rendering = False
+                    return
+            try:
+                self._draw(*snapshot)
+            except Exception as e:
+                logger.error(f"Failed to save plot to {self.filepath}: {e}")
 
     def render(self):
         """Renders and saves the plot to the configured filepath."""
+        # Let a background render finish so it cannot overwrite this one
+        if self._worker:
+            self._worker.join()
         try:
-            plt.figure(figsize=(10, 5))
-            plt.plot(self.rewards, label='Episode Reward', alpha=0.5)
-            plt.plot(
-                self.moving_avgs, 
-                label=f'Moving Average ({self.window_size} eps)', 
-                linewidth=2
-            )
-            plt.xlabel('Episode')
-            plt.ylabel('Reward')
-            plt.title(f'DQN Training: {self.task_name}')
-            plt.legend()
-            plt.grid(True)
-            
-            # Ensure parent directory exists using centralized utils
-            paths.ensure_dir(self.filepath)
-            
-            plt.savefig(self.filepath)
-            plt.close()
+            self._draw(*self._snapshot())
             logger.info(f"Training plot saved to {self.filepath}")
         except Exception as e:
-            logger.error(f"Failed to save plot to {self.filepath}: {e}")
\ No newline at end of file
+            logger.error(f"Failed to save plot to {self.filepath}: {e}")
+
+def render_ensemble(
+    task_name: str,
+    curves: list[list[float]],
+    labels: list[str],
+    filepath: Path
+) -> None:
+    """
+    Plots per-seed moving averages with the across-seed mean and a ±1 std
+    band over the episodes every seed has reached.
+    """
+    filepath = Path(filepath)
+    try:
+        fig = Figure(figsize=(10, 5))
+        ax = fig.subplots()
+        for curve, label in zip(curves, labels, strict=True):
+            ax.plot(
+                *_downsample(np.asarray(curve)), label=label, alpha=0.35,
+                linewidth=1
+            )
+
+        common = min((len(c) for c in curves), default=0)
+        if common:
+            stacked = np.array([np.asarray(c)[:common] for c in curves])
+            mean, std = stacked.mean(axis=0), stacked.std(axis=0)
+            episodes = lttb(mean, MAX_PLOT_POINTS)
+            mean, std = mean[episodes], std[episodes]
+            ax.plot(episodes, mean, label='Mean', color='black', linewidth=2)
+            ax.fill_between(
+                episodes, mean - std, mean + std, color='black', alpha=0.15,
+                label='±1 std'
+            )
+        ax.set_xlabel('Episode')
+        ax.set_ylabel('Moving Average Reward')
+        ax.set_title(f'DQN Ensemble ({len(curves)} seeds): {task_name}')
+        ax.legend()
+        ax.grid(True)
+
+        _save_figure(fig, filepath)
+        logger.info(f"Ensemble plot saved to {filepath}")
+    except Exception as e:
+        logger.error(f"Failed to save plot to {filepath}: {e}")
@@ -0,0 +1,132 @@
+import bisect
+import math
+from collections import deque
+from collections.abc import Sequence
+
+import numpy as np
+
+class RollingWindow:
+    """
+    Statistics of the last `size` values, updated in O(1) per value.
+
+    The mean comes from a running sum, recomputed exactly with `math.fsum`
+    every `size` pushes so rounding error cannot build up over long runs;
+    min and max come from monotonic deques; percentiles from a sorted copy
+    of the window kept with `bisect` (a memmove of at most `size` slots).
+    The state after a given sequence of pushes depends only on the values,
+    so `restore` rebuilds a window that matches one that never stopped.
+    """
+
+    def __init__(self, size: int = 100):
+        self.size = size
+        self.count = 0
+        self._values: deque[float] = deque()
+        self._sorted: list[float] = []
+        self._sum = 0.0
+        # (push index, value), values increasing / decreasing front to back
+        self._min: deque[tuple[int, float]] = deque()
+        self._max: deque[tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        i = self.count
+        self.count += 1
+        self._values.append(value)
+        bisect.insort(self._sorted, value)
+        self._sum += value
+        if len(self._values) > self.size:
+            old = self._values.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, old)]
+            self._sum -= old
+        if self.count % self.size == 0:
+            self._sum = math.fsum(self._values)
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((i, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((i, value))
+        first = self.count - len(self._values)
+        if self._min[0][0] < first:
+            self._min.popleft()
+        if self._max[0][0] < first:
+            self._max.popleft()
+
+    @property
+    def mean(self) -> float:
+        return self._sum / len(self._values) if self._values else math.nan
+
+    @property
+    def min(self) -> float:
+        return self._min[0][1] if self._min else math.nan
+
+    @property
+    def max(self) -> float:
+        return self._max[0][1] if self._max else math.nan
+
+    def percentile(self, q: float) -> float:
+        """`q`-th percentile of the window, interpolated like `np.percentile`."""
+        n = len(self._sorted)
+        if not n:
+            return math.nan
+        pos = (n - 1) * q / 100.0
+        lo = int(pos)
+        hi = min(lo + 1, n - 1)
+        return self._sorted[lo] + (self._sorted[hi] - self._sorted[lo]) * (pos - lo)
+
+    def restore(self, history: Sequence[float]) -> None:
+        """
+        Reset to the state after pushing every value of `history`, replaying
+        only the values since the last exact resummation and the window
+        before it.
+        """
+        self.__init__(self.size)
+        total = len(history)
+        resync = total - total % self.size
+        start = max(resync - self.size, 0)
+        for value in history[start:resync]:
+            self.push(value)
+        self.count = resync
+        # Push indices of the deques shift with the skipped prefix
+        self._min = deque((i + start, v) for i, v in self._min)
+        self._max = deque((i + start, v) for i, v in self._max)
+        self._sum = math.fsum(self._values)
+        for value in history[resync:]:
+            self.push(value)
+
+def lttb(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of `threshold` points of the series `y` (x = 0..n-1) chosen by
+    Largest-Triangle-Three-Buckets, which keeps the visual shape (peaks and
+    dips) of a line plot. Returns every index if `y` is not longer.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    # Interior points split into threshold - 2 buckets; ends are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Average of the bucket after each one (the last point for the final bucket)
+    sums = np.add.reduceat(y[:n - 1], edges[:-1])
+    next_xs = np.append((edges[1:-1] + edges[2:] - 1) / 2.0, n - 1).tolist()
+    next_ys = np.append((sums / np.diff(edges))[1:], y[n - 1]).tolist()
+    xs = np.arange(n, dtype=np.float64)
+    bounds = edges.tolist()
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a, ya = 0, float(y[0])
+    for b in range(threshold - 2):
+        lo, hi = bounds[b], bounds[b + 1]
+        next_x, next_y = next_xs[b], next_ys[b]
+        # Twice the triangle area (a, candidate, next-bucket average)
+        areas = np.abs(
+            (a - next_x) * (y[lo:hi] - ya) - (a - xs[lo:hi]) * (next_y - ya)
+        )
+        a = lo + int(areas.argmax())
+        ya = float(y[a])
+        indices[b + 1] = a
+    return indices